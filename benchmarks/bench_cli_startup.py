@@ -0,0 +1,80 @@
+"""
+Measure the startup time of main.py subcommands in fresh interpreters and
+check that --help and evaluation-only runs do not import openai, tiktoken
+or pydantic. Exits with an error when a heavy module is loaded or the
+median --help time exceeds --max-help-seconds.
+
+Usage:
+    python benchmarks/bench_cli_startup.py --repeats 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("openai", "tiktoken", "pydantic")
+
+CASES = {
+    "help": ["--help"],
+    "extract_help": ["extract", "--help"],
+    "evaluate": ["evaluate", "--no-report"],
+    "eda": ["eda", "--format", "json"]
+}
+
+PROBE = r"""
+import json, sys, time
+
+start = time.perf_counter()
+import main
+try:
+    main.main(ARGV)
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - start
+
+print(json.dumps({
+    "seconds": elapsed,
+    "heavy_modules": sorted(name for name in HEAVY_MODULES if name in sys.modules)
+}))
+"""
+
+def run_probe(argv) -> dict:
+    code = PROBE.replace("ARGV", repr(argv)).replace("HEAVY_MODULES", repr(HEAVY_MODULES))
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    wall_seconds = time.perf_counter() - start
+    return dict(json.loads(output.strip().splitlines()[-1]), wall_seconds=wall_seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-help-seconds", type=float, default=0.5, help="Median wall time allowed for --help")
+    args = parser.parse_args()
+
+    report = {}
+    for name, argv in CASES.items():
+        runs = [run_probe(argv) for _ in range(args.repeats)]
+        report[name] = {
+            "argv": argv,
+            "main_seconds_median": round(statistics.median(run["seconds"] for run in runs), 4),
+            "wall_seconds_median": round(statistics.median(run["wall_seconds"] for run in runs), 4),
+            "heavy_modules": sorted({module for run in runs for module in run["heavy_modules"]})
+        }
+    print(json.dumps(report, indent=2))
+
+    loaded = {name: case["heavy_modules"] for name, case in report.items() if case["heavy_modules"]}
+    if loaded:
+        sys.exit(f"Heavy modules imported at startup: {loaded}")
+    if report["help"]["wall_seconds_median"] > args.max_help_seconds:
+        sys.exit(f"--help took {report['help']['wall_seconds_median']}s (limit {args.max_help_seconds}s)")
+    return report
+
+if __name__ == "__main__":
+    main()
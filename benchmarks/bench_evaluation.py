@@ -0,0 +1,133 @@
+"""
+Compare the vectorized EvaluationEngine with the previous per-pass evaluator
+on synthetic predictions built by replicating the ground truth corpus.
+
+Usage:
+    python benchmarks/bench_evaluation.py --scale 1000
+    python benchmarks/bench_evaluation.py --scale 100 --fuzzy
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.validation.evaluation_engine import evaluate
+
+def legacy_evaluate(predictions, ground_truth):
+    """The loop-based evaluation used before EvaluationEngine (macro averages only)."""
+    def entities(people):
+        return {person['name'].strip().lower() for person in people}
+
+    def pairs(people):
+        return {(person['name'].strip().lower(), role.strip().lower()) for person in people for role in person['roles']}
+
+    def prf(predicted, truth):
+        if not predicted and not truth:
+            return 1.0, 1.0, 1.0
+        if not predicted or not truth:
+            return 0.0, 0.0, 0.0
+        common = len(predicted & truth)
+        precision, recall = common / len(predicted), common / len(truth)
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return precision, recall, f1
+
+    gt_dict = {item['uuid']: item for item in ground_truth}
+    entity_scores, role_scores = [], []
+    for pred in predictions:
+        if not pred['success'] or not pred['extraction'] or pred['article_id'] not in gt_dict:
+            continue
+        gt_people = gt_dict[pred['article_id']]['people']
+        entity_scores.append(prf(entities(pred['extraction']['people']), entities(gt_people)))
+        role_scores.append(prf(pairs(pred['extraction']['people']), pairs(gt_people)))
+
+    gt_dict = {item['uuid']: item for item in ground_truth}
+    topic_correct = subtopic_correct = total = 0
+    for pred in predictions:
+        if not pred['success'] or not pred['extraction'] or pred['article_id'] not in gt_dict:
+            continue
+        gt = gt_dict[pred['article_id']]
+        total += 1
+        topic_correct += pred['extraction']['topic'].strip().lower() == gt['topic'].strip().lower()
+        subtopic_correct += pred['extraction']['subtopic'].strip().lower() == gt['subtopic'].strip().lower()
+
+    mean = lambda scores, i: sum(s[i] for s in scores) / len(scores) if scores else 0.0
+    return {
+        'entity_f1': mean(entity_scores, 2),
+        'role_f1': mean(role_scores, 2),
+        'topic_accuracy': topic_correct / total if total else 0.0,
+        'subtopic_accuracy': subtopic_correct / total if total else 0.0
+    }
+
+def make_predictions(ground_truth, scale, seed=0):
+    """Perturbed copies of the ground truth: some people dropped, some topics changed."""
+    rng = random.Random(seed)
+    topics = sorted({item['topic'] for item in ground_truth})
+    predictions = []
+    for _ in range(scale):
+        for item in ground_truth:
+            people = [person for person in item['people'] if rng.random() > 0.2]
+            predictions.append({
+                'article_id': item['uuid'],
+                'success': True,
+                'extraction': {
+                    'people': people,
+                    'topic': item['topic'] if rng.random() > 0.1 else rng.choice(topics),
+                    'subtopic': item['subtopic']
+                }
+            })
+    return predictions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ground-truth", default=os.path.join(ROOT, "data/raw/200_gt_evaluation_human.json"))
+    parser.add_argument("--scale", type=int, default=1000, help="Copies of the ground truth set to score")
+    parser.add_argument("--fuzzy", action="store_true", help="Also time fuzzy entity matching")
+    args = parser.parse_args()
+
+    with open(args.ground_truth, 'r', encoding='utf-8') as f:
+        ground_truth = json.load(f)
+    predictions = make_predictions(ground_truth, args.scale)
+
+    start = time.perf_counter()
+    legacy = legacy_evaluate(predictions, ground_truth)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = evaluate(predictions, ground_truth)
+    entity_results = engine.entity_metrics()
+    topic_results = engine.topic_metrics(include_details=False)
+    engine_seconds = time.perf_counter() - start
+
+    vectorized = {
+        'entity_f1': entity_results['entity_f1'],
+        'role_f1': entity_results['role_f1'],
+        'topic_accuracy': topic_results['topic_accuracy'],
+        'subtopic_accuracy': topic_results['subtopic_accuracy']
+    }
+    report = {
+        "predictions": len(predictions),
+        "legacy_seconds": round(legacy_seconds, 3),
+        "engine_seconds": round(engine_seconds, 3),
+        "speedup": round(legacy_seconds / engine_seconds, 2),
+        "max_metric_difference": max(abs(legacy[key] - vectorized[key]) for key in legacy),
+        "entity_micro_f1": round(entity_results['entity_micro_f1'], 4),
+        "role_micro_f1": round(entity_results['role_micro_f1'], 4)
+    }
+    if args.fuzzy:
+        start = time.perf_counter()
+        fuzzy_results = evaluate(predictions, ground_truth, fuzzy=True).entity_metrics()
+        report["fuzzy_seconds"] = round(time.perf_counter() - start, 3)
+        report["fuzzy_us_per_prediction"] = round(report["fuzzy_seconds"] / len(predictions) * 1e6, 1)
+        report["entity_fuzzy_f1"] = round(fuzzy_results['entity_fuzzy_f1'], 4)
+        report["role_fuzzy_f1"] = round(fuzzy_results['role_fuzzy_f1'], 4)
+
+    print(json.dumps(report, indent=2))
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Measure the import time of src.llm.openai_client in a fresh interpreter and
+check that importing it opens no sockets, builds no client and does not load .env.
+
+Usage:
+    python benchmarks/bench_import.py --repeats 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, socket, sys, time
+
+connects = []
+_connect = socket.socket.connect
+def guarded_connect(self, address):
+    connects.append(str(address))
+    raise OSError("network access during import")
+socket.socket.connect = guarded_connect
+
+import dotenv
+dotenv_calls = []
+def guarded_load_dotenv(*args, **kwargs):
+    dotenv_calls.append(True)
+    return False
+dotenv.load_dotenv = guarded_load_dotenv
+
+start = time.perf_counter()
+import src.llm.openai_client
+import src.llm.async_client
+elapsed = time.perf_counter() - start
+
+from src.llm.client_factory import get_client_pool
+pool = get_client_pool()
+print(json.dumps({
+    "seconds": elapsed,
+    "socket_connects": len(connects),
+    "load_dotenv_calls": len(dotenv_calls),
+    "client_built": pool._client is not None
+}))
+"""
+
+def run_probe() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(args.repeats)]
+    report = {
+        "import_seconds_median": round(statistics.median(run["seconds"] for run in runs), 4),
+        "import_seconds_min": round(min(run["seconds"] for run in runs), 4),
+        "socket_connects": max(run["socket_connects"] for run in runs),
+        "load_dotenv_calls": max(run["load_dotenv_calls"] for run in runs),
+        "client_built_at_import": any(run["client_built"] for run in runs)
+    }
+    print(json.dumps(report, indent=2))
+
+    if report["socket_connects"] or report["load_dotenv_calls"] or report["client_built_at_import"]:
+        sys.exit("Import performed network, dotenv or client construction work")
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare peak RSS and throughput of the eager and streaming article loaders.
+
+Usage:
+    python benchmarks/bench_loaders.py --scale 50
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def build_corpus(source: str, scale: int, output_dir: str) -> dict:
+    """Replicate the source corpus scale times as a JSON array and a JSONL file."""
+    with open(source, 'r', encoding='utf-8') as f:
+        articles = json.load(f)
+
+    json_path = os.path.join(output_dir, "corpus.json")
+    jsonl_path = os.path.join(output_dir, "corpus.jsonl")
+    with open(json_path, 'w', encoding='utf-8') as fj, open(jsonl_path, 'w', encoding='utf-8') as fl:
+        fj.write("[")
+        first = True
+        for i in range(scale):
+            for article in articles:
+                record = {"id": f"{article['id']}-{i}", "text": article["text"]}
+                line = json.dumps(record, ensure_ascii=False)
+                fj.write(("" if first else ",\n") + line)
+                fl.write(line + "\n")
+                first = False
+        fj.write("]")
+
+    return {"json": json_path, "jsonl": jsonl_path}
+
+def run_worker(loader: str, path: str) -> dict:
+    """Load the corpus with one loader and report count, time and peak RSS."""
+    import contextlib
+    import io
+    from src.io.load_data import load_articles_json, iter_articles
+
+    start = time.perf_counter()
+    total_chars = 0
+    count = 0
+    if loader == "eager":
+        with contextlib.redirect_stdout(io.StringIO()):
+            articles = load_articles_json(path)
+        for article in articles:
+            total_chars += len(article["text"])
+            count += 1
+    else:
+        for article in iter_articles(path):
+            total_chars += len(article["text"])
+            count += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "loader": loader,
+        "articles": count,
+        "seconds": round(elapsed, 3),
+        "articles_per_second": round(count / elapsed, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=os.path.join(ROOT, "data/raw/clean_articles.json"))
+    parser.add_argument("--scale", type=int, default=20, help="Number of times the source corpus is replicated")
+    parser.add_argument("--worker", nargs=2, metavar=("LOADER", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_corpus(args.source, args.scale, tmp)
+        size_mb = os.path.getsize(paths["json"]) / 1024 / 1024
+        print(f"Corpus: {args.scale}x source, {size_mb:.1f} MB")
+
+        results = []
+        for fmt, path in paths.items():
+            for loader in ("eager", "streaming"):
+                if loader == "eager" and fmt == "jsonl":
+                    continue
+                # Separate process per run so peak RSS is not shared
+                output = subprocess.run(
+                    [sys.executable, __file__, "--worker", loader, path],
+                    capture_output=True, text=True, check=True, cwd=ROOT
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                result["format"] = fmt
+                results.append(result)
+                print(f"{fmt:6s} {loader:10s} {result['articles_per_second']:>12,.0f} articles/s  "
+                      f"peak RSS {result['peak_rss_mb']:.1f} MB")
+
+    return results
+
+if __name__ == "__main__":
+    main()
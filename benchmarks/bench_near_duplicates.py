@@ -0,0 +1,106 @@
+"""
+Stream a synthetic corpus through the near-duplicate index and report
+throughput, detection precision/recall, index size and peak memory.
+Unique articles are assembled from random sentences of the corpus; a
+--dup-ratio share are lightly edited copies (a few words replaced, the
+dateline changed) of one of the last 10k articles, so the generator
+itself stays in bounded memory. Peak RSS is reported at each
+quarter of the run to show that memory does not grow with the corpus.
+
+Usage:
+    python benchmarks/bench_near_duplicates.py --count 100000 --dup-ratio 0.1
+"""
+import argparse
+import json
+import os
+import random
+import re
+import resource
+import sys
+import tempfile
+import time
+from collections import deque
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.io.load_data import iter_articles
+from src.preprocessing.near_duplicates import NearDuplicateIndex
+
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+def edit(text, rng, words=3):
+    """A lightly edited copy: a few words replaced and the year in the dateline changed."""
+    tokens = text.split(" ")
+    for _ in range(words):
+        tokens[rng.randrange(len(tokens))] = rng.choice(["reportedly", "also", "recently", "local", "new"])
+    return re.sub(r'\b(20\d\d)\b', lambda match: str(int(match.group(1)) + 1), " ".join(tokens), count=1)
+
+def synthetic_corpus(sentences, count, dup_ratio, seed):
+    """Yield (article, is_duplicate) pairs."""
+    rng = random.Random(seed)
+    recent = deque(maxlen=10_000)
+    for index in range(count):
+        duplicate = bool(recent) and rng.random() < dup_ratio
+        text = edit(recent[rng.randrange(len(recent))], rng) if duplicate else " ".join(rng.sample(sentences, 12))
+        recent.append(text)
+        yield {"id": f"a{index}", "text": text}, duplicate
+
+def peak_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", default=os.path.join(ROOT, "data/raw/clean_articles.json"))
+    parser.add_argument("--count", type=int, default=20_000, help="Articles to generate")
+    parser.add_argument("--dup-ratio", type=float, default=0.1)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sentences = [
+        sentence for article in iter_articles(args.articles)
+        for sentence in SENTENCE_PATTERN.split(article["text"]) if len(sentence.split()) >= 8
+    ]
+    true_positives = false_positives = false_negatives = 0
+    checkpoints = {args.count * quarter // 4 for quarter in range(1, 5)}
+    rss = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "near_duplicates.sqlite")
+        start = time.perf_counter()
+        with NearDuplicateIndex(path, threshold=args.threshold) as index:
+            for processed, (article, duplicate) in enumerate(synthetic_corpus(sentences, args.count, args.dup_ratio, args.seed), 1):
+                match = index.route(article)
+                if match is not None and duplicate:
+                    true_positives += 1
+                elif match is not None:
+                    false_positives += 1
+                elif duplicate:
+                    false_negatives += 1
+                if processed in checkpoints:
+                    rss[processed] = peak_rss_mb()
+            stats = index.stats()
+        seconds = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(tmp_dir, name)) for name in os.listdir(tmp_dir))
+
+    detected = true_positives + false_positives
+    actual = true_positives + false_negatives
+    report = {
+        "articles": args.count,
+        "true_duplicates": actual,
+        "detected_duplicates": detected,
+        "precision": round(true_positives / detected, 4) if detected else 1.0,
+        "recall": round(true_positives / actual, 4) if actual else 1.0,
+        "llm_calls_avoided": detected,
+        "seconds": round(seconds, 2),
+        "articles_per_second": round(args.count / seconds),
+        "index_bytes": size,
+        "index_bytes_per_article": round(size / args.count),
+        "peak_rss_mb_by_articles": rss,
+        "index": stats
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare single-article and packed multi-article extraction against the local
+stand-in server: prompt tokens per mode and wall-clock time.
+
+Usage:
+    python benchmarks/bench_packing.py --articles 100 --latency 0.5 --token-budget 6000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+
+from openai import OpenAI
+
+from src.io.load_data import iter_articles
+from src.llm.fake_client import DEFAULT_FAKE_EXTRACTION
+from src.llm.fake_server import FakeOpenAIServer
+from src.llm.openai_client import process_single_article
+from src.llm.packing import pack_articles, estimate_prompt_savings, process_articles_packed
+
+def fake_response(messages):
+    """Answer packed prompts with one extraction per ARTICLE ID, others with a single extraction."""
+    article_ids = re.findall(r"^ARTICLE ID: (.+)$", messages[-1]["content"], flags=re.MULTILINE)
+    if article_ids:
+        return {"articles": [dict(DEFAULT_FAKE_EXTRACTION, article_id=article_id) for article_id in article_ids]}
+    return DEFAULT_FAKE_EXTRACTION
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=os.path.join(ROOT, "data/raw/clean_articles.json"))
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated seconds per request")
+    parser.add_argument("--token-budget", type=int, default=6000)
+    args = parser.parse_args()
+
+    articles = []
+    for article in iter_articles(args.source):
+        articles.append(article)
+        if len(articles) >= args.articles:
+            break
+
+    groups = pack_articles(articles, args.token_budget)
+    report = estimate_prompt_savings(articles, groups)
+
+    with FakeOpenAIServer(response_factory=fake_response, latency=args.latency) as server:
+        client = OpenAI(base_url=server.base_url, api_key="fake")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for article in articles:
+                process_single_article(article, client=client)
+            report["single_seconds"] = round(time.perf_counter() - start, 3)
+
+            start = time.perf_counter()
+            process_articles_packed(articles, token_budget=args.token_budget, client=client)
+            report["packed_seconds"] = round(time.perf_counter() - start, 3)
+
+    report["wall_clock_speedup"] = round(report["single_seconds"] / report["packed_seconds"], 2)
+    print(json.dumps(report, indent=2))
+    return report
+
+if __name__ == "__main__":
+    main()
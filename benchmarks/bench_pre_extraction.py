@@ -0,0 +1,76 @@
+"""
+Measure the rule-based header pre-extraction: coverage over the corpus,
+prompt tokens saved by trimming the byline, and date accuracy against the
+ground truth (epoch milliseconds), next to the LLM dates when available.
+
+Usage:
+    python benchmarks/bench_pre_extraction.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.llm.openai_client import build_messages
+from src.llm.packing import count_message_tokens
+from src.llm.tokenizer import get_token_counter
+from src.preprocessing.metadata_extraction import prepare_article
+
+def epoch_ms_to_iso(value):
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc).date().isoformat()
+
+def date_accuracy(dates, ground_truth):
+    """Share of ground truth articles whose date equals dates[uuid], over those with a date."""
+    scored = [(dates[item['uuid']], epoch_ms_to_iso(item['date'])) for item in ground_truth if dates.get(item['uuid'])]
+    correct = sum(predicted[:10] == truth for predicted, truth in scored)
+    return {"scored": len(scored), "correct": correct, "accuracy": round(correct / len(scored), 4) if scored else 0.0}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", default=os.path.join(ROOT, "data/raw/clean_articles.json"))
+    parser.add_argument("--ground-truth", default=os.path.join(ROOT, "data/raw/200_gt_evaluation_human.json"))
+    parser.add_argument("--predictions", default=os.path.join(ROOT, "data/output/extraction_results.json"))
+    args = parser.parse_args()
+
+    with open(args.articles, 'r', encoding='utf-8') as f:
+        articles = json.load(f)
+    with open(args.ground_truth, 'r', encoding='utf-8') as f:
+        ground_truth = json.load(f)
+
+    start = time.perf_counter()
+    prepared = [prepare_article(article, trim=True) for article in articles]
+    seconds = time.perf_counter() - start
+
+    tokens_before = sum(count_message_tokens(build_messages(article['text'])) for article in articles)
+    tokens_after = sum(count_message_tokens(build_messages(article['text'])) for article in prepared)
+    pre = {article['id']: article['pre_extraction'] for article in prepared}
+
+    report = {
+        "articles": len(articles),
+        "us_per_article": round(seconds / len(articles) * 1e6, 1),
+        "coverage": {
+            key: round(sum(bool(fields[key]) for fields in pre.values()) / len(pre), 4)
+            for key in ("title", "author", "place", "date")
+        },
+        "token_counter": "chars/4" if get_token_counter().approximate else "tiktoken",
+        "prompt_tokens_before": tokens_before,
+        "prompt_tokens_after": tokens_after,
+        "prompt_tokens_saved_pct": round(100 * (tokens_before - tokens_after) / tokens_before, 2),
+        "rule_date_accuracy": date_accuracy({uuid: fields['date'] for uuid, fields in pre.items()}, ground_truth)
+    }
+    if os.path.exists(args.predictions):
+        with open(args.predictions, 'r', encoding='utf-8') as f:
+            predictions = json.load(f)
+        llm_dates = {pred['article_id']: pred['extraction'].get('date') for pred in predictions if pred['success'] and pred['extraction']}
+        report["llm_date_accuracy"] = date_accuracy(llm_dates, ground_truth)
+
+    print(json.dumps(report, indent=2))
+    return report
+
+if __name__ == "__main__":
+    main()
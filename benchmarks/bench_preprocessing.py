@@ -0,0 +1,61 @@
+"""
+Measure preprocessing throughput (MB/s of input) for 1 to N worker processes
+on a replicated copy of the article corpus.
+
+Usage:
+    python benchmarks/bench_preprocessing.py --scale 50 --max-workers 4
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_loaders import build_corpus
+from src.preprocessing.text_utils import preprocess_articles_dataset
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=os.path.join(ROOT, "data/raw/clean_articles.json"))
+    parser.add_argument("--scale", type=int, default=50, help="Copies of the source corpus")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument(
+        "--transforms", default="extract_byline,strip_markdown,normalize_whitespace",
+        help="Comma-separated transform chain"
+    )
+    args = parser.parse_args()
+    transforms = args.transforms.split(",")
+
+    report = {"transforms": transforms, "runs": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = build_corpus(args.source, args.scale, tmp)["jsonl"]
+        size_mb = os.path.getsize(corpus) / 1e6
+        report["input_mb"] = round(size_mb, 1)
+
+        for workers in range(1, args.max_workers + 1):
+            output = os.path.join(tmp, f"out_{workers}.jsonl")
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                preprocess_articles_dataset(
+                    corpus, transforms=transforms, workers=workers,
+                    chunk_size=args.chunk_size, output_filepath=output
+                )
+            seconds = time.perf_counter() - start
+            report["runs"].append({
+                "workers": workers,
+                "seconds": round(seconds, 3),
+                "mb_per_second": round(size_mb / seconds, 1)
+            })
+
+    print(json.dumps(report, indent=2))
+    return report
+
+if __name__ == "__main__":
+    main()
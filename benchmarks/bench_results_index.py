@@ -0,0 +1,110 @@
+"""
+Build the SQLite results index from replicated extraction results and time
+lookups by person, person + role, role, topic/subtopic + date range and
+text. Each copy gets new article IDs, dates shifted by whole weeks and
+person names suffixed with the copy number, so people and mentions grow
+with --scale (500 copies of the 200 results: 100k articles, 430k people,
+600k role mentions).
+
+Usage:
+    python benchmarks/bench_results_index.py --scale 500
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.io.load_data import iter_json_records
+from src.io.results_index import ResultsIndex
+
+def replicate(results, scale):
+    """Yield copies of the results with new IDs, shifted dates and renamed people."""
+    for copy in range(scale):
+        for result in results:
+            extraction = dict(result["extraction"])
+            if copy:
+                extraction["people"] = [dict(person, name=f"{person['name']} {copy}") for person in extraction["people"]]
+                extraction["date"] = (date.fromisoformat(extraction["date"]) - timedelta(weeks=copy % 520)).isoformat()
+            yield dict(
+                result,
+                article_id=str(uuid.uuid5(uuid.NAMESPACE_OID, f"{copy}:{result['article_id']}")) if copy else result["article_id"],
+                extraction=extraction
+            )
+
+def time_query(function, repeats):
+    timings, rows = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        rows = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"ms_median": round(statistics.median(timings), 3), "rows": len(rows)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", default=os.path.join(ROOT, "data/output/extraction_results.json"))
+    parser.add_argument("--articles", default=os.path.join(ROOT, "data/raw/clean_articles.json"))
+    parser.add_argument("--scale", type=int, default=500, help="Copies of the results file")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    results = [result for result in iter_json_records(args.results) if result["success"] and result["extraction"]]
+    sample = results[0]["extraction"]
+    person = sample["people"][0]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with ResultsIndex(os.path.join(tmp_dir, "index.sqlite")) as index:
+            start = time.perf_counter()
+            ingest = index.ingest_results(replicate(results, args.scale), args.batch_size)
+            ingest_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            index.ingest_articles(iter_json_records(args.articles), args.batch_size)
+            text_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            index.optimize()
+            optimize_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            reingest = index.ingest_results(results, args.batch_size)
+            reingest_seconds = time.perf_counter() - start
+
+            queries = {
+                "person": lambda: index.query(person=person["name"], limit=None),
+                "person_role": lambda: index.query(person=person["name"], role=person["roles"][0], limit=None),
+                "role": lambda: index.query(role=person["roles"][0], limit=100),
+                "topic_subtopic_month": lambda: index.query(
+                    topic=sample["topic"], subtopic=sample["subtopic"],
+                    date_from=sample["date"][:8] + "01", date_to=sample["date"][:8] + "31", limit=None
+                ),
+                "date_range_week": lambda: index.query(
+                    date_from=sample["date"], date_to=(date.fromisoformat(sample["date"]) + timedelta(days=6)).isoformat(), limit=100
+                ),
+                "text": lambda: index.query(text=sample["subtopic"].split()[0], limit=100),
+                "person_roles": lambda: index.person_roles(person["name"])
+            }
+            report = {
+                "tables": index.stats(),
+                "ingest_seconds": round(ingest_seconds, 2),
+                "ingest_results_per_second": round(ingest["indexed"] / ingest_seconds),
+                "text_ingest_seconds": round(text_seconds, 2),
+                "optimize_seconds": round(optimize_seconds, 2),
+                "unchanged_reingest_seconds": round(reingest_seconds, 3),
+                "unchanged_reingest": reingest,
+                "db_bytes": sum(
+                    os.path.getsize(os.path.join(tmp_dir, name)) for name in os.listdir(tmp_dir)
+                ),
+                "queries": {name: time_query(query, args.repeats) for name, query in queries.items()}
+            }
+
+    print(json.dumps(report, indent=2))
+    return report
+
+if __name__ == "__main__":
+    main()
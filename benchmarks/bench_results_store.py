@@ -0,0 +1,88 @@
+"""
+Compare extraction results stored as indented JSON, JSONL and the columnar
+store: file size, write time, time to load every record, and time to count
+topics (a column-only query for the columnar store). Results are replicated
+with fresh article IDs to simulate larger runs.
+
+Usage:
+    python benchmarks/bench_results_store.py --scale 100
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.io.load_data import iter_json_records
+from src.io.results_store import ResultsStore, write_results_store
+
+def replicate(results, scale):
+    """Copies of the results with deterministic new article IDs."""
+    return [
+        dict(result, article_id=str(uuid.uuid5(uuid.NAMESPACE_OID, f"{copy}:{result['article_id']}")) if copy else result["article_id"])
+        for copy in range(scale) for result in results
+    ]
+
+def timed(function):
+    start = time.perf_counter()
+    value = function()
+    return value, time.perf_counter() - start
+
+def write_json(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+def write_jsonl(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+def count_topics(records):
+    return Counter(record["extraction"]["topic"] for record in records if record["extraction"])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", default=os.path.join(ROOT, "data/output/extraction_results.json"))
+    parser.add_argument("--scale", type=int, default=50, help="Copies of the results file")
+    args = parser.parse_args()
+
+    results = replicate(list(iter_json_records(args.results)), args.scale)
+    formats = {
+        "json": (write_json, lambda path: list(iter_json_records(path))),
+        "jsonl": (write_jsonl, lambda path: list(iter_json_records(path))),
+        "columnar": (write_results_store, lambda path: ResultsStore.open(path).to_records())
+    }
+
+    report = {"records": len(results), "formats": {}}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, (write, load) in formats.items():
+            path = os.path.join(tmp_dir, f"results.{name}")
+            _, write_seconds = timed(lambda: write(results, path))
+            loaded, load_seconds = timed(lambda: load(path))
+            assert loaded == results, f"{name} round trip changed the results"
+            if name == "columnar":
+                topics, topic_seconds = timed(lambda: ResultsStore.open(path).topic_counts())
+            else:
+                topics, topic_seconds = timed(lambda: count_topics(iter_json_records(path)))
+            report["formats"][name] = {
+                "size_bytes": os.path.getsize(path),
+                "write_seconds": round(write_seconds, 4),
+                "load_seconds": round(load_seconds, 4),
+                "topic_counts_seconds": round(topic_seconds, 4),
+                "topics": len(topics)
+            }
+
+    baseline = report["formats"]["json"]
+    for stats in report["formats"].values():
+        stats["size_ratio_vs_json"] = round(stats["size_bytes"] / baseline["size_bytes"], 3)
+    print(json.dumps(report, indent=2))
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Offline end-to-end benchmark suite. Needs no OpenAI key or network.
+
+Scaled corpora are built by replicating data/raw/clean_articles.json (and
+the ground truth and recorded predictions) 1x, 10x and 100x with fresh
+article IDs. Each stage then runs in its own subprocess, so CPU time and
+peak RSS are its own:
+    preprocessing  preprocess_articles_dataset over all articles
+    eda            text length and token statistics
+    evaluation     run_complete_evaluation of the recorded predictions (fuzzy)
+    extraction     process_ground_truth_articles with the async engine against
+                   a local FakeOpenAIServer that replays the extractions in
+                   data/output/extraction_results.json, with a seeded
+                   latency distribution, injected 429s and token usage
+
+Each run records items, wall and CPU seconds, items/s and peak RSS.
+Extraction also records latency percentiles, retries, tokens and server
+counters. The JSON report is written to --output; with --baseline, runs
+whose throughput dropped by more than --tolerance are listed and the exit
+status is 1.
+
+Usage:
+    python benchmarks/bench_suite.py --scales 1,10,100
+    python benchmarks/bench_suite.py --scales 1 --stages extraction --rate-limit-rate 0.05
+    python benchmarks/bench_suite.py --baseline data/output/benchmark_report.json --output /tmp/report.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STAGES = ("preprocessing", "eda", "evaluation", "extraction")
+
+def replicate_corpus(workdir, scale, articles_path, ground_truth_path, results_path):
+    """Write scale copies of articles (JSONL), ground truth and predictions with fresh IDs."""
+    from src.io.load_data import iter_json_records
+
+    def copy_id(copy, article_id):
+        return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{copy}:{article_id}")) if copy else article_id
+
+    articles = list(iter_json_records(articles_path))
+    ground_truth = list(iter_json_records(ground_truth_path))
+    results = list(iter_json_records(results_path))
+    paths = {name: os.path.join(workdir, filename) for name, filename in (
+        ("articles", "articles.jsonl"), ("ground_truth", "ground_truth.json"), ("predictions", "predictions.jsonl")
+    )}
+    with open(paths["articles"], 'w', encoding='utf-8') as articles_file, \
+            open(paths["predictions"], 'w', encoding='utf-8') as predictions_file:
+        for copy in range(scale):
+            for article in articles:
+                articles_file.write(json.dumps(dict(article, id=copy_id(copy, article["id"])), ensure_ascii=False) + "\n")
+            for result in results:
+                predictions_file.write(json.dumps(dict(result, article_id=copy_id(copy, result["article_id"])), ensure_ascii=False) + "\n")
+    with open(paths["ground_truth"], 'w', encoding='utf-8') as f:
+        json.dump([dict(item, uuid=copy_id(copy, item["uuid"])) for copy in range(scale) for item in ground_truth], f, ensure_ascii=False)
+    paths["articles_count"] = len(articles) * scale
+    paths["predictions_count"] = len(results) * scale
+    return paths
+
+def stage_preprocessing(paths, args):
+    from src.preprocessing.text_utils import preprocess_articles_dataset
+
+    preprocess_articles_dataset(paths["articles"], output_filepath=os.path.join(paths["workdir"], "preprocessed.jsonl"))
+    return {"items": paths["articles_count"]}
+
+def stage_eda(paths, args):
+    from src.analysis.eda import EDA
+
+    eda = EDA.from_file(paths["articles"])
+    eda.text_length_stats()
+    token_stats = eda.token_stats(args.model)
+    return {"items": paths["articles_count"], "total_tokens": token_stats.get("total_tokens")}
+
+def stage_evaluation(paths, args):
+    from src.validation.metrics_evaluation import run_complete_evaluation
+
+    report = run_complete_evaluation(paths["predictions"], paths["ground_truth"], save_detailed_report=False, fuzzy_matching=True)
+    return {"items": paths["predictions_count"], "summary": report["summary"]}
+
+def stage_extraction(paths, args):
+    from src.llm.client_factory import ClientConfig, configure_clients
+    from src.llm.telemetry import Telemetry
+    from src.validation.batch_processing import process_ground_truth_articles
+
+    configure_clients(ClientConfig(api_key="fake", base_url=args.base_url, load_env=False))
+    telemetry = Telemetry()
+    results = process_ground_truth_articles(
+        paths["articles"], None, model=args.model, max_concurrency=args.concurrency,
+        requests_per_minute=args.rpm, tokens_per_minute=args.tpm,
+        checkpoint_path=None, telemetry=telemetry, progress_interval=None
+    )
+    stats = telemetry.summary().get(args.model, {})
+    return {
+        "items": len(results),
+        "successful": sum(1 for result in results if result["success"]),
+        "retries": stats.get("retries", 0),
+        "latency_p50": stats.get("latency_p50"),
+        "latency_p95": stats.get("latency_p95"),
+        "latency_p99": stats.get("latency_p99"),
+        "prompt_tokens": stats.get("prompt_tokens", 0),
+        "completion_tokens": stats.get("completion_tokens", 0)
+    }
+
+STAGE_FUNCTIONS = {
+    "preprocessing": stage_preprocessing,
+    "eda": stage_eda,
+    "evaluation": stage_evaluation,
+    "extraction": stage_extraction
+}
+
+def run_stage(args):
+    """Child process: run one stage, print its measurements as one JSON line."""
+    paths = json.loads(args.paths)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    with contextlib.redirect_stdout(sys.stderr):
+        metrics = STAGE_FUNCTIONS[args.run_stage](paths, args)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    print(json.dumps({
+        **metrics,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "items_per_second": round(metrics["items"] / wall, 1) if wall else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }))
+
+def spawn_stage(stage, paths, args, base_url=None):
+    command = [
+        sys.executable, os.path.abspath(__file__), "--run-stage", stage, "--paths", json.dumps(paths),
+        "--model", args.model, "--concurrency", str(args.concurrency), "--rpm", str(args.rpm), "--tpm", str(args.tpm)
+    ]
+    if base_url:
+        command += ["--base-url", base_url]
+    completed = subprocess.run(
+        command, cwd=ROOT, stdout=subprocess.PIPE, stderr=None if args.verbose else subprocess.DEVNULL, text=True
+    )
+    if completed.returncode:
+        return {"error": f"exit status {completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def run_extraction(paths, args):
+    from src.llm.fake_client import FaultInjector, LatencyModel, ReplayResponses
+    from src.llm.fake_server import FakeOpenAIServer
+
+    responses = ReplayResponses.from_files(args.results, args.articles)
+    latency = LatencyModel(
+        args.latency_distribution, median=args.latency_median, sigma=args.latency_sigma,
+        spread=args.latency_spread, seconds_per_token=args.seconds_per_token, seed=args.seed
+    )
+    faults = FaultInjector(rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, seed=args.seed)
+    with FakeOpenAIServer(response_factory=responses, latency_model=latency, faults=faults) as server:
+        run = spawn_stage("extraction", paths, args, server.base_url)
+        run["server"] = {
+            "requests": server.request_count,
+            "injected_429": faults.injected["rate_limit"],
+            "replayed": responses.replayed,
+            "fallback_responses": responses.fallbacks
+        }
+    return run
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(report, baseline, tolerance):
+    """Runs whose items/s fell by more than tolerance relative to the baseline report."""
+    previous = {(run["stage"], run["scale"]): run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in report["runs"]:
+        before = previous.get((run["stage"], run["scale"]))
+        if not before or not before.get("items_per_second") or not run.get("items_per_second"):
+            continue
+        ratio = run["items_per_second"] / before["items_per_second"]
+        if ratio < 1 - tolerance:
+            regressions.append({"stage": run["stage"], "scale": run["scale"], "throughput_ratio": round(ratio, 3)})
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", default=os.path.join(ROOT, "data/raw/clean_articles.json"))
+    parser.add_argument("--ground-truth", default=os.path.join(ROOT, "data/raw/200_gt_evaluation_human.json"))
+    parser.add_argument("--results", default=os.path.join(ROOT, "data/output/extraction_results.json"), help="Recorded extractions to replay and evaluate")
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated corpus multipliers")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated subset of " + ",".join(STAGES))
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent extraction requests")
+    parser.add_argument("--rpm", type=int, default=1_000_000, help="Client-side requests per minute limit")
+    parser.add_argument("--tpm", type=int, default=1_000_000_000, help="Client-side tokens per minute limit")
+    parser.add_argument("--latency-distribution", default="lognormal", choices=["constant", "uniform", "lognormal"])
+    parser.add_argument("--latency-median", type=float, default=0.05, help="Median fake response latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal sigma")
+    parser.add_argument("--latency-spread", type=float, default=0.0, help="Half-width of the uniform distribution")
+    parser.add_argument("--seconds-per-token", type=float, default=0.0, help="Extra latency per completion token")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.01, help="Share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(ROOT, "data/output/benchmark_report.json"))
+    parser.add_argument("--baseline", help="Earlier report to compare throughput against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop before a run counts as a regression")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of each stage")
+    parser.add_argument("--run-stage", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--paths", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        run_stage(args)
+        return None
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    stages = [stage for stage in args.stages.split(",") if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "git_commit": git_commit()
+        },
+        "config": {
+            key: getattr(args, key) for key in (
+                "concurrency", "rpm", "tpm", "latency_distribution", "latency_median", "latency_sigma", "latency_spread",
+                "seconds_per_token", "rate_limit_rate", "retry_after", "seed", "model"
+            )
+        },
+        "runs": []
+    }
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as workdir:
+            paths = replicate_corpus(workdir, scale, args.articles, args.ground_truth, args.results)
+            paths["workdir"] = workdir
+            for stage in stages:
+                print(f"Running {stage} at {scale}x...", file=sys.stderr)
+                run = run_extraction(paths, args) if stage == "extraction" else spawn_stage(stage, paths, args)
+                report["runs"].append({"stage": stage, "scale": scale, **run})
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"Report saved to: {args.output}", file=sys.stderr)
+    if report.get("regressions"):
+        sys.exit(1)
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Cross-validate the local topic classifier on the ground truth and simulate
+routing: articles above the confidence threshold keep the local label, the
+rest take the LLM label from a past extraction run. Reports coverage and
+topic/subtopic accuracy per route for several thresholds, and inference time.
+
+Usage:
+    python benchmarks/bench_topic_classifier.py --folds 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.classification.topic_classifier import TopicClassifier, load_training_examples
+
+def accuracy(pairs):
+    """Topic and subtopic accuracy of (predicted, truth) label pairs."""
+    if not pairs:
+        return {"articles": 0, "topic_accuracy": None, "subtopic_accuracy": None}
+    return {
+        "articles": len(pairs),
+        "topic_accuracy": round(sum(pred[0] == truth[0] for pred, truth in pairs) / len(pairs), 4),
+        "subtopic_accuracy": round(sum(pred == truth for pred, truth in pairs) / len(pairs), 4)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", default=os.path.join(ROOT, "data/raw/clean_articles.json"))
+    parser.add_argument("--ground-truth", default=os.path.join(ROOT, "data/raw/200_gt_evaluation_human.json"))
+    parser.add_argument("--predictions", default=os.path.join(ROOT, "data/output/extraction_results.json"))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--thresholds", default="0.5,0.6,0.7,0.8,0.9")
+    args = parser.parse_args()
+
+    # Ground truth articles only, so every held-out label is human-annotated
+    texts, labels = load_training_examples(args.articles, args.ground_truth)
+    with open(args.articles, 'r', encoding='utf-8') as f:
+        text_ids = {article['text']: article['id'] for article in json.load(f)}
+    with open(args.predictions, 'r', encoding='utf-8') as f:
+        llm_labels = {
+            pred['article_id']: (pred['extraction']['topic'], pred['extraction']['subtopic'])
+            for pred in json.load(f) if pred['success'] and pred['extraction']
+        }
+
+    order = list(range(len(texts)))
+    random.Random(0).shuffle(order)
+    held_out = []
+    train_seconds = predict_seconds = 0.0
+    for fold in range(args.folds):
+        test = set(order[fold::args.folds])
+        start = time.perf_counter()
+        classifier = TopicClassifier.fit([texts[i] for i in order if i not in test], [labels[i] for i in order if i not in test])
+        train_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        predictions = [(i, classifier.predict(texts[i])) for i in sorted(test)]
+        predict_seconds += time.perf_counter() - start
+        held_out.extend(predictions)
+
+    report = {
+        "articles": len(texts),
+        "folds": args.folds,
+        "train_seconds_per_fold": round(train_seconds / args.folds, 3),
+        "us_per_article": round(predict_seconds / len(held_out) * 1e6, 1),
+        "local_only": accuracy([((p["topic"], p["subtopic"]), labels[i]) for i, p in held_out]),
+        "llm_only": accuracy([(llm_labels[text_ids[texts[i]]], labels[i]) for i, _ in held_out if text_ids[texts[i]] in llm_labels]),
+        "routing": []
+    }
+    for threshold in map(float, args.thresholds.split(",")):
+        local = [((p["topic"], p["subtopic"]), labels[i]) for i, p in held_out if p["confidence"] >= threshold]
+        llm = [
+            (llm_labels[text_ids[texts[i]]], labels[i]) for i, p in held_out
+            if p["confidence"] < threshold and text_ids[texts[i]] in llm_labels
+        ]
+        report["routing"].append({
+            "threshold": threshold,
+            "local_share": round(len(local) / len(held_out), 4),
+            "local": accuracy(local),
+            "llm": accuracy(llm),
+            "combined": accuracy(local + llm)
+        })
+
+    print(json.dumps(report, indent=2))
+    return report
+
+if __name__ == "__main__":
+    main()
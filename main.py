@@ -1,59 +1,393 @@
+"""
+Command-line entry point of the extraction pipeline.
+
+Usage:
+    python main.py preprocess data/raw/clean_articles.json --workers 4
+    python main.py extract --concurrency 8 --cache data/cache/responses.sqlite
+    python main.py evaluate data/output/extraction_results.json --fuzzy
+    python main.py resolve data/output/extraction_results.json
+    python main.py dedup data/raw/clean_articles.json --threshold 0.85
+    python main.py evaluate --people-registry data/output/people_registry.json
+    python main.py eda data/raw/clean_articles.json --tokens
+    python main.py convert data/output/extraction_results.json data/output/extraction_results.xrc
+    python main.py index build --articles data/raw/clean_articles.json
+    python main.py index query --role Epidemiologist --date-from 2025-05-01
+    python main.py plan data/raw/clean_articles.json --concurrency 16
+    python main.py test
+
+Subcommands import their dependencies when they run, so `--help` and
+evaluation-only runs do not load openai, tiktoken or pydantic.
+"""
+import argparse
 import json
 import random
-from src.io.load_data import load_articles_json
-from src.llm.openai_client import extract_article_information
 
-def test_random_article(filepath: str = "data/raw/clean_articles.json"):
+DEFAULT_ARTICLES = "data/raw/clean_articles.json"
+DEFAULT_GROUND_TRUTH = "data/raw/200_gt_evaluation_human.json"
+DEFAULT_RESULTS = "data/output/extraction_results.json"
+
+def test_random_article(filepath: str = DEFAULT_ARTICLES):
     """
     Load articles, pick a random one, and test extraction.
     """
+    from src.io.load_data import load_articles_json
+    from src.llm.openai_client import extract_article_information
+
     print("Loading articles...")
     articles = load_articles_json(filepath)
     print(f"Loaded {len(articles)} articles")
-    
+
     # random article
     random_article = random.choice(articles)
     article_id = random_article["id"]
     article_text = random_article["text"]
-    
-    print(f"\nTesting article ID: {article_id[:8]}...")    
+
+    print(f"\nTesting article ID: {article_id[:8]}...")
     print(f"\nArticle preview:")
     print("-" * 50)
     print(article_text[:300] + "..." if len(article_text) > 300 else article_text)
     print("-" * 50)
-    
+
     print(f"\n🤖 Extracting information...")
     result = extract_article_information(article_text)
-    
+
     if result["success"]:
         print("Extraction successful!")
         print(f"Tokens used: {result['metadata']['tokens_used']}")
-        
+
         data = result["data"]
         print(f"\nPeople found: {len(data['people'])}")
         for i, person in enumerate(data["people"]):
             print(f"  {i+1} {person['name']}: {', '.join(person['roles'])}")
-        
+
         print(f"\nTopic: {data['topic']}")
         print(f"  Subtopic: {data['subtopic']}")
         print(f"  Date: {data['date']}")
-        
+
         print(f"\nFull JSON output:")
         print(json.dumps(data, indent=2, ensure_ascii=False))
-        
+
     else:
         print("Extraction failed!")
         print(f"Error: {result['error']}")
-    
+
     return result
 
-if __name__ == "__main__":
-    print("Article Extraction Test")
-    
+def progress_interval(args: argparse.Namespace):
+    return None if args.no_progress else args.progress_interval
+
+def run_preprocess(args: argparse.Namespace) -> str:
+    from src.preprocessing.text_utils import preprocess_articles_dataset, resolve_transforms
+
     try:
-        print("\nTesting random article from dataset:")
-        test_random_article()
-    except Exception as e:
-        print(f"Error testing random article: {e}")
-    
-    print("\nTest completed!")
\ No newline at end of file
+        resolve_transforms(args.transforms)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    return preprocess_articles_dataset(
+        args.input,
+        output_dir=args.output_dir,
+        transforms=args.transforms,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        output_filepath=args.output,
+        progress_interval=progress_interval(args)
+    )
+
+def run_extract(args: argparse.Namespace):
+    from src.validation.batch_processing import process_ground_truth_articles, save_final_results
+
+    cache = telemetry = topic_classifier = dedup_index = None
+    if args.dedup_index:
+        from src.preprocessing.near_duplicates import NearDuplicateIndex
+        dedup_index = NearDuplicateIndex(args.dedup_index, threshold=args.dedup_threshold)
+    if args.cache:
+        from src.llm.cache import ResponseCache
+        cache = ResponseCache(args.cache)
+    if args.telemetry or args.prometheus:
+        from src.llm.telemetry import Telemetry
+        telemetry = Telemetry(args.telemetry)
+    if args.topic_classifier:
+        from src.classification.topic_classifier import TopicClassifier
+        topic_classifier = TopicClassifier.load(args.topic_classifier)
+
+    try:
+        results = process_ground_truth_articles(
+            args.articles,
+            None if args.all_articles else args.ground_truth,
+            model=args.model,
+            batch_size=args.checkpoint_every,
+            max_concurrency=args.concurrency,
+            requests_per_minute=args.rpm,
+            tokens_per_minute=args.tpm,
+            cache=cache,
+            refresh_cache=args.refresh_cache,
+            use_batch_api=args.batch_api,
+            checkpoint_path=None if args.no_checkpoint else args.checkpoint,
+            resume=not args.no_resume,
+            pack_token_budget=args.pack_token_budget,
+            prompt_layout=args.prompt_layout,
+            telemetry=telemetry,
+            pre_extract=args.pre_extract,
+            trim_byline=args.trim_byline,
+            topic_classifier=topic_classifier,
+            topic_confidence_threshold=args.topic_threshold,
+            chunk_tokens=args.chunk_tokens,
+            progress_interval=progress_interval(args),
+            dedup_index=dedup_index
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+        if dedup_index is not None:
+            dedup_index.close()
+        if telemetry is not None:
+            if args.prometheus:
+                telemetry.write_prometheus(args.prometheus)
+            telemetry.close()
+    if results:
+        save_final_results(results, args.output, output_format=args.format)
+    return results
+
+def run_evaluate(args: argparse.Namespace):
+    if args.incremental and args.people_registry:
+        # Canonical IDs move as the registry grows, so cached counts would go stale
+        raise SystemExit("--people-registry cannot be combined with --incremental")
+    if args.incremental:
+        from src.validation.incremental_evaluation import run_incremental_evaluation
+
+        report = run_incremental_evaluation(
+            args.predictions, args.ground_truth, state_path=args.state,
+            report_path=args.report, fuzzy_matching=args.fuzzy
+        )
+        print(json.dumps(report["summary"], indent=2))
+        return report
+
+    from src.validation.metrics_evaluation import run_complete_evaluation
+
+    return run_complete_evaluation(
+        args.predictions, args.ground_truth, save_detailed_report=args.report is not None,
+        fuzzy_matching=args.fuzzy, report_path=args.report, people_registry_path=args.people_registry
+    )
+
+def run_dedup(args: argparse.Namespace):
+    from src.preprocessing.near_duplicates import find_near_duplicates
+
+    report = find_near_duplicates(args.articles, args.index, threshold=args.threshold, pairs_filepath=args.pairs)
+    print(json.dumps(report, indent=2))
+    return report
+
+def run_resolve(args: argparse.Namespace):
+    from src.validation.entity_resolution import run_entity_resolution
+
+    return run_entity_resolution(
+        args.results, registry_path=args.registry, people_filepath=args.people,
+        annotated_filepath=args.annotate, threshold=args.threshold
+    )
+
+def run_eda(args: argparse.Namespace):
+    from src.analysis.eda import EDA
+
+    eda = EDA.from_file(args.input)
+    report = {"text_length_stats": eda.text_length_stats()}
+    if args.tokens:
+        report["token_stats"] = eda.token_stats(args.model)
+    if args.results:
+        from src.analysis.eda import extraction_stats
+        report["extraction_stats"] = extraction_stats(args.results)
+    if args.format == "json":
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for section, stats in report.items():
+            print(f"\n{section}:")
+            for key, value in stats.items():
+                if not key.endswith("histogram"):
+                    print(f"   {key}: {value}")
+        if args.preview:
+            eda.preview_articles(args.preview)
+    return report
+
+def run_plan(args: argparse.Namespace):
+    from src.analysis.cost_planner import run_planner
+
+    return run_planner(args)
+
+def run_convert(args: argparse.Namespace):
+    from src.io.results_store import convert_results
+
+    output = convert_results(args.input, args.output, args.format)
+    print(f"Results written to: {output}")
+    return output
+
+def run_index(args: argparse.Namespace):
+    from src.io.results_index import ResultsIndex, build_index
+
+    if args.index_command == "build":
+        report = build_index(args.results, args.articles, args.db, args.batch_size)
+        print(json.dumps(report, indent=2))
+        return report
+
+    with ResultsIndex(args.db) as index:
+        if args.person_roles:
+            rows = index.person_roles(args.person_roles)
+        elif args.people_with_role:
+            rows = index.people_with_role(args.people_with_role, args.limit)
+        else:
+            import sqlite3
+
+            try:
+                rows = index.query(
+                    person=args.person, role=args.role, topic=args.topic, subtopic=args.subtopic,
+                    date_from=args.date_from, date_to=args.date_to, text=args.text, limit=args.limit
+                )
+            except sqlite3.OperationalError as e:
+                if args.text is None:
+                    raise
+                raise SystemExit(f"Bad --text query {args.text!r}: {e}")
+    if args.format == "json":
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+    elif isinstance(rows, dict):
+        for name, count in rows.items():
+            print(f"{count:6d}  {name}")
+    else:
+        for row in rows:
+            print(f"{row['date'] or '':10s}  {row['article_id']}  {row['topic'] or '-'}/{row['subtopic'] or '-'}  {row['title'] or ''}")
+    return rows
+
+def run_test(args: argparse.Namespace):
+    return test_random_article(args.articles)
+
+def add_progress_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--progress-interval", type=float, default=2.0, help="Seconds between progress lines")
+    parser.add_argument("--no-progress", action="store_true", help="Do not print progress")
+
+def build_parser() -> argparse.ArgumentParser:
+    from src.analysis.cost_planner import build_parser as build_plan_parser
+    from src.preprocessing.text_utils import DEFAULT_TRANSFORMS, TRANSFORMS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+
+    preprocess = subparsers.add_parser("preprocess", help="Clean articles and write them as JSONL")
+    preprocess.add_argument("input", nargs="?", default=DEFAULT_ARTICLES, help="Articles as JSON array or JSONL")
+    preprocess.add_argument("--output", help="Output file, a JSON array for .json and JSONL otherwise (default: <output-dir>/<input>_preprocessed.jsonl)")
+    preprocess.add_argument("--output-dir", default="data/preprocessed")
+    preprocess.add_argument("--transforms", nargs="+", default=list(DEFAULT_TRANSFORMS), choices=sorted(TRANSFORMS))
+    preprocess.add_argument("--workers", type=int, default=1, help="Worker processes")
+    preprocess.add_argument("--chunk-size", type=int, default=256, help="Articles per worker task")
+    add_progress_arguments(preprocess)
+    preprocess.set_defaults(handler=run_preprocess)
+
+    extract = subparsers.add_parser("extract", help="Extract people, roles, topic and date with the LLM")
+    extract.add_argument("--articles", default=DEFAULT_ARTICLES, help="Articles as JSON array or JSONL")
+    extract.add_argument("--ground-truth", default=DEFAULT_GROUND_TRUTH, help="Only articles in this ground truth are extracted")
+    extract.add_argument("--all-articles", action="store_true", help="Extract every article instead of the ground truth subset")
+    extract.add_argument("--model", default="gpt-4o-mini")
+    extract.add_argument("--concurrency", type=int, default=1, help="Concurrent requests (>1 uses the async engine)")
+    extract.add_argument("--rpm", type=int, default=500, help="Requests per minute limit")
+    extract.add_argument("--tpm", type=int, default=200_000, help="Tokens per minute limit")
+    extract.add_argument("--batch-api", action="store_true", help="Submit one OpenAI Batch API job")
+    extract.add_argument("--pack-token-budget", type=int, help="Pack several articles per request under this prompt budget")
+    extract.add_argument("--prompt-layout", default="default", choices=["default", "cache_friendly"])
+    extract.add_argument("--chunk-tokens", type=int, help="Split articles longer than this into chunks")
+    extract.add_argument("--cache", help="SQLite response cache path")
+    extract.add_argument("--refresh-cache", action="store_true", help="Ignore cached responses and overwrite them")
+    extract.add_argument("--checkpoint", default="data/output/extraction_checkpoint.jsonl", help="Checkpoint journal path")
+    extract.add_argument("--checkpoint-every", type=int, default=10, help="Results between checkpoint fsyncs")
+    extract.add_argument("--no-checkpoint", action="store_true", help="Do not write a checkpoint journal")
+    extract.add_argument("--no-resume", action="store_true", help="Discard the checkpoint and start over")
+    extract.add_argument("--pre-extract", action="store_true", help="Take title, byline and date from the header with rules")
+    extract.add_argument("--trim-byline", action="store_true", help="Also remove the byline from the prompt")
+    extract.add_argument("--topic-classifier", help="Local topic classifier (.npz) used for confident articles")
+    extract.add_argument("--topic-threshold", type=float, default=0.7, help="Confidence needed to keep the local topic")
+    extract.add_argument("--dedup-index", help="Near-duplicate index; duplicates reuse the original's extraction")
+    extract.add_argument("--dedup-threshold", type=float, default=0.85, help="MinHash similarity that counts as a duplicate")
+    extract.add_argument("--telemetry", help="Write per-call telemetry to this JSONL file")
+    extract.add_argument("--prometheus", help="Write telemetry counters and latency histogram in Prometheus text format to this file")
+    extract.add_argument("--output", default=DEFAULT_RESULTS)
+    extract.add_argument("--format", default="json", choices=["json", "jsonl", "columnar"], help="Output file format")
+    add_progress_arguments(extract)
+    extract.set_defaults(handler=run_extract)
+
+    evaluate = subparsers.add_parser("evaluate", help="Score predictions against the ground truth")
+    evaluate.add_argument("predictions", nargs="?", default=DEFAULT_RESULTS, help="Predictions as JSON array, JSONL or columnar store")
+    evaluate.add_argument("--ground-truth", default=DEFAULT_GROUND_TRUTH)
+    evaluate.add_argument("--fuzzy", action="store_true", help="Add honorific- and typo-tolerant entity metrics")
+    evaluate.add_argument("--report", default="data/output/evaluation_report.json", help="Report path")
+    evaluate.add_argument("--no-report", dest="report", action="store_const", const=None, help="Do not write a report")
+    evaluate.add_argument("--incremental", action="store_true", help="Rescore only predictions changed since the last run")
+    evaluate.add_argument("--state", default="data/output/evaluation_state.jsonl", help="Incremental evaluation state")
+    evaluate.add_argument("--people-registry", help="Add metrics over canonical person IDs from this registry (see resolve)")
+    evaluate.set_defaults(handler=run_evaluate)
+
+    dedup = subparsers.add_parser("dedup", help="Fingerprint articles and find near-duplicates (MinHash/LSH)")
+    dedup.add_argument("articles", nargs="?", default=DEFAULT_ARTICLES, help="Articles as JSON array or JSONL")
+    dedup.add_argument("--index", default="data/index/near_duplicates.sqlite", help="Persistent LSH index, updated incrementally")
+    dedup.add_argument("--threshold", type=float, default=0.85, help="MinHash similarity that counts as a duplicate")
+    dedup.add_argument("--pairs", help="Write each duplicate and its original to this JSONL file")
+    dedup.set_defaults(handler=run_dedup)
+
+    resolve = subparsers.add_parser("resolve", help="Link people across articles into canonical person IDs")
+    resolve.add_argument("results", nargs="?", default=DEFAULT_RESULTS, help="Results as JSON array, JSONL or columnar store")
+    resolve.add_argument("--registry", default="data/output/people_registry.json", help="Registry state, updated incrementally")
+    resolve.add_argument("--people", default="data/output/people.json", help="People list with roles and name variants")
+    resolve.add_argument("--annotate", help="Also write the results with a person_id per person (.json or .jsonl)")
+    resolve.add_argument("--threshold", type=float, default=0.8, help="Name similarity to link (new registries only)")
+    resolve.set_defaults(handler=run_resolve)
+
+    eda = subparsers.add_parser("eda", help="Length and token statistics of a corpus")
+    eda.add_argument("input", nargs="?", default=DEFAULT_ARTICLES, help="Articles as JSON array or JSONL")
+    eda.add_argument("--tokens", action="store_true", help="Also compute token statistics")
+    eda.add_argument("--model", default="gpt-4o-mini")
+    eda.add_argument("--results", help="Also summarise extraction results (JSON, JSONL or columnar store)")
+    eda.add_argument("--preview", type=int, default=0, help="Print the first N articles")
+    eda.add_argument("--format", default="text", choices=["text", "json"])
+    eda.set_defaults(handler=run_eda)
+
+    plan = subparsers.add_parser("plan", help="Estimate cost and duration of an extraction run")
+    build_plan_parser(plan)
+    plan.set_defaults(handler=run_plan)
+
+    convert = subparsers.add_parser("convert", help="Convert results between JSON, JSONL and the columnar store")
+    convert.add_argument("input", help="Results as JSON array, JSONL or columnar store")
+    convert.add_argument("output", help="Output path (.json, .jsonl, or any other suffix for a columnar store)")
+    convert.add_argument("--format", choices=["json", "jsonl", "columnar"], help="Output format (default: from the suffix)")
+    convert.set_defaults(handler=run_convert)
+
+    index = subparsers.add_parser("index", help="Build or query the SQLite index of results")
+    index_commands = index.add_subparsers(dest="index_command", metavar="index_command", required=True)
+    index_build = index_commands.add_parser("build", help="Ingest results and article texts (incremental)")
+    index_build.add_argument("--results", default=DEFAULT_RESULTS, help="Results as JSON array, JSONL or columnar store")
+    index_build.add_argument("--articles", help="Articles to index for full-text search")
+    index_build.add_argument("--batch-size", type=int, default=10_000, help="Records per transaction")
+    index_query = index_commands.add_parser("query", help="Look up articles by person, role, topic, date or text")
+    index_query.add_argument("--person")
+    index_query.add_argument("--role")
+    index_query.add_argument("--topic")
+    index_query.add_argument("--subtopic")
+    index_query.add_argument("--date-from", help="Inclusive ISO date")
+    index_query.add_argument("--date-to", help="Inclusive ISO date")
+    index_query.add_argument("--text", help="FTS5 query over article title and text")
+    index_query.add_argument("--person-roles", metavar="PERSON", help="List the roles of a person instead")
+    index_query.add_argument("--people-with-role", metavar="ROLE", help="List the people seen in a role instead")
+    index_query.add_argument("--limit", type=int, default=100)
+    index_query.add_argument("--format", default="text", choices=["text", "json"])
+    for subparser in (index_build, index_query):
+        subparser.add_argument("--db", default="data/index/results.sqlite", help="Index database path")
+    index.set_defaults(handler=run_index)
+
+    test = subparsers.add_parser("test", help="Extract a random article and print the result")
+    test.add_argument("--articles", default=DEFAULT_ARTICLES)
+    test.set_defaults(handler=run_test)
+
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return None
+    return args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""Pre-flight cost and wall-clock planner for extraction runs."""
+import argparse
+import json
+import os
+import random
+from typing import Dict, Optional
+
+from src.io.load_data import iter_json_records
+from src.utils.progress import format_duration
+
+BATCH_API_DISCOUNT = 0.5
+BATCH_COMPLETION_WINDOW_HOURS = 24
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_BLOCK_TOKENS = 128
+# Per-article JSON keys, quotes and separators, for extrapolating from file size
+RECORD_OVERHEAD_BYTES = 24
+
+def profile_corpus(
+    filepath: str,
+    model: str = "gpt-4o-mini",
+    sample_size: int = 2000,
+    scan_limit: Optional[int] = None,
+    seed: int = 0
+) -> Dict:
+    """
+    Count articles and characters in one streaming pass and tokenize a
+    reservoir sample to convert characters into tokens. When scan_limit
+    articles have been read before the end of the file, totals are
+    extrapolated from the file size.
+    """
+    from src.llm.tokenizer import get_token_counter
+
+    rng = random.Random(seed)
+    sample = []
+    articles = total_chars = scanned_bytes = 0
+    truncated = False
+    for record in iter_json_records(filepath):
+        if scan_limit and articles >= scan_limit:
+            truncated = True
+            break
+        text = record["text"]
+        articles += 1
+        total_chars += len(text)
+        scanned_bytes += len(text.encode("utf-8")) + text.count("\n") + len(record["id"]) + RECORD_OVERHEAD_BYTES
+        if len(sample) < sample_size:
+            sample.append(text)
+        else:
+            index = rng.randrange(articles)
+            if index < sample_size:
+                sample[index] = text
+
+    if truncated:
+        scale = os.path.getsize(filepath) / scanned_bytes
+        articles, total_chars = round(articles * scale), round(total_chars * scale)
+
+    counter = get_token_counter(model)
+    sample_tokens = counter.count_batch(sample)
+    tokens_per_char = sum(sample_tokens) / max(1, sum(len(text) for text in sample))
+    return {
+        "articles": articles,
+        "total_chars": total_chars,
+        "extrapolated": truncated,
+        "sampled_articles": len(sample),
+        "tokens_per_char": tokens_per_char,
+        "article_tokens": round(total_chars * tokens_per_char),
+        "approximate_tokenizer": counter.approximate
+    }
+
+def profile_history(results_filepath: Optional[str], model: str = "gpt-4o-mini") -> Dict:
+    """
+    Mean completion tokens (and latency, when recorded) per article from a past run.
+    Results without completion_tokens metadata are measured on their compact extraction JSON.
+    """
+    from src.llm.tokenizer import get_token_counter
+
+    history = {"results": 0, "avg_completion_tokens": None, "avg_latency_seconds": None}
+    if not results_filepath or not os.path.exists(results_filepath):
+        return history
+
+    counter = get_token_counter(model)
+    completion_tokens = []
+    latencies = []
+    for result in iter_json_records(results_filepath):
+        if not result.get("success") or not result.get("extraction"):
+            continue
+        metadata = result.get("metadata") or {}
+        if metadata.get("completion_tokens") and not metadata.get("packed_request_size"):
+            completion_tokens.append(metadata["completion_tokens"])
+        else:
+            completion_tokens.append(counter.count(json.dumps(result["extraction"], ensure_ascii=False, separators=(",", ":"))))
+        if metadata.get("latency_seconds") and not metadata.get("cache_hit"):
+            latencies.append(metadata["latency_seconds"])
+
+    history["results"] = len(completion_tokens)
+    if completion_tokens:
+        history["avg_completion_tokens"] = sum(completion_tokens) / len(completion_tokens)
+    if latencies:
+        history["avg_latency_seconds"] = sum(latencies) / len(latencies)
+    return history
+
+def prompt_overheads(model: str = "gpt-4o-mini", prompt_layout: str = "default") -> Dict:
+    """
+    Tokens each request adds around the article text with the real prompt templates.
+    """
+    from src.llm.openai_client import build_messages
+    from src.llm.packing import build_packed_messages, count_message_tokens
+    from src.llm.prompts import PromptTemplates
+    from src.llm.tokenizer import get_token_counter
+
+    single = count_message_tokens(build_messages("", prompt_layout), model)
+    # Static prefix shared by consecutive requests (article text placed last)
+    template = PromptTemplates.USER_PROMPT_TEMPLATES[prompt_layout]
+    prefix = count_message_tokens([
+        {"content": PromptTemplates.SYSTEM_PROMPT},
+        {"content": template[:template.index("{text}")]}
+    ], model) if template.rstrip().endswith("{text}") else 0
+    return {
+        "single_request": single,
+        "cacheable_prefix": prefix if prefix >= PROMPT_CACHE_MIN_TOKENS else 0,
+        "packed_request": count_message_tokens(build_packed_messages([]), model),
+        "packed_article": get_token_counter(model).count(
+            PromptTemplates.PACKED_ARTICLE_TEMPLATE.format(article_id="00000000-0000-0000-0000-000000000000", text="")
+        )
+    }
+
+def plan_run(
+    corpus: Dict,
+    history: Dict,
+    overheads: Dict,
+    model: str = "gpt-4o-mini",
+    pricing: Optional[tuple] = None,
+    requests_per_minute: int = 500,
+    tokens_per_minute: int = 200_000,
+    max_concurrency: int = 8,
+    pack_token_budget: int = 6000,
+    max_articles_per_request: int = 10,
+    base_latency_seconds: float = 0.6,
+    output_tokens_per_second: float = 70.0,
+    default_completion_tokens: float = 150.0
+) -> Dict:
+    """
+    Estimate requests, tokens, cost and wall-clock time per execution mode.
+    Request latency is modelled as base latency plus completion tokens at
+    output_tokens_per_second; a recorded average latency calibrates the speed.
+    """
+    from src.llm.telemetry import MODEL_PRICING
+
+    pricing = pricing or MODEL_PRICING.get(model)
+    if pricing is None:
+        raise ValueError(f"No pricing known for model '{model}', pass pricing=(input, cached, output)")
+    input_price, cached_price, output_price = pricing
+
+    articles = corpus["articles"]
+    article_tokens = corpus["article_tokens"] / articles if articles else 0.0
+    completion = history["avg_completion_tokens"] or default_completion_tokens
+    if history["avg_latency_seconds"] and history["avg_latency_seconds"] > base_latency_seconds:
+        output_tokens_per_second = completion / (history["avg_latency_seconds"] - base_latency_seconds)
+
+    def request_latency(completion_tokens: float) -> float:
+        return base_latency_seconds + completion_tokens / output_tokens_per_second
+
+    def throughput(concurrency: int, latency: float, tokens_per_request: float) -> tuple:
+        """Requests per second and the binding limit."""
+        limits = {
+            "concurrency": concurrency / latency,
+            "requests_per_minute": requests_per_minute / 60,
+            "tokens_per_minute": tokens_per_minute / 60 / tokens_per_request
+        }
+        bottleneck = min(limits, key=limits.get)
+        return limits[bottleneck], bottleneck
+
+    def cost(prompt_tokens: float, cached_tokens: float, completion_tokens: float, discount: float = 1.0) -> float:
+        return discount * (
+            (prompt_tokens - cached_tokens) * input_price + cached_tokens * cached_price + completion_tokens * output_price
+        ) / 1_000_000
+
+    single_prompt = overheads["single_request"] + article_tokens
+    cached = overheads["cacheable_prefix"] // PROMPT_CACHE_BLOCK_TOKENS * PROMPT_CACHE_BLOCK_TOKENS
+    totals = {
+        "prompt_tokens": articles * single_prompt,
+        "cached_tokens": max(0, articles - 1) * cached,
+        "completion_tokens": articles * completion
+    }
+    single_cost = cost(totals["prompt_tokens"], totals["cached_tokens"], totals["completion_tokens"])
+    latency = request_latency(completion)
+
+    modes = {}
+    for mode, concurrency in (("sequential", 1), ("concurrent", max_concurrency)):
+        rate, bottleneck = throughput(concurrency, latency, single_prompt + completion)
+        modes[mode] = {
+            "requests": articles,
+            **{key: round(value) for key, value in totals.items()},
+            "cost_usd": single_cost,
+            "wall_clock_seconds": articles / rate,
+            "articles_per_second": rate,
+            "bottleneck": bottleneck
+        }
+
+    per_article = overheads["packed_article"] + article_tokens
+    per_request = max(1, min(max_articles_per_request, int((pack_token_budget - overheads["packed_request"]) // per_article)))
+    packed_requests = -(-articles // per_request)
+    packed_prompt = packed_requests * overheads["packed_request"] + articles * per_article
+    packed_latency = request_latency(completion * per_request)
+    rate, bottleneck = throughput(1, packed_latency, packed_prompt / max(1, packed_requests) + completion * per_request)
+    modes["packed"] = {
+        "requests": packed_requests,
+        "articles_per_request": per_request,
+        "prompt_tokens": round(packed_prompt),
+        "cached_tokens": 0,
+        "completion_tokens": round(totals["completion_tokens"]),
+        "cost_usd": cost(packed_prompt, 0, totals["completion_tokens"]),
+        "wall_clock_seconds": packed_requests / rate,
+        "articles_per_second": articles / (packed_requests / rate) if packed_requests else 0.0,
+        "bottleneck": bottleneck
+    }
+
+    modes["batch_api"] = {
+        "requests": articles,
+        "prompt_tokens": round(totals["prompt_tokens"]),
+        "cached_tokens": 0,
+        "completion_tokens": round(totals["completion_tokens"]),
+        "cost_usd": cost(totals["prompt_tokens"], 0, totals["completion_tokens"], BATCH_API_DISCOUNT),
+        # The Batch API only guarantees completion within its window
+        "wall_clock_seconds": None,
+        "max_wall_clock_seconds": BATCH_COMPLETION_WINDOW_HOURS * 3600,
+        "bottleneck": "completion_window"
+    }
+
+    return {
+        "model": model,
+        "corpus": corpus,
+        "history": history,
+        "prompt_overheads": overheads,
+        "assumptions": {
+            "avg_article_tokens": article_tokens,
+            "avg_completion_tokens": completion,
+            "request_latency_seconds": latency,
+            "output_tokens_per_second": output_tokens_per_second,
+            "pricing_per_1m_tokens": {"input": input_price, "cached_input": cached_price, "output": output_price}
+        },
+        "modes": modes
+    }
+
+def print_plan(plan: Dict) -> None:
+    corpus = plan["corpus"]
+    print(f"Corpus: {corpus['articles']:,} articles, ~{corpus['article_tokens']:,} article tokens"
+          + (" (extrapolated from file size)" if corpus["extrapolated"] else "")
+          + (" (approximate tokenizer)" if corpus["approximate_tokenizer"] else ""))
+    print(f"Completion tokens per article: {plan['assumptions']['avg_completion_tokens']:.0f}, "
+          f"request latency: {plan['assumptions']['request_latency_seconds']:.2f}s")
+    print(f"\n{'mode':<12}{'requests':>12}{'prompt tok':>16}{'output tok':>14}{'cost USD':>12}{'wall clock':>14}  bottleneck")
+    for mode, estimate in plan["modes"].items():
+        wall_clock = format_duration(estimate["wall_clock_seconds"])
+        if estimate["wall_clock_seconds"] is None:
+            wall_clock = f"<= {format_duration(estimate['max_wall_clock_seconds'])}"
+        print(f"{mode:<12}{estimate['requests']:>12,}{estimate['prompt_tokens']:>16,}{estimate['completion_tokens']:>14,}"
+              f"{estimate['cost_usd']:>12.2f}{wall_clock:>14}  {estimate['bottleneck']}")
+
+def build_parser(parser: Optional[argparse.ArgumentParser] = None) -> argparse.ArgumentParser:
+    parser = parser or argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", default="data/raw/clean_articles.json", help="Articles as JSON array or JSONL")
+    parser.add_argument("--history", default="data/output/extraction_results.json", help="Past results for completion tokens")
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--prompt-layout", default="default", choices=["default", "cache_friendly"])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rpm", type=int, default=500, help="Requests per minute limit")
+    parser.add_argument("--tpm", type=int, default=200_000, help="Tokens per minute limit")
+    parser.add_argument("--pack-token-budget", type=int, default=6000)
+    parser.add_argument("--max-articles-per-request", type=int, default=10)
+    parser.add_argument("--sample-size", type=int, default=2000, help="Articles tokenized exactly")
+    parser.add_argument("--scan-limit", type=int, default=200_000, help="Articles streamed before extrapolating (0: full scan)")
+    parser.add_argument("--price", type=float, nargs=3, metavar=("INPUT", "CACHED", "OUTPUT"), help="USD per 1M tokens")
+    parser.add_argument("--json", action="store_true", help="Print the plan as JSON")
+    return parser
+
+def run_planner(args: argparse.Namespace) -> Dict:
+    corpus = profile_corpus(args.corpus, args.model, args.sample_size, args.scan_limit or None)
+    plan = plan_run(
+        corpus,
+        profile_history(args.history, args.model),
+        prompt_overheads(args.model, args.prompt_layout),
+        model=args.model,
+        pricing=tuple(args.price) if args.price else None,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        max_concurrency=args.concurrency,
+        pack_token_budget=args.pack_token_budget,
+        max_articles_per_request=args.max_articles_per_request
+    )
+    if args.json:
+        print(json.dumps(plan, indent=2))
+    else:
+        print_plan(plan)
+    return plan
+
+def main(argv=None) -> Dict:
+    return run_planner(build_parser().parse_args(argv))
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,202 @@
 import random
-from typing import Dict, List, Tuple
-import tiktoken
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple, Union
 import re
 
+import numpy as np
+
+from src.llm.telemetry import percentile
+from src.llm.tokenizer import get_token_counter
+
+if TYPE_CHECKING:
+    from src.io.results_store import ResultsStore
+
+PERCENTILES = (50, 90, 95, 99)
+
+def distribution_stats(values: np.ndarray, unit: str, bins: int = 10) -> Dict:
+    """
+    Percentiles and a histogram of a length distribution, keyed like p95_<unit>.
+    """
+    counts, edges = np.histogram(values, bins=bins)
+    stats = {f"p{q}_{unit}": float(value) for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+    stats[f"{unit}_histogram"] = {"bin_edges": edges.round(1).tolist(), "counts": counts.tolist()}
+    return stats
+
+def extraction_stats(results: Union[str, "ResultsStore"], top_roles: int = 20) -> Dict:
+    """
+    Summarise extraction results: success rate, token usage, topic/subtopic
+    and role frequencies and people per article. Columnar stores are
+    aggregated from their encoded columns without rebuilding records;
+    JSON/JSONL files are encoded in memory first.
+    """
+    from src.io.load_data import iter_json_records
+    from src.io.results_store import ResultsStore, is_results_store
+    
+    if isinstance(results, str):
+        results = ResultsStore.open(results) if is_results_store(results) else ResultsStore.from_records(iter_json_records(results))
+    if not len(results):
+        return {"num_results": 0}
+    
+    tokens_used = np.asarray(results.columns["articles.tokens_used"])
+    people = results.people_per_article()[np.asarray(results.columns["articles.has_extraction"])]
+    stats = {
+        "num_results": len(results),
+        "success_rate": float(np.mean(results.columns["articles.success"])),
+        "total_tokens_used": int(tokens_used[tokens_used >= 0].sum()),
+        "topic_counts": results.topic_counts(),
+        "subtopic_counts": results.subtopic_counts(),
+        "top_roles": dict(islice(results.role_counts().items(), top_roles))
+    }
+    if len(people):
+        stats["avg_people"] = float(people.mean())
+        stats.update(distribution_stats(people, "people"))
+    return stats
+
 class EDA:
-    def __init__(self, data: List[Dict[str, str]]):
+    def __init__(self, data: Iterable[Dict[str, str]]):
         """
-        Initialize the EDA instance with list of articles.
+        Initialize the EDA instance with a list of articles or a re-iterable
+        stream such as ArticleStream.
         """
         self.data = data
-        self.texts = [article['text'] for article in data]
-        self.ids = [article['id'] for article in data]
+    
+    @classmethod
+    def from_file(cls, filepath: str) -> "EDA":
+        """Build an EDA instance that streams articles from a JSON or JSONL file."""
+        from src.io.load_data import ArticleStream
+        
+        return cls(ArticleStream(filepath))
+    
+    @property
+    def texts(self) -> Iterator[str]:
+        return (article['text'] for article in self.data)
+    
+    @property
+    def ids(self) -> Iterator[str]:
+        return (article['id'] for article in self.data)
         
     def count_documents(self) -> int:
         """Return total number of documents."""
-        return len(self.data)
+        if isinstance(self.data, list):
+            return len(self.data)
+        return sum(1 for _ in self.data)
     
-    def text_length_stats(self) -> Dict[str, int]:
-        """Calculate basic text length statistics."""
-        lengths = [len(text) for text in self.texts]
-        word_counts = [len(text.split()) for text in self.texts]
+    def text_length_stats(self) -> Dict:
+        """Calculate text length statistics, with percentiles and histograms."""
+        lengths, words = [], []
+        for text in self.texts:
+            lengths.append(len(text))
+            words.append(len(text.split()))
+        lengths, words = np.array(lengths), np.array(words)
         
         return {
-            "num_documents": len(self.data),
-            "avg_length_chars": int(sum(lengths) / len(lengths)),
-            "min_length_chars": min(lengths),
-            "max_length_chars": max(lengths),
-            "avg_words": int(sum(word_counts) / len(word_counts)),
-            "min_words": min(word_counts),
-            "max_words": max(word_counts),
+            "num_documents": len(lengths),
+            "avg_length_chars": int(lengths.mean()),
+            "min_length_chars": int(lengths.min()),
+            "max_length_chars": int(lengths.max()),
+            "avg_words": int(words.mean()),
+            "min_words": int(words.min()),
+            "max_words": int(words.max()),
+            **distribution_stats(lengths, "chars"),
+            **distribution_stats(words, "words")
         }
     
-    def token_stats(self, model: str = "gpt-4o-mini") -> Dict[str, int]:
-        """Calculate token statistics for the given model."""
-        encoding = tiktoken.encoding_for_model(model)
-        token_counts = [len(encoding.encode(text)) for text in self.texts]
+    def article_token_counts(self, model: str = "gpt-4o-mini", batch_size: int = 1024) -> Iterator[Tuple[str, int]]:
+        """
+        Yield (article ID, token count), batch-encoding articles across threads.
+        Counts are memoised by the shared TokenCounter for later reuse.
+        """
+        counter = get_token_counter(model)
+        articles = iter(self.data)
+        while True:
+            batch = list(islice(articles, batch_size))
+            if not batch:
+                return
+            yield from zip((article['id'] for article in batch), counter.count_articles(batch, batch_size))
+    
+    def token_stats(self, model: str = "gpt-4o-mini") -> Dict:
+        """Calculate token statistics for the given model, with percentiles and a histogram."""
+        tokens = np.fromiter((count for _, count in self.article_token_counts(model)), dtype=np.int64)
         
         return {
-            "avg_tokens": int(sum(token_counts) / len(token_counts)),
-            "min_tokens": min(token_counts),
-            "max_tokens": max(token_counts),
-            "total_tokens": sum(token_counts)
+            "avg_tokens": int(tokens.mean()),
+            "min_tokens": int(tokens.min()),
+            "max_tokens": int(tokens.max()),
+            "total_tokens": int(tokens.sum()),
+            **distribution_stats(tokens, "tokens")
         }
     
     def count_tokens(self, text: str, model: str = "gpt-4o-mini") -> int:
         """Count tokens in a single text."""
-        encoding = tiktoken.encoding_for_model(model)
-        return len(encoding.encode(text))
+        return get_token_counter(model).count(text)
+    
+    def length_scaling_report(self, results: Iterable[Dict], n_buckets: int = 4, model: str = "gpt-4o-mini") -> Dict:
+        """
+        Relate article length to extraction cost: results (with metadata) are
+        joined by article ID and grouped into equal-count article token buckets,
+        with a least-squares fit of latency and prompt tokens on article tokens.
+        """
+        article_tokens = dict(self.article_token_counts(model))
+        
+        rows = []
+        for result in results:
+            metadata = result.get("metadata") or {}
+            if result['article_id'] not in article_tokens or "latency_seconds" not in metadata or metadata.get("cache_hit"):
+                continue
+            rows.append((
+                article_tokens[result['article_id']],
+                metadata["latency_seconds"],
+                metadata.get("prompt_tokens", 0),
+                metadata.get("completion_tokens", 0),
+                metadata.get("chunks", 1)
+            ))
+        rows.sort()
+        if not rows:
+            return {"articles": 0, "buckets": []}
+        
+        def average(values):
+            return sum(values) / len(values)
+        
+        def fit(xs, ys):
+            x_mean, y_mean = average(xs), average(ys)
+            variance = sum((x - x_mean) ** 2 for x in xs)
+            slope = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / variance if variance else 0.0
+            return slope, y_mean - slope * x_mean
+        
+        buckets = []
+        for i in range(n_buckets):
+            bucket = rows[i * len(rows) // n_buckets:(i + 1) * len(rows) // n_buckets]
+            if not bucket:
+                continue
+            latencies = [row[1] for row in bucket]
+            buckets.append({
+                "articles": len(bucket),
+                "min_tokens": bucket[0][0],
+                "max_tokens": bucket[-1][0],
+                "avg_article_tokens": average([row[0] for row in bucket]),
+                "avg_prompt_tokens": average([row[2] for row in bucket]),
+                "avg_completion_tokens": average([row[3] for row in bucket]),
+                "avg_chunks": average([row[4] for row in bucket]),
+                "avg_latency_seconds": average(latencies),
+                "p95_latency_seconds": percentile(latencies, 95)
+            })
+        
+        tokens = [row[0] for row in rows]
+        latency_slope, latency_intercept = fit(tokens, [row[1] for row in rows])
+        prompt_slope, prompt_intercept = fit(tokens, [row[2] for row in rows])
+        return {
+            "articles": len(rows),
+            "buckets": buckets,
+            "latency_seconds_per_1k_tokens": latency_slope * 1000,
+            "latency_intercept_seconds": latency_intercept,
+            "prompt_tokens_per_article_token": prompt_slope,
+            "prompt_overhead_tokens": prompt_intercept
+        }
     
     def preview_articles(self, n: int = 3, preview_chars: int = 200) -> None:
         """Print preview of first n articles."""
-        for i, article in enumerate(self.data[:n]):
+        for i, article in enumerate(islice(self.data, n)):
             print(f"\n--- Article {i+1} (ID: {article['id'][:8]}...) ---")
             print(f"Length: {len(article['text'])} chars, {len(article['text'].split())} words")
             print(f"Preview: {article['text'][:preview_chars]}...")
-            print("-" * 50)
\ No newline at end of file
+            print("-" * 50)
@@ -0,0 +1,47 @@
+from typing import Dict, Iterable
+
+def prompt_cache_report(results: Iterable[Dict]) -> Dict:
+    """
+    Aggregate provider-side prompt cache usage and latency over a run's results.
+    Results served from the local response cache are counted separately.
+    """
+    requests = 0
+    prompt_tokens = 0
+    cached_tokens = 0
+    requests_with_cache_hit = 0
+    latencies = {"cached": [], "uncached": []}
+    local_cache_hits = 0
+
+    for result in results:
+        metadata = result.get("metadata") or {}
+        if metadata.get("cache_hit"):
+            local_cache_hits += 1
+            continue
+        if "prompt_tokens" not in metadata:
+            continue
+
+        requests += 1
+        prompt_tokens += metadata["prompt_tokens"]
+        cached_tokens += metadata.get("cached_tokens", 0)
+        hit = metadata.get("cached_tokens", 0) > 0
+        requests_with_cache_hit += hit
+
+        if "latency_seconds" in metadata:
+            latencies["cached" if hit else "uncached"].append(metadata["latency_seconds"])
+
+    all_latencies = latencies["cached"] + latencies["uncached"]
+
+    def average(values):
+        return sum(values) / len(values) if values else 0.0
+
+    return {
+        "requests": requests,
+        "local_cache_hits": local_cache_hits,
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "cached_token_ratio": cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+        "request_cache_hit_ratio": requests_with_cache_hit / requests if requests else 0.0,
+        "avg_latency_seconds": average(all_latencies),
+        "avg_latency_cached_seconds": average(latencies["cached"]),
+        "avg_latency_uncached_seconds": average(latencies["uncached"])
+    }
@@ -0,0 +1,235 @@
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.llm.prompts import PromptTemplates
+
+# Latin letters (English and Italian articles); much faster than a Unicode class
+TOKEN_PATTERN = re.compile(r'[a-zà-öø-ÿ]{2,}')
+LABEL_SEPARATOR = "|"
+
+def text_features(text: str) -> List[str]:
+    """
+    Lowercased word unigrams and bigrams of an article.
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    return tokens + list(map(" ".join, zip(tokens, tokens[1:])))
+
+def is_valid_label(topic: str, subtopic: str) -> bool:
+    """Whether (topic, subtopic) belongs to the prompt taxonomy."""
+    return subtopic in PromptTemplates.TOPIC_TAXONOMY.get(topic, ())
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+class TopicClassifier:
+    """
+    TF-IDF (unigrams and bigrams) multinomial logistic regression over the
+    joint topic/subtopic labels. The confidence of a prediction is the
+    probability of the best (topic, subtopic) pair.
+    """
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        idf: np.ndarray,
+        weights: np.ndarray,
+        bias: np.ndarray,
+        labels: Sequence[Tuple[str, str]]
+    ):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias
+        self.labels = list(labels)
+
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sparse L2-normalised sublinear TF-IDF vector as (feature indices, values).
+        Features outside the training vocabulary are ignored.
+        """
+        known = [index for index in map(self.vocabulary.get, text_features(text)) if index is not None]
+        indices, counts = np.unique(np.array(known, dtype=np.int64), return_counts=True)
+        values = (1.0 + np.log(counts)) * self.idf[indices]
+        norm = np.sqrt(values @ values)
+        return indices, values / norm if norm else values
+
+    def predict_proba(self, text: str) -> np.ndarray:
+        """Probabilities over self.labels."""
+        indices, values = self.vectorize(text)
+        return _softmax(values @ self.weights[indices] + self.bias)
+
+    def predict(self, text: str) -> Dict:
+        """
+        Best (topic, subtopic) pair with its probability as confidence.
+        """
+        probabilities = self.predict_proba(text)
+        best = int(probabilities.argmax())
+        topic, subtopic = self.labels[best]
+        return {"topic": topic, "subtopic": subtopic, "confidence": float(probabilities[best])}
+
+    @classmethod
+    def fit(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[Tuple[str, str]],
+        l2: float = 1e-5,
+        epochs: int = 100,
+        learning_rate: float = 8.0,
+        momentum: float = 0.9,
+        min_df: int = 2
+    ) -> "TopicClassifier":
+        """
+        Train on article texts and (topic, subtopic) labels with full-batch
+        gradient descent with momentum on the L2-regularised cross-entropy.
+        Features seen in fewer than min_df articles are dropped.
+        """
+        document_frequency = Counter(feature for text in texts for feature in set(text_features(text)))
+        features = sorted(feature for feature, count in document_frequency.items() if count >= min_df)
+        vocabulary = {feature: index for index, feature in enumerate(features)}
+        idf = np.array([math.log((1 + len(texts)) / (1 + document_frequency[feature])) + 1.0 for feature in features])
+
+        label_set = sorted(set(labels))
+        label_index = {label: index for index, label in enumerate(label_set)}
+        targets = np.array([label_index[label] for label in labels])
+
+        classifier = cls(vocabulary, idf, np.zeros((len(vocabulary), len(label_set))), np.zeros(len(label_set)), label_set)
+
+        # CSR matrix of the training set, plus a column-sorted copy to scatter gradients with reduceat
+        rows, columns, values = [], [], []
+        for row, text in enumerate(texts):
+            indices, row_values = classifier.vectorize(text)
+            rows.append(np.full(len(indices), row))
+            columns.append(indices)
+            values.append(row_values)
+        rows, columns, values = np.concatenate(rows), np.concatenate(columns), np.concatenate(values)
+        row_starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        row_ids = rows[row_starts]
+        order = np.argsort(columns, kind="stable")
+        sorted_rows, sorted_columns, sorted_values = rows[order], columns[order], values[order]
+        column_starts = np.flatnonzero(np.r_[True, sorted_columns[1:] != sorted_columns[:-1]])
+        column_ids = sorted_columns[column_starts]
+
+        n_rows = len(texts)
+        one_hot = np.zeros((n_rows, len(label_set)))
+        one_hot[np.arange(n_rows), targets] = 1.0
+        weights, bias = classifier.weights, classifier.bias
+        weight_velocity, bias_velocity = np.zeros_like(weights), np.zeros_like(bias)
+
+        for _ in range(epochs):
+            logits = np.tile(bias, (n_rows, 1))
+            logits[row_ids] += np.add.reduceat(values[:, None] * weights[columns], row_starts)
+            gradient = (_softmax(logits) - one_hot) / n_rows
+
+            weight_gradient = l2 * weights
+            weight_gradient[column_ids] += np.add.reduceat(sorted_values[:, None] * gradient[sorted_rows], column_starts)
+            weight_velocity = momentum * weight_velocity - learning_rate * weight_gradient
+            bias_velocity = momentum * bias_velocity - learning_rate * gradient.sum(axis=0)
+            weights += weight_velocity
+            bias += bias_velocity
+
+        return classifier
+
+    def save(self, path: str) -> str:
+        """Write the model to a compressed .npz file."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                vocabulary=np.array(vocabulary),
+                idf=self.idf,
+                weights=self.weights.astype(np.float32),
+                bias=self.bias,
+                labels=np.array([LABEL_SEPARATOR.join(label) for label in self.labels])
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "TopicClassifier":
+        """Load a model written by save()."""
+        with np.load(path) as data:
+            vocabulary = {feature: index for index, feature in enumerate(data["vocabulary"].tolist())}
+            labels = [tuple(label.split(LABEL_SEPARATOR, 1)) for label in data["labels"].tolist()]
+            return cls(vocabulary, data["idf"], data["weights"].astype(np.float64), data["bias"], labels)
+
+def load_training_examples(
+    articles_filepath: str,
+    ground_truth_filepath: Optional[str] = None,
+    predictions_filepath: Optional[str] = None
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Pair article texts with topic labels. Ground truth labels take precedence
+    over past LLM predictions; labels outside the taxonomy are skipped.
+    """
+    from src.io.load_data import iter_articles, iter_ground_truth, iter_json_records
+
+    labels: Dict[str, Tuple[str, str]] = {}
+    if predictions_filepath is not None:
+        for pred in iter_json_records(predictions_filepath):
+            if pred['success'] and pred['extraction'] and 'topic' in pred['extraction']:
+                labels[pred['article_id']] = (pred['extraction']['topic'], pred['extraction']['subtopic'])
+    if ground_truth_filepath is not None:
+        for item in iter_ground_truth(ground_truth_filepath):
+            labels[item['uuid']] = (item['topic'], item['subtopic'])
+    labels = {article_id: label for article_id, label in labels.items() if is_valid_label(*label)}
+
+    texts, targets = [], []
+    for article in iter_articles(articles_filepath):
+        if article['id'] in labels:
+            texts.append(article['text'])
+            targets.append(labels[article['id']])
+    return texts, targets
+
+def train_topic_classifier(
+    articles_filepath: str,
+    ground_truth_filepath: Optional[str] = None,
+    predictions_filepath: Optional[str] = None,
+    model_path: Optional[str] = "data/models/topic_classifier.npz"
+) -> TopicClassifier:
+    """
+    Train the local topic classifier from ground truth and past extraction results.
+    """
+    texts, labels = load_training_examples(articles_filepath, ground_truth_filepath, predictions_filepath)
+    print(f"Training topic classifier on {len(texts)} articles ({len(set(labels))} labels)")
+    classifier = TopicClassifier.fit(texts, labels)
+    if model_path is not None:
+        classifier.save(model_path)
+        print(f"Topic classifier saved to: {model_path}")
+    return classifier
+
+def route_article(article: Dict, classifier: TopicClassifier, threshold: float = 0.7) -> Dict:
+    """
+    Attach article["topic_prediction"]: route "local" when the classifier
+    confidence reaches threshold, otherwise the LLM classifies the topic.
+    """
+    prediction = classifier.predict(article["text"])
+    prediction["route"] = "local" if prediction["confidence"] >= threshold else "llm"
+    return dict(article, topic_prediction=prediction)
+
+def route_articles(articles: Iterable[Dict], classifier: TopicClassifier, threshold: float = 0.7) -> List[Dict]:
+    """Route a batch of articles and print the share kept local."""
+    routed = [route_article(article, classifier, threshold) for article in articles]
+    local = sum(article["topic_prediction"]["route"] == "local" for article in routed)
+    print(f"Topic routing: {local}/{len(routed)} articles classified locally (threshold {threshold})")
+    return routed
+
+def apply_topic_prediction(extraction: Dict, prediction: Dict) -> Tuple[Dict, str]:
+    """
+    Fill topic/subtopic of an entities-only extraction from the local prediction.
+    Returns the extraction and the route that produced its topic.
+    """
+    if "topic" in extraction:
+        return extraction, "llm"
+    return {
+        "people": extraction["people"],
+        "topic": prediction["topic"],
+        "subtopic": prediction["subtopic"],
+        "date": extraction["date"]
+    }, "local"
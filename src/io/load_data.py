@@ -1,7 +1,18 @@
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _loads(data: str) -> Any:
+    """Parse a JSON document, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 def load_articles_json(filepath: str) -> List[Dict[str, Any]]:
     """
     Load articles from JSON file and return as list of dictionaries.
@@ -20,4 +31,111 @@ def load_ground_truth_json(filepath: str) -> List[Dict[str, Any]]:
         ground_truth = json.load(f)
     
     print(f"Loaded {len(ground_truth)} ground truth samples from {filepath}")
-    return ground_truth
\ No newline at end of file
+    return ground_truth
+
+def _iter_json_array(f, chunk_size: int) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally decode the elements of a top-level JSON array from a text stream.
+    Elements are decoded with the stdlib decoder's raw_decode, which also finds
+    where each one ends; orjson is not used on this path (store large inputs as
+    JSONL to benefit from it).
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+    
+    def fill(size: int) -> bool:
+        nonlocal buffer, pos
+        chunk = f.read(size)
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return bool(chunk)
+    
+    read_size = chunk_size
+    while True:
+        # Skip whitespace and array punctuation between elements
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            eof = not fill(chunk_size)
+        
+        if pos >= len(buffer):
+            return
+        
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+        
+        if buffer[pos] == "]":
+            return
+        
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Element spans the buffer boundary: read more and retry
+            eof = not fill(read_size)
+            read_size *= 2
+            continue
+        
+        read_size = chunk_size
+        pos = end
+        yield item
+
+def iter_json_records(filepath: str, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield records from a JSON array file or a JSONL file with bounded memory.
+    JSONL lines are parsed with orjson when it is installed; JSON arrays always
+    use the stdlib decoder. Columnar result stores (src.io.results_store) are decoded from their columns.
+    """
+    from src.io.results_store import ResultsStore, is_results_store
+    
+    if is_results_store(filepath):
+        yield from ResultsStore.open(filepath).iter_records()
+        return
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        first_char = ""
+        while True:
+            first_char = f.read(1)
+            if not first_char or not first_char.isspace():
+                break
+        f.seek(0)
+        
+        if first_char == "[":
+            yield from _iter_json_array(f, chunk_size)
+        else:
+            for line in f:
+                if line.strip():
+                    yield _loads(line)
+
+def iter_articles(filepath: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield articles from a JSON array or JSONL file.
+    """
+    return iter_json_records(filepath)
+
+def iter_ground_truth(filepath: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield ground truth entries from a JSON array or JSONL file.
+    """
+    return iter_json_records(filepath)
+
+class ArticleStream:
+    """
+    Re-iterable view over an article file; each iteration streams the file again.
+    """
+    
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter_articles(self.filepath)
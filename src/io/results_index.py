@@ -0,0 +1,381 @@
+"""SQLite index over extraction results for lookups by person, role, topic, date and text."""
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+ISO_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS topics (
+    topic_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS subtopics (
+    subtopic_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS roles (
+    role_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS people (
+    person_id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    article_rowid INTEGER PRIMARY KEY,
+    article_id TEXT NOT NULL UNIQUE,
+    topic_id INTEGER REFERENCES topics(topic_id),
+    subtopic_id INTEGER REFERENCES subtopics(subtopic_id),
+    date TEXT,
+    title TEXT,
+    success INTEGER,
+    result_hash TEXT,
+    text_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS mentions (
+    person_id INTEGER NOT NULL,
+    article_rowid INTEGER NOT NULL,
+    PRIMARY KEY (person_id, article_rowid)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS mention_roles (
+    person_id INTEGER NOT NULL,
+    role_id INTEGER NOT NULL,
+    article_rowid INTEGER NOT NULL,
+    PRIMARY KEY (person_id, role_id, article_rowid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_articles_topic ON articles(topic_id, date);
+CREATE INDEX IF NOT EXISTS idx_articles_subtopic ON articles(subtopic_id, date);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date);
+CREATE INDEX IF NOT EXISTS idx_mentions_article ON mentions(article_rowid);
+CREATE INDEX IF NOT EXISTS idx_mention_roles_role ON mention_roles(role_id, article_rowid);
+CREATE INDEX IF NOT EXISTS idx_mention_roles_article ON mention_roles(article_rowid);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(title, text, tokenize = 'unicode61 remove_diacritics 2');
+"""
+
+def normalize_person_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+def normalize_date(value: Optional[str]) -> Optional[str]:
+    """ISO date of an extraction date, parsing textual dates such as 'May 11, 2025'."""
+    if not value:
+        return None
+    value = value.strip()
+    if ISO_DATE_PATTERN.match(value):
+        return value
+    from src.preprocessing.metadata_extraction import parse_date
+
+    return parse_date(value)
+
+def _batches(records: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+class ResultsIndex:
+    """
+    Incrementally built SQLite index of extraction results and article texts.
+    """
+
+    def __init__(self, path: str = "data/index/results.sqlite"):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=OFF")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._ids: Dict[str, Dict[str, int]] = {}
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ResultsIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _dictionary_ids(self, table: str, column: str, id_column: str, values: Iterable[str]) -> Dict[str, int]:
+        """IDs of dictionary values, inserting missing ones (inside the caller's transaction)."""
+        ids = self._ids.setdefault(table, {})
+        missing = {value for value in values if value not in ids}
+        if missing:
+            self._conn.executemany(f"INSERT OR IGNORE INTO {table}({column}) VALUES (?)", ((value,) for value in missing))
+            for chunk in _batches(sorted(missing), 500):
+                placeholders = ",".join("?" * len(chunk))
+                ids.update(self._conn.execute(
+                    f"SELECT {column}, {id_column} FROM {table} WHERE {column} IN ({placeholders})", chunk
+                ).fetchall())
+        return ids
+
+    def _person_ids(self, names: Dict[str, str]) -> Dict[str, int]:
+        """IDs of people keyed by normalised name; names maps key to display name."""
+        ids = self._ids.setdefault("people", {})
+        missing = [key for key in names if key not in ids]
+        if missing:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO people(key, name) VALUES (?, ?)", ((key, names[key]) for key in missing)
+            )
+            for chunk in _batches(missing, 500):
+                placeholders = ",".join("?" * len(chunk))
+                ids.update(self._conn.execute(
+                    f"SELECT key, person_id FROM people WHERE key IN ({placeholders})", chunk
+                ).fetchall())
+        return ids
+
+    def _article_rowids(self, article_ids: List[str]) -> Dict[str, Tuple[int, Optional[str], Optional[str]]]:
+        """(rowid, result_hash, text_hash) of articles, inserting missing ones."""
+        self._conn.executemany("INSERT OR IGNORE INTO articles(article_id) VALUES (?)", ((article_id,) for article_id in article_ids))
+        rows = {}
+        for chunk in _batches(article_ids, 500):
+            placeholders = ",".join("?" * len(chunk))
+            for article_id, rowid, result_hash, text_hash in self._conn.execute(
+                f"SELECT article_id, article_rowid, result_hash, text_hash FROM articles WHERE article_id IN ({placeholders})", chunk
+            ):
+                rows[article_id] = (rowid, result_hash, text_hash)
+        return rows
+
+    def ingest_results(self, results: Iterable[Dict], batch_size: int = 10_000) -> Dict:
+        """
+        Index extraction results. Results whose success flag and extraction
+        are unchanged since the last ingestion are skipped; changed ones have
+        their people and roles replaced. Each batch is one transaction.
+        """
+        stats = {"indexed": 0, "unchanged": 0}
+        for batch in _batches(results, batch_size):
+            # The last result of an article within a batch wins
+            batch = list({result["article_id"]: result for result in batch}.values())
+            try:
+                with self._conn:
+                    self._ingest_result_batch(batch, stats)
+            except Exception:
+                # Dictionary IDs inserted by the rolled back transaction are gone
+                self._ids.clear()
+                raise
+        return stats
+
+    def _ingest_result_batch(self, batch: List[Dict], stats: Dict) -> None:
+        from src.validation.incremental_evaluation import prediction_hash
+
+        rows = self._article_rowids([result["article_id"] for result in batch])
+        changed = []
+        for result in batch:
+            result_hash = prediction_hash(result)
+            if rows[result["article_id"]][1] == result_hash:
+                stats["unchanged"] += 1
+            else:
+                changed.append((rows[result["article_id"]][0], result_hash, result))
+        if not changed:
+            return
+
+        extractions = [result["extraction"] or {} for _, _, result in changed]
+        topic_ids = self._dictionary_ids("topics", "name", "topic_id", (e["topic"] for e in extractions if e.get("topic")))
+        subtopic_ids = self._dictionary_ids("subtopics", "name", "subtopic_id", (e["subtopic"] for e in extractions if e.get("subtopic")))
+        role_ids = self._dictionary_ids("roles", "name", "role_id", (
+            role.strip() for e in extractions for person in e.get("people", []) for role in person["roles"] if role.strip()
+        ))
+        person_ids = self._person_ids({
+            normalize_person_key(person["name"]): " ".join(person["name"].split())
+            for e in extractions for person in e.get("people", []) if person["name"].strip()
+        })
+
+        rowids = [(rowid,) for rowid, _, _ in changed]
+        self._conn.executemany("DELETE FROM mentions WHERE article_rowid = ?", rowids)
+        self._conn.executemany("DELETE FROM mention_roles WHERE article_rowid = ?", rowids)
+        self._conn.executemany(
+            "UPDATE articles SET topic_id = ?, subtopic_id = ?, date = ?, title = COALESCE(?, title), success = ?, result_hash = ? "
+            "WHERE article_rowid = ?",
+            (
+                (
+                    topic_ids.get(extraction.get("topic")), subtopic_ids.get(extraction.get("subtopic")),
+                    normalize_date(extraction.get("date")), extraction.get("title"),
+                    int(bool(result["success"])), result_hash, rowid
+                )
+                for (rowid, result_hash, result), extraction in zip(changed, extractions)
+            )
+        )
+        mentions = set()
+        mention_roles = set()
+        for (rowid, _, _), extraction in zip(changed, extractions):
+            for person in extraction.get("people", []):
+                if not person["name"].strip():
+                    continue
+                person_id = person_ids[normalize_person_key(person["name"])]
+                mentions.add((person_id, rowid))
+                mention_roles.update((person_id, role_ids[role.strip()], rowid) for role in person["roles"] if role.strip())
+        self._conn.executemany("INSERT INTO mentions(person_id, article_rowid) VALUES (?, ?)", mentions)
+        self._conn.executemany("INSERT INTO mention_roles(person_id, role_id, article_rowid) VALUES (?, ?, ?)", mention_roles)
+        stats["indexed"] += len(changed)
+
+    def ingest_articles(self, articles: Iterable[Dict], batch_size: int = 10_000) -> Dict:
+        """
+        Index article texts for full-text search; unchanged texts are skipped.
+        The title comes from the article record or its **Title** line.
+        """
+        from src.preprocessing.metadata_extraction import TITLE_PATTERN
+
+        stats = {"indexed": 0, "unchanged": 0}
+        for batch in _batches(articles, batch_size):
+            # The last text of an article within a batch wins
+            batch = list({article["id"]: article for article in batch}.values())
+            with self._conn:
+                rows = self._article_rowids([article["id"] for article in batch])
+                changed = []
+                for article in batch:
+                    rowid, _, old_hash = rows[article["id"]]
+                    text_hash = hashlib.blake2b(article["text"].encode("utf-8"), digest_size=16).hexdigest()
+                    if old_hash == text_hash:
+                        stats["unchanged"] += 1
+                        continue
+                    title_match = TITLE_PATTERN.match(article["text"])
+                    title = article.get("title") or (title_match.group("title").strip() if title_match else None)
+                    changed.append((rowid, text_hash, title, article["text"]))
+                if not changed:
+                    continue
+                self._conn.executemany("DELETE FROM articles_fts WHERE rowid = ?", ((rowid,) for rowid, _, _, _ in changed))
+                self._conn.executemany(
+                    "INSERT INTO articles_fts(rowid, title, text) VALUES (?, ?, ?)",
+                    ((rowid, title or "", text) for rowid, _, title, text in changed)
+                )
+                self._conn.executemany(
+                    "UPDATE articles SET text_hash = ?, title = COALESCE(title, ?) WHERE article_rowid = ?",
+                    ((text_hash, title, rowid) for rowid, text_hash, title, _ in changed)
+                )
+                stats["indexed"] += len(changed)
+        return stats
+
+    def optimize(self) -> None:
+        """Merge FTS segments and refresh planner statistics after large ingestions."""
+        with self._conn:
+            self._conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('optimize')")
+        self._conn.execute("ANALYZE")
+        self._conn.commit()
+
+    def query(
+        self,
+        person: Optional[str] = None,
+        role: Optional[str] = None,
+        topic: Optional[str] = None,
+        subtopic: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        text: Optional[str] = None,
+        limit: Optional[int] = 100
+    ) -> List[Dict]:
+        """
+        Articles matching all given filters, ordered by date then article ID.
+        person matches case- and whitespace-insensitively; with role it
+        requires that person in that role. date_from/date_to are inclusive
+        ISO dates and text is an FTS5 query over title and text.
+        """
+        conditions: List[str] = []
+        params: List = []
+        if person is not None and role is not None:
+            conditions.append(
+                "a.article_rowid IN (SELECT article_rowid FROM mention_roles WHERE person_id = "
+                "(SELECT person_id FROM people WHERE key = ?) AND role_id = (SELECT role_id FROM roles WHERE name = ?))"
+            )
+            params += [normalize_person_key(person), role]
+        elif person is not None:
+            conditions.append(
+                "a.article_rowid IN (SELECT article_rowid FROM mentions WHERE person_id = "
+                "(SELECT person_id FROM people WHERE key = ?))"
+            )
+            params.append(normalize_person_key(person))
+        elif role is not None:
+            conditions.append(
+                "a.article_rowid IN (SELECT article_rowid FROM mention_roles WHERE role_id = "
+                "(SELECT role_id FROM roles WHERE name = ?))"
+            )
+            params.append(role)
+        if topic is not None:
+            conditions.append("a.topic_id = (SELECT topic_id FROM topics WHERE name = ?)")
+            params.append(topic)
+        if subtopic is not None:
+            conditions.append("a.subtopic_id = (SELECT subtopic_id FROM subtopics WHERE name = ?)")
+            params.append(subtopic)
+        if date_from is not None:
+            conditions.append("a.date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            conditions.append("a.date <= ?")
+            params.append(date_to)
+        if text is not None:
+            conditions.append("a.article_rowid IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+            params.append(text)
+
+        sql = (
+            "SELECT a.article_id, t.name, s.name, a.date, a.title FROM articles a "
+            "LEFT JOIN topics t ON t.topic_id = a.topic_id "
+            "LEFT JOIN subtopics s ON s.subtopic_id = a.subtopic_id"
+        )
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY a.date, a.article_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            {"article_id": article_id, "topic": topic_name, "subtopic": subtopic_name, "date": date, "title": title}
+            for article_id, topic_name, subtopic_name, date, title in self._conn.execute(sql, params)
+        ]
+
+    def person_roles(self, person: str) -> Dict[str, int]:
+        """Roles of a person with the number of articles in each, most frequent first."""
+        rows = self._conn.execute(
+            "SELECT r.name, COUNT(*) AS n FROM mention_roles m JOIN roles r ON r.role_id = m.role_id "
+            "WHERE m.person_id = (SELECT person_id FROM people WHERE key = ?) GROUP BY r.name ORDER BY n DESC, r.name",
+            (normalize_person_key(person),)
+        )
+        return dict(rows.fetchall())
+
+    def people_with_role(self, role: str, limit: Optional[int] = 100) -> Dict[str, int]:
+        """People seen in a role with their article counts, most frequent first."""
+        rows = self._conn.execute(
+            "SELECT p.name, COUNT(*) AS n FROM mention_roles m JOIN people p ON p.person_id = m.person_id "
+            "WHERE m.role_id = (SELECT role_id FROM roles WHERE name = ?) GROUP BY p.person_id ORDER BY n DESC, p.name LIMIT ?",
+            (role, -1 if limit is None else limit)
+        )
+        return dict(rows.fetchall())
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("articles", "people", "roles", "topics", "subtopics", "mentions", "mention_roles")
+        }
+
+def build_index(
+    results_filepath: Optional[str],
+    articles_filepath: Optional[str] = None,
+    index_path: str = "data/index/results.sqlite",
+    batch_size: int = 10_000
+) -> Dict:
+    """
+    Ingest a results file (JSON, JSONL or columnar store) and optionally the
+    article texts into the index, reporting counts and elapsed time.
+    """
+    from src.io.load_data import iter_json_records
+
+    start = time.perf_counter()
+    report = {}
+    with ResultsIndex(index_path) as index:
+        if results_filepath:
+            report["results"] = index.ingest_results(iter_json_records(results_filepath), batch_size)
+        if articles_filepath:
+            report["articles"] = index.ingest_articles(iter_json_records(articles_filepath), batch_size)
+        index.optimize()
+        report["tables"] = index.stats()
+    report["seconds"] = round(time.perf_counter() - start, 3)
+    return report
@@ -0,0 +1,370 @@
+"""Columnar store of extraction results."""
+import argparse
+import json
+import math
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+STORE_FORMAT = "extraction-results-columnar"
+STORE_VERSION = 1
+# A store file is MAGIC, the header length (8 bytes), a JSON header with column dtypes,
+# lengths, offsets and string dictionaries, then the column buffers
+MAGIC = b"XRCOLS01"
+ALIGNMENT = 64
+
+INT_METADATA = ("tokens_used", "prompt_tokens", "completion_tokens", "cached_tokens", "chunks")
+FLOAT_METADATA = ("latency_seconds", "topic_confidence")
+CODED_METADATA = ("model", "topic_route")
+DICTIONARIES = ("topic", "subtopic", "role") + CODED_METADATA
+EXTRACTION_FIELDS = ("people", "topic", "subtopic", "date")
+MISSING_CODE = -1
+
+class _Dictionary:
+    """Assigns int32 codes to strings in first-seen order."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING_CODE
+        if value not in self.codes:
+            self.codes[value] = len(self.values)
+            self.values.append(value)
+        return self.codes[value]
+
+def _int_array(values: List[int]) -> np.ndarray:
+    """int32 array when every value fits, else int64."""
+    array = np.array(values, dtype=np.int64)
+    if not len(array) or (array.min() >= np.iinfo(np.int32).min and array.max() <= np.iinfo(np.int32).max):
+        return array.astype(np.int32)
+    return array
+
+def _encode_strings(name: str, values: List[Optional[str]]) -> Dict[str, np.ndarray]:
+    """Offsets, UTF-8 data and null mask columns of a string column."""
+    encoded = [(value or "").encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return {
+        f"{name}.offsets": _int_array(offsets),
+        f"{name}.data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        f"{name}.null": np.array([value is None for value in values], dtype=bool)
+    }
+
+def _dumps_extra(extra: Dict) -> Optional[str]:
+    return json.dumps(extra, ensure_ascii=False) if extra else None
+
+def encode_results(results: Iterable[Dict]) -> Dict:
+    """
+    Flatten result records into column arrays and string dictionaries.
+    Extraction and metadata keys without a dedicated column are kept as
+    JSON in the extraction_extra and metadata_extra string columns.
+    """
+    dictionaries = {name: _Dictionary() for name in DICTIONARIES}
+    article_ids, errors, dates, extraction_extra, metadata_extra = [], [], [], [], []
+    success, has_extraction, topics, subtopics = [], [], [], []
+    person_offsets = [0]
+    metadata_ints = {key: [] for key in INT_METADATA}
+    metadata_floats = {key: [] for key in FLOAT_METADATA}
+    metadata_codes = {key: [] for key in CODED_METADATA}
+    names, role_offsets, roles = [], [0], []
+
+    for result in results:
+        article_ids.append(result["article_id"])
+        success.append(bool(result["success"]))
+        errors.append(result.get("error"))
+
+        extraction = result.get("extraction")
+        has_extraction.append(extraction is not None)
+        extraction = extraction or {}
+        topics.append(dictionaries["topic"].code(extraction.get("topic")))
+        subtopics.append(dictionaries["subtopic"].code(extraction.get("subtopic")))
+        dates.append(extraction.get("date"))
+        extraction_extra.append(_dumps_extra({
+            key: value for key, value in extraction.items() if key not in EXTRACTION_FIELDS
+        }))
+        for person in extraction.get("people", []):
+            names.append(person["name"])
+            roles.extend(dictionaries["role"].code(role) for role in person["roles"])
+            role_offsets.append(len(roles))
+        person_offsets.append(len(names))
+
+        # Values of an unexpected type go to metadata_extra so they round-trip unchanged
+        metadata = dict(result.get("metadata") or {})
+        for key in INT_METADATA:
+            is_int = isinstance(metadata.get(key), int) and not isinstance(metadata.get(key), bool)
+            metadata_ints[key].append(metadata.pop(key) if is_int and metadata[key] >= 0 else MISSING_CODE)
+        for key in FLOAT_METADATA:
+            is_float = isinstance(metadata.get(key), (int, float)) and not isinstance(metadata.get(key), bool)
+            metadata_floats[key].append(float(metadata.pop(key)) if is_float else np.nan)
+        for key in CODED_METADATA:
+            metadata_codes[key].append(dictionaries[key].code(metadata.pop(key) if isinstance(metadata.get(key), str) else None))
+        metadata_extra.append(_dumps_extra(metadata))
+
+    columns = {
+        "articles.success": np.array(success, dtype=bool),
+        "articles.has_extraction": np.array(has_extraction, dtype=bool),
+        "articles.topic": np.array(topics, dtype=np.int32),
+        "articles.subtopic": np.array(subtopics, dtype=np.int32),
+        "articles.person_offsets": _int_array(person_offsets),
+        "people.role_offsets": _int_array(role_offsets),
+        "roles.role": np.array(roles, dtype=np.int32)
+    }
+    columns.update(_encode_strings("articles.article_id", article_ids))
+    columns.update(_encode_strings("articles.error", errors))
+    columns.update(_encode_strings("articles.date", dates))
+    columns.update(_encode_strings("articles.extraction_extra", extraction_extra))
+    columns.update(_encode_strings("articles.metadata_extra", metadata_extra))
+    columns.update(_encode_strings("people.name", names))
+    for key in INT_METADATA:
+        columns[f"articles.{key}"] = _int_array(metadata_ints[key])
+    for key in FLOAT_METADATA:
+        columns[f"articles.{key}"] = np.array(metadata_floats[key], dtype=np.float64)
+    for key in CODED_METADATA:
+        columns[f"articles.{key}"] = np.array(metadata_codes[key], dtype=np.int32)
+
+    return {
+        "columns": columns,
+        "dictionaries": {name: dictionary.values for name, dictionary in dictionaries.items()}
+    }
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def write_results_store(results: Iterable[Dict], path: str) -> str:
+    """
+    Write result records as a columnar store file, replacing any existing
+    file at path only once the new one is complete.
+    """
+    encoded = encode_results(results)
+    columns = encoded["columns"]
+
+    # Buffers follow the header, each starting at an ALIGNMENT-byte boundary
+    layout = {}
+    offset = 0
+    for name in sorted(columns):
+        layout[name] = {"dtype": columns[name].dtype.str, "length": len(columns[name]), "offset": offset}
+        offset = _aligned(offset + columns[name].nbytes)
+    header = json.dumps({
+        "format": STORE_FORMAT,
+        "version": STORE_VERSION,
+        "rows": {
+            "articles": len(columns["articles.success"]),
+            "people": len(columns["people.role_offsets"]) - 1,
+            "roles": len(columns["roles.role"])
+        },
+        "columns": layout,
+        "dictionaries": encoded["dictionaries"]
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + len(header).to_bytes(8, "little") + header)
+        for name in sorted(columns):
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(columns[name]).tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+    return path
+
+def _read_header(f) -> Dict:
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{f.name} is not a version {STORE_VERSION} results store")
+    header_length = int.from_bytes(f.read(8), "little")
+    header = json.loads(f.read(header_length).decode("utf-8"))
+    header["data_start"] = _aligned(len(MAGIC) + 8 + header_length)
+    return header
+
+def is_results_store(path: str) -> bool:
+    """True for a columnar store file, detected by its magic bytes."""
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+class ResultsStore:
+    """
+    Read access to a columnar results store. Columns are memory-mapped when
+    opened from disk; records are rebuilt on demand by iter_records().
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], dictionaries: Dict[str, List[str]]):
+        self.columns = columns
+        self.dictionaries = dictionaries
+
+    @classmethod
+    def open(cls, path: str, mmap: bool = True) -> "ResultsStore":
+        with open(path, 'rb') as f:
+            header = _read_header(f)
+            columns = {}
+            for name, column in header["columns"].items():
+                dtype = np.dtype(column["dtype"])
+                offset = header["data_start"] + column["offset"]
+                if mmap and column["length"]:
+                    columns[name] = np.memmap(f, dtype=dtype, mode="r", offset=offset, shape=(column["length"],))
+                else:
+                    f.seek(offset)
+                    columns[name] = np.fromfile(f, dtype=dtype, count=column["length"])
+        return cls(columns, header["dictionaries"])
+
+    @classmethod
+    def from_records(cls, results: Iterable[Dict]) -> "ResultsStore":
+        encoded = encode_results(results)
+        return cls(encoded["columns"], encoded["dictionaries"])
+
+    def __len__(self) -> int:
+        return len(self.columns["articles.success"])
+
+    def strings(self, name: str) -> List[Optional[str]]:
+        """Decode a string column."""
+        offsets = self.columns[f"{name}.offsets"].tolist()
+        data = self.columns[f"{name}.data"].tobytes()
+        nulls = self.columns[f"{name}.null"].tolist()
+        return [
+            None if null else data[start:end].decode("utf-8")
+            for start, end, null in zip(offsets, offsets[1:], nulls)
+        ]
+
+    def decoded(self, name: str, dictionary: Optional[str] = None) -> List[Optional[str]]:
+        """Decode a dictionary-encoded column."""
+        values = self.dictionaries[dictionary or name.split(".")[-1]]
+        return [values[code] if code != MISSING_CODE else None for code in self.columns[name].tolist()]
+
+    def value_counts(self, name: str, dictionary: Optional[str] = None) -> Dict[str, int]:
+        """Counts of each value of a dictionary-encoded column, most frequent first."""
+        values = self.dictionaries[dictionary or name.split(".")[-1]]
+        codes = np.asarray(self.columns[name])
+        counts = np.bincount(codes[codes != MISSING_CODE], minlength=len(values))
+        order = np.argsort(-counts, kind="stable")
+        return {values[index]: int(counts[index]) for index in order if counts[index]}
+
+    def topic_counts(self) -> Dict[str, int]:
+        return self.value_counts("articles.topic")
+
+    def subtopic_counts(self) -> Dict[str, int]:
+        return self.value_counts("articles.subtopic")
+
+    def role_counts(self) -> Dict[str, int]:
+        return self.value_counts("roles.role")
+
+    def people_per_article(self) -> np.ndarray:
+        return np.diff(self.columns["articles.person_offsets"])
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Rebuild result records in their original JSON shape."""
+        columns = self.columns
+        article_ids = self.strings("articles.article_id")
+        errors = self.strings("articles.error")
+        dates = self.strings("articles.date")
+        extraction_extra = self.strings("articles.extraction_extra")
+        metadata_extra = self.strings("articles.metadata_extra")
+        names = self.strings("people.name")
+        topics = self.decoded("articles.topic")
+        subtopics = self.decoded("articles.subtopic")
+        roles = self.decoded("roles.role")
+        person_offsets = columns["articles.person_offsets"].tolist()
+        role_offsets = columns["people.role_offsets"].tolist()
+        success = columns["articles.success"].tolist()
+        has_extraction = columns["articles.has_extraction"].tolist()
+        metadata_ints = {key: columns[f"articles.{key}"].tolist() for key in INT_METADATA}
+        metadata_floats = {key: columns[f"articles.{key}"].tolist() for key in FLOAT_METADATA}
+        metadata_codes = {key: self.decoded(f"articles.{key}") for key in CODED_METADATA}
+
+        for index in range(len(self)):
+            extraction = None
+            if has_extraction[index]:
+                extraction = {
+                    "people": [
+                        {"name": names[person], "roles": roles[role_offsets[person]:role_offsets[person + 1]]}
+                        for person in range(person_offsets[index], person_offsets[index + 1])
+                    ]
+                }
+                if topics[index] is not None:
+                    extraction["topic"] = topics[index]
+                if subtopics[index] is not None:
+                    extraction["subtopic"] = subtopics[index]
+                if dates[index] is not None:
+                    extraction["date"] = dates[index]
+                if extraction_extra[index]:
+                    extraction.update(json.loads(extraction_extra[index]))
+
+            metadata = {}
+            for key in CODED_METADATA:
+                if metadata_codes[key][index] is not None:
+                    metadata[key] = metadata_codes[key][index]
+            for key in INT_METADATA:
+                if metadata_ints[key][index] != MISSING_CODE:
+                    metadata[key] = metadata_ints[key][index]
+            for key in FLOAT_METADATA:
+                if not math.isnan(metadata_floats[key][index]):
+                    metadata[key] = metadata_floats[key][index]
+            if metadata_extra[index]:
+                metadata.update(json.loads(metadata_extra[index]))
+
+            yield {
+                "article_id": article_ids[index],
+                "extraction": extraction,
+                "success": success[index],
+                "error": errors[index],
+                "metadata": metadata
+            }
+
+    def to_records(self) -> List[Dict]:
+        return list(self.iter_records())
+
+def export_results(results: Iterable[Dict], output_filepath: str, output_format: Optional[str] = None) -> str:
+    """
+    Write result records as "json", "jsonl" or "columnar"; the format is
+    inferred from the .json/.jsonl suffix when not given (columnar otherwise).
+    JSON and JSONL are written as the records stream in.
+    """
+    if output_format is None:
+        output_format = {".json": "json", ".jsonl": "jsonl"}.get(os.path.splitext(output_filepath)[1], "columnar")
+    if output_format == "columnar":
+        return write_results_store(results, output_filepath)
+    if output_format not in ("json", "jsonl"):
+        raise ValueError(f"Unknown output format: {output_format}")
+
+    if os.path.dirname(output_filepath):
+        os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
+    with open(output_filepath, 'w', encoding='utf-8') as f:
+        if output_format == "jsonl":
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        else:
+            f.write("[")
+            for index, result in enumerate(results):
+                f.write(",\n" if index else "\n")
+                f.write(json.dumps(result, indent=2, ensure_ascii=False))
+            f.write("\n]\n")
+    return output_filepath
+
+def convert_results(input_filepath: str, output_filepath: str, output_format: Optional[str] = None) -> str:
+    """
+    Convert results between JSON, JSONL and the columnar store.
+    """
+    from src.io.load_data import iter_json_records
+
+    return export_results(iter_json_records(input_filepath), output_filepath, output_format)
+
+def build_parser(parser: Optional[argparse.ArgumentParser] = None) -> argparse.ArgumentParser:
+    parser = parser or argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Results as JSON array, JSONL or columnar store")
+    parser.add_argument("output", help="Output path (.json, .jsonl, or any other suffix for a columnar store)")
+    parser.add_argument("--format", choices=["json", "jsonl", "columnar"], help="Output format (default: from the suffix)")
+    return parser
+
+def main(argv=None) -> str:
+    args = build_parser().parse_args(argv)
+    output = convert_results(args.input, args.output, args.format)
+    print(f"Results written to: {output}")
+    return output
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import Callable, Iterable, List, Dict, Optional
+
+from openai import AsyncOpenAI, RateLimitError
+
+from .openai_client import (
+    build_messages,
+    article_prompt_layout,
+    build_article_result,
+    format_extraction_response,
+    format_extraction_error,
+    get_cached_result
+)
+from .telemetry import article_context, record_call_result
+from .resilience import ResilienceLayer, get_default_resilience
+from .client_factory import get_client_pool
+
+def get_async_client() -> AsyncOpenAI:
+    """
+    Return the pooled AsyncOpenAI client for the running event loop, creating it on first use.
+    """
+    return get_client_pool().get_async_client()
+
+def estimate_request_tokens(messages: List[Dict[str, str]], completion_tokens: int = 300) -> int:
+    """
+    Cheap token estimate for rate limiting (about 4 characters per token).
+    """
+    prompt_chars = sum(len(message["content"]) for message in messages)
+    return prompt_chars // 4 + completion_tokens
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Return True if the error is a 429 rate-limit response."""
+    return isinstance(error, RateLimitError) or getattr(error, "status_code", None) == 429
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket limiter over requests-per-minute and tokens-per-minute budgets.
+    The effective rate is halved after a rate-limit error and recovers on success.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200_000,
+        min_rate_fraction: float = 0.1,
+        recovery_step: float = 0.05
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.min_rate_fraction = min_rate_fraction
+        self.recovery_step = recovery_step
+        self.rate_fraction = 1.0
+        self.available_requests = float(requests_per_minute)
+        self.available_tokens = float(tokens_per_minute)
+        self.last_refill = time.monotonic()
+        self.rate_limited_count = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+
+        self.available_requests = min(
+            self.requests_per_minute,
+            self.available_requests + elapsed * self.requests_per_minute / 60 * self.rate_fraction
+        )
+        self.available_tokens = min(
+            self.tokens_per_minute,
+            self.available_tokens + elapsed * self.tokens_per_minute / 60 * self.rate_fraction
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until one request and the given number of tokens are available.
+        The lock only guards the bucket check; waiters sleep outside it, so a
+        smaller request is not held up behind a larger one.
+        """
+        tokens = min(tokens, self.tokens_per_minute)
+
+        while True:
+            async with self._lock:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+
+                request_rate = self.requests_per_minute / 60 * self.rate_fraction
+                token_rate = self.tokens_per_minute / 60 * self.rate_fraction
+                wait = max(
+                    (1 - self.available_requests) / request_rate,
+                    (tokens - self.available_tokens) / token_rate,
+                    0.001
+                )
+            await asyncio.sleep(wait)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the real usage of a request is known."""
+        if actual_tokens:
+            self.available_tokens = min(
+                self.tokens_per_minute,
+                self.available_tokens + estimated_tokens - actual_tokens
+            )
+
+    def on_success(self) -> None:
+        """Gradually restore the rate after successful calls."""
+        self.rate_fraction = min(1.0, self.rate_fraction + self.recovery_step)
+
+    def on_rate_limited(self) -> None:
+        """Halve the rate and drain the buckets after a 429."""
+        self.rate_limited_count += 1
+        self.rate_fraction = max(self.min_rate_fraction, self.rate_fraction / 2)
+        self.available_requests = min(self.available_requests, 0.0)
+        self.available_tokens = min(self.available_tokens, 0.0)
+
+class AsyncExtractionEngine:
+    """
+    Concurrent article extraction with a concurrency cap and adaptive rate limiting.
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        max_concurrency: int = 8,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200_000,
+        use_structured_output: bool = True,
+        client=None,
+        cache=None,
+        refresh_cache: bool = False,
+        prompt_layout: str = "default",
+        telemetry=None,
+        resilience: Optional[ResilienceLayer] = None,
+        chunk_tokens: Optional[int] = None
+    ):
+        self.model = model
+        self.chunk_tokens = chunk_tokens
+        self.telemetry = telemetry
+        if telemetry is not None:
+            telemetry.instrument(client)
+        self.resilience = resilience or get_default_resilience()
+        self.prompt_layout = prompt_layout
+        self.max_concurrency = max_concurrency
+        self.use_structured_output = use_structured_output
+        self.client = client
+        self.cache = cache
+        self.refresh_cache = refresh_cache
+        self.limiter = AdaptiveRateLimiter(requests_per_minute, tokens_per_minute)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _call_model(self, messages: List[Dict[str, str]], prompt_layout: str):
+        client = self.resilience.prepare_client(self.client or get_async_client())
+
+        if self.use_structured_output:
+            from .schema import get_response_schema
+
+            return await client.chat.completions.parse(
+                model=self.model,
+                messages=messages,
+                response_format=get_response_schema(prompt_layout),
+                timeout=self.resilience.policy.timeout
+            )
+
+        return await client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            response_format={"type": "json_object"},
+            temperature=0.0,
+            timeout=self.resilience.policy.timeout
+        )
+
+    async def extract(self, article_text: str, prompt_layout: Optional[str] = None) -> dict:
+        """
+        Async counterpart of extract_article_information, bounded by the engine limits.
+        prompt_layout overrides the engine layout for this call.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        prompt_layout = prompt_layout or self.prompt_layout
+        messages = build_messages(article_text, prompt_layout)
+
+        if self.cache is not None:
+            from .cache import make_cache_key
+
+            cache_key = make_cache_key(self.model, messages, self.use_structured_output)
+            if not self.refresh_cache:
+                cached = get_cached_result(self.cache, cache_key)
+                if cached is not None:
+                    if self.telemetry is not None:
+                        with self.telemetry.track(self.model) as call:
+                            record_call_result(call, cached)
+                    return cached
+
+        estimated_tokens = estimate_request_tokens(messages)
+        call_context = self.telemetry.track(self.model) if self.telemetry is not None else nullcontext({})
+
+        async with self._semaphore:
+            with call_context as call:
+                result = await self._call_with_rate_limit(messages, prompt_layout, estimated_tokens, call)
+                record_call_result(call, result)
+
+        if result["success"] and self.cache is not None:
+            self.cache.put(cache_key, result)
+        return result
+
+    async def _call_with_rate_limit(
+        self,
+        messages: List[Dict[str, str]],
+        prompt_layout: str,
+        estimated_tokens: int,
+        call: dict
+    ) -> dict:
+        async def acquire() -> None:
+            await self.limiter.acquire(estimated_tokens)
+
+        async def on_retry(error: Exception) -> None:
+            if is_rate_limit_error(error):
+                self.limiter.on_rate_limited()
+
+        start = time.perf_counter()
+        try:
+            response = await self.resilience.acall(
+                lambda: self._call_model(messages, prompt_layout), call, on_retry=on_retry, before_attempt=acquire
+            )
+            parse_start = time.perf_counter()
+            result = format_extraction_response(response, self.model, self.use_structured_output)
+            call["parse_seconds"] = time.perf_counter() - parse_start
+            result["metadata"]["latency_seconds"] = round(time.perf_counter() - start, 4)
+        except Exception as e:
+            return format_extraction_error(e)
+
+        self.limiter.reconcile(estimated_tokens, result["metadata"]["tokens_used"])
+        self.limiter.on_success()
+        return result
+
+    async def process_article(self, article: dict) -> dict:
+        """
+        Async counterpart of process_single_article; chunks of long articles
+        are extracted concurrently under the engine limits.
+        """
+        prompt_layout = article_prompt_layout(article, self.prompt_layout)
+        chunks = [article["text"]]
+        if self.chunk_tokens:
+            from .chunking import plan_chunks
+
+            chunks = plan_chunks(article, self.chunk_tokens, self.model)
+
+        with article_context(article["id"]):
+            if len(chunks) > 1:
+                from .chunking import combine_chunk_results
+
+                chunk_results = await asyncio.gather(*(self.extract(chunk, prompt_layout) for chunk in chunks))
+                extraction_result = combine_chunk_results(list(chunk_results))
+            else:
+                extraction_result = await self.extract(article["text"], prompt_layout)
+        return build_article_result(article, extraction_result)
+
+    async def process_articles(
+        self,
+        articles: Iterable[Dict],
+        progress_every: int = 10,
+        on_result: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Process articles concurrently and return results in input order.
+        max_concurrency workers pull articles from the iterable, so only the
+        article texts in flight are held and articles can be streamed from
+        disk; the results themselves accumulate in the returned list.
+        on_result is called with each result as soon as it completes.
+        """
+        total = len(articles) if hasattr(articles, "__len__") else None
+        pending = enumerate(articles)
+        results: List[Optional[Dict]] = []
+        completed = 0
+        start = time.perf_counter()
+
+        async def worker() -> None:
+            nonlocal completed
+            # Each next() runs without awaiting, so indices are taken in input order
+            for index, article in pending:
+                results.append(None)
+                results[index] = await self.process_article(article)
+                if on_result is not None:
+                    on_result(results[index])
+                completed += 1
+                if progress_every and (completed % progress_every == 0 or completed == total):
+                    elapsed = time.perf_counter() - start
+                    print(f"Processed {completed}/{total if total is not None else '?'} ({completed / elapsed:.1f} articles/s)")
+
+        await asyncio.gather(*(worker() for _ in range(max(1, self.max_concurrency))))
+        return results
+
+async def process_single_article_async(
+    article: dict,
+    model: str = "gpt-4o-mini",
+    client=None,
+    cache=None,
+    refresh_cache: bool = False,
+    prompt_layout: str = "default",
+    telemetry=None,
+    resilience: Optional[ResilienceLayer] = None,
+    chunk_tokens: Optional[int] = None
+) -> dict:
+    """
+    Process a single article asynchronously and return extraction results with metadata.
+    """
+    engine = AsyncExtractionEngine(
+        model=model, max_concurrency=1, client=client, cache=cache, refresh_cache=refresh_cache,
+        prompt_layout=prompt_layout, telemetry=telemetry, resilience=resilience, chunk_tokens=chunk_tokens
+    )
+    return await engine.process_article(article)
+
+def run_concurrent_extraction(
+    articles: Iterable[Dict],
+    model: str = "gpt-4o-mini",
+    max_concurrency: int = 8,
+    requests_per_minute: int = 500,
+    tokens_per_minute: int = 200_000,
+    client=None,
+    cache=None,
+    refresh_cache: bool = False,
+    on_result: Optional[Callable[[Dict], None]] = None,
+    prompt_layout: str = "default",
+    telemetry=None,
+    resilience: Optional[ResilienceLayer] = None,
+    chunk_tokens: Optional[int] = None,
+    progress_every: int = 10
+) -> List[Dict]:
+    """
+    Synchronous entry point that runs the async engine over a list or stream of articles.
+    """
+    engine = AsyncExtractionEngine(
+        model=model,
+        max_concurrency=max_concurrency,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        client=client,
+        cache=cache,
+        refresh_cache=refresh_cache,
+        prompt_layout=prompt_layout,
+        telemetry=telemetry,
+        resilience=resilience,
+        chunk_tokens=chunk_tokens
+    )
+    return asyncio.run(engine.process_articles(articles, progress_every=progress_every, on_result=on_result))
@@ -0,0 +1,327 @@
+import json
+import os
+import time
+from typing import Callable, List, Dict, Iterator, Optional, Tuple
+
+from .openai_client import (
+    build_messages,
+    article_prompt_layout,
+    build_article_result,
+    format_extraction_error
+)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_BATCH_STATUSES = {"completed", "failed", "expired", "cancelled"}
+# Batch API limits per input file
+MAX_BATCH_REQUESTS = 50_000
+MAX_BATCH_FILE_BYTES = 200 * 1024 * 1024
+
+def strict_json_schema(schema: dict) -> dict:
+    """
+    Make a pydantic JSON schema strict for Structured Outputs: every object
+    forbids additional properties and requires all of its properties.
+    """
+    if isinstance(schema, dict):
+        schema = {key: strict_json_schema(value) for key, value in schema.items()}
+        if schema.get("type") == "object" and "properties" in schema:
+            schema["additionalProperties"] = False
+            schema["required"] = list(schema["properties"])
+    elif isinstance(schema, list):
+        schema = [strict_json_schema(value) for value in schema]
+    return schema
+
+def build_response_format(use_structured_output: bool = True, prompt_layout: str = "default") -> dict:
+    """
+    Return the response_format used by extract_article_information, as a plain dict.
+    """
+    if use_structured_output:
+        from .schema import get_response_schema
+
+        model = get_response_schema(prompt_layout)
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": model.__name__,
+                "schema": strict_json_schema(model.model_json_schema()),
+                "strict": True
+            }
+        }
+
+    return {"type": "json_object"}
+
+def build_batch_requests(
+    articles: List[Dict],
+    model: str = "gpt-4o-mini",
+    use_structured_output: bool = True,
+    prompt_layout: str = "default"
+) -> Iterator[Dict]:
+    """
+    Yield one Batch API request per article, keyed by article ID.
+    """
+    for article in articles:
+        layout = article_prompt_layout(article, prompt_layout)
+        body = {
+            "model": model,
+            "messages": build_messages(article["text"], layout),
+            "response_format": build_response_format(use_structured_output, layout)
+        }
+        if not use_structured_output:
+            body["temperature"] = 0.0
+
+        yield {
+            "custom_id": article["id"],
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": body
+        }
+
+def write_batch_file(
+    articles: List[Dict],
+    output_filepath: str,
+    model: str = "gpt-4o-mini",
+    use_structured_output: bool = True,
+    prompt_layout: str = "default"
+) -> str:
+    """
+    Serialise articles into a Batch API JSONL input file.
+    """
+    if os.path.dirname(output_filepath):
+        os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
+
+    count = 0
+    with open(output_filepath, 'w', encoding='utf-8') as f:
+        for request in build_batch_requests(articles, model, use_structured_output, prompt_layout):
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+            count += 1
+
+    print(f"Wrote {count} batch requests to {output_filepath}")
+    return output_filepath
+
+def write_batch_files(
+    articles: List[Dict],
+    work_dir: str,
+    model: str = "gpt-4o-mini",
+    use_structured_output: bool = True,
+    prompt_layout: str = "default",
+    max_requests: int = MAX_BATCH_REQUESTS,
+    max_bytes: int = MAX_BATCH_FILE_BYTES
+) -> List[Tuple[str, List[str]]]:
+    """
+    Serialise articles into as many Batch API input files as the per-file
+    request and size limits require. Returns (path, article IDs) per file.
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    prefix = os.path.join(work_dir, f"batch_input_{int(time.time())}")
+
+    files = []
+    f = None
+    try:
+        for request in build_batch_requests(articles, model, use_structured_output, prompt_layout):
+            line = (json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8")
+            if f is None or len(article_ids) >= max_requests or size + len(line) > max_bytes:
+                if f is not None:
+                    f.close()
+                path = f"{prefix}_{len(files)}.jsonl"
+                article_ids, size = [], 0
+                files.append((path, article_ids))
+                f = open(path, 'wb')
+            f.write(line)
+            article_ids.append(request["custom_id"])
+            size += len(line)
+    finally:
+        if f is not None:
+            f.close()
+
+    print(f"Wrote {len(articles)} batch requests to {len(files)} input files in {work_dir}")
+    return files
+
+def load_batch_state(state_path: Optional[str]) -> List[Dict]:
+    """
+    Return the submitted jobs ({"batch_id", "article_ids"}) recorded in state_path.
+    """
+    if not state_path or not os.path.exists(state_path):
+        return []
+    with open(state_path, 'r', encoding='utf-8') as f:
+        return json.load(f)["jobs"]
+
+def save_batch_state(state_path: str, jobs: List[Dict]) -> None:
+    """
+    Atomically record the submitted jobs, so a restart resumes polling instead of resubmitting.
+    """
+    if os.path.dirname(state_path):
+        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"jobs": jobs}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, state_path)
+
+def submit_batch(client, input_filepath: str, metadata: Optional[dict] = None):
+    """
+    Upload a JSONL input file and create the batch job.
+    """
+    with open(input_filepath, 'rb') as f:
+        input_file = client.files.create(file=f, purpose="batch")
+
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window="24h",
+        metadata=metadata
+    )
+    print(f"Submitted batch {batch.id} (input file {input_file.id})")
+    return batch
+
+def wait_for_batch(client, batch_id: str, poll_interval: float = 30.0, timeout: Optional[float] = None):
+    """
+    Poll a batch until it reaches a terminal status.
+    """
+    start = time.monotonic()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in TERMINAL_BATCH_STATUSES:
+            print(f"Batch {batch_id} finished with status: {batch.status}")
+            return batch
+
+        if timeout is not None and time.monotonic() - start > timeout:
+            raise TimeoutError(f"Batch {batch_id} still {batch.status} after {timeout}s")
+
+        counts = batch.request_counts
+        if counts:
+            print(f"Batch {batch_id}: {batch.status} ({counts.completed}/{counts.total})")
+        time.sleep(poll_interval)
+
+def iter_file_lines(client, file_id: str) -> Iterator[str]:
+    """
+    Stream a file's content line by line without loading it all in memory.
+    """
+    with client.files.with_streaming_response.content(file_id) as response:
+        for line in response.iter_lines():
+            if line.strip():
+                yield line
+
+def parse_batch_output_line(line: str, use_structured_output: bool = True) -> dict:
+    """
+    Convert one Batch API output line into the process_single_article result shape.
+    """
+    record = json.loads(line)
+    article = {"id": record["custom_id"]}
+
+    try:
+        if record.get("error"):
+            raise RuntimeError(record["error"].get("message", str(record["error"])))
+
+        response = record["response"]
+        if response["status_code"] != 200:
+            raise RuntimeError(f"Request failed with status {response['status_code']}: {response['body']}")
+
+        body = response["body"]
+        content = body["choices"][0]["message"]["content"]
+        if use_structured_output:
+            from .schema import ArticleExtraction, EntityExtraction
+
+            data = json.loads(content)
+            # Entities-only requests (locally classified topic) have no topic field
+            schema = ArticleExtraction if "topic" in data else EntityExtraction
+            data = schema.model_validate(data).model_dump()
+        else:
+            data = json.loads(content)
+
+        usage = body.get("usage") or {}
+        extraction_result = {
+            "success": True,
+            "data": data,
+            "metadata": {
+                "model": body.get("model"),
+                "tokens_used": usage.get("total_tokens", 0),
+                "prompt_tokens": usage.get("prompt_tokens", 0),
+                "completion_tokens": usage.get("completion_tokens", 0),
+                "cached_tokens": (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0,
+                "batch_api": True
+            }
+        }
+    except Exception as e:
+        extraction_result = format_extraction_error(e)
+
+    return build_article_result(article, extraction_result)
+
+def iter_batch_results(client, batch, use_structured_output: bool = True) -> Iterator[Dict]:
+    """
+    Stream results of a finished batch, including failed requests from the error file.
+    """
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in iter_file_lines(client, file_id):
+            yield parse_batch_output_line(line, use_structured_output)
+
+def run_batch_extraction(
+    articles: List[Dict],
+    model: str = "gpt-4o-mini",
+    client=None,
+    work_dir: str = "data/output/batches",
+    poll_interval: float = 30.0,
+    timeout: Optional[float] = None,
+    use_structured_output: bool = True,
+    prompt_layout: str = "default",
+    state_path: Optional[str] = None,
+    on_result: Optional[Callable[[Dict], None]] = None
+) -> List[Dict]:
+    """
+    Run extraction through the Batch API and return results in input order.
+    Articles are split into jobs within the per-file request and size limits.
+    With state_path, each submitted batch ID is recorded as soon as it is created;
+    a rerun polls the recorded jobs instead of resubmitting their articles, and
+    the state is removed once every result has been passed to on_result.
+    """
+    if client is None:
+        from .openai_client import get_default_client
+
+        client = get_default_client()
+
+    jobs = load_batch_state(state_path)
+    submitted_ids = {article_id for job in jobs for article_id in job["article_ids"]}
+    if jobs:
+        print(f"Resuming {len(jobs)} submitted batch jobs covering {len(submitted_ids)} articles")
+
+    new_articles = [article for article in articles if article["id"] not in submitted_ids]
+    if new_articles:
+        for input_filepath, article_ids in write_batch_files(
+            new_articles, work_dir, model, use_structured_output, prompt_layout
+        ):
+            batch = submit_batch(client, input_filepath)
+            jobs.append({"batch_id": batch.id, "article_ids": article_ids})
+            if state_path:
+                save_batch_state(state_path, jobs)
+
+    results_by_id = {}
+    statuses = {}
+    for job in jobs:
+        batch = wait_for_batch(client, job["batch_id"], poll_interval, timeout)
+        for article_id in job["article_ids"]:
+            statuses[article_id] = batch.status
+        for result in iter_batch_results(client, batch, use_structured_output):
+            results_by_id[result["article_id"]] = result
+
+    results = []
+    for article in articles:
+        result = results_by_id.get(article["id"])
+        if result is None:
+            status = statuses.get(article["id"], "not submitted")
+            result = build_article_result(
+                article, format_extraction_error(RuntimeError(f"No batch result (batch status: {status})"))
+            )
+        elif result["success"] and (article.get("pre_extraction") or article.get("topic_prediction")):
+            # Results are parsed from custom_id alone: merge the article-side fields here
+            result = build_article_result(article, {
+                "success": True, "data": result["extraction"], "metadata": result["metadata"]
+            })
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    if state_path and os.path.exists(state_path):
+        os.remove(state_path)
+
+    return results
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Optional
+
+from .schema import ArticleExtraction
+
+# Eviction frees entries down to this fraction of each limit, so that it runs
+# once per batch of inserts rather than on every put
+EVICTION_TARGET = 0.9
+
+_SCHEMA_JSON = json.dumps(ArticleExtraction.model_json_schema(), sort_keys=True)
+
+def make_cache_key(model: str, messages: List[Dict[str, str]], use_structured_output: bool = True) -> str:
+    """
+    Hash model, system prompt, rendered user prompt, response schema and output mode.
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "schema": _SCHEMA_JSON,
+            "use_structured_output": use_structured_output
+        },
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of successful extraction results with
+    size- and age-based eviction.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/cache/responses.sqlite",
+        max_entries: Optional[int] = 100_000,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+        max_age_seconds: Optional[float] = 30 * 24 * 3600
+    ):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_created ON responses(created_at)")
+        self._conn.commit()
+        self._entries, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached extraction result for key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (self.max_age_seconds is not None and now - row[1] > self.max_age_seconds):
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def put(self, key: str, result: dict) -> None:
+        """Store a successful extraction result and evict old entries if needed."""
+        if not result.get("success"):
+            return
+
+        value = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now)
+            )
+            if previous is None:
+                self._entries += 1
+            else:
+                self._bytes -= previous[0]
+            self._bytes += len(value)
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        if self.max_age_seconds is not None:
+            cutoff = now - self.max_age_seconds
+            expired, freed = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses WHERE created_at < ?", (cutoff,)
+            ).fetchone()
+            if expired:
+                self._conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+                self._entries -= expired
+                self._bytes -= freed
+
+        over_entries = self.max_entries is not None and self._entries > self.max_entries
+        over_bytes = self.max_bytes is not None and self._bytes > self.max_bytes
+        if not over_entries and not over_bytes:
+            return
+
+        # Drop least recently used entries until under both targets
+        max_entries = self.max_entries * EVICTION_TARGET if self.max_entries is not None else float("inf")
+        max_bytes = self.max_bytes * EVICTION_TARGET if self.max_bytes is not None else float("inf")
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if self._entries <= max_entries and self._bytes <= max_bytes:
+                break
+            stale.append((key,))
+            self._entries -= 1
+            self._bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._entries = self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and current cache size."""
+        with self._lock:
+            entries, total_bytes = self._entries, self._bytes
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": total_bytes
+        }
+
+    def close(self) -> None:
+        self._conn.close()
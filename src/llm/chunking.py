@@ -0,0 +1,161 @@
+import contextvars
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from .tokenizer import get_token_counter
+
+CHUNK_OVERLAP_TOKENS = 200
+PARAGRAPH_PATTERN = re.compile(r'\n\s*\n')
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+def count_text_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """
+    Count tokens of a piece of text with the shared per-model counter.
+    """
+    return get_token_counter(model).count(text)
+
+def _split_oversized(unit: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """Split a paragraph longer than max_tokens at sentence, then word boundaries."""
+    if count_tokens(unit) <= max_tokens:
+        return [unit]
+    sentences = SENTENCE_PATTERN.split(unit)
+    if len(sentences) > 1:
+        return [piece for sentence in sentences for piece in _split_oversized(sentence, max_tokens, count_tokens)]
+    words = unit.split()
+    if len(words) <= 1:
+        return [unit]
+    middle = len(words) // 2
+    return (
+        _split_oversized(" ".join(words[:middle]), max_tokens, count_tokens)
+        + _split_oversized(" ".join(words[middle:]), max_tokens, count_tokens)
+    )
+
+def split_into_chunks(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+    count_tokens: Optional[Callable[[str], int]] = None
+) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens at paragraph boundaries.
+    Each chunk repeats the trailing paragraphs of the previous one, up to
+    overlap_tokens, so people introduced across a boundary keep their context.
+    """
+    count_tokens = count_tokens or count_text_tokens
+    units = [
+        piece
+        for paragraph in PARAGRAPH_PATTERN.split(text) if paragraph.strip()
+        for piece in _split_oversized(paragraph.strip(), max_tokens, count_tokens)
+    ]
+    sizes = [count_tokens(unit) for unit in units]
+
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for index, size in enumerate(sizes):
+        if current and current_tokens + size > max_tokens:
+            chunks.append(current)
+            # Carry over trailing units of the previous chunk as overlap
+            overlap: List[int] = []
+            overlap_size = 0
+            for previous in reversed(current):
+                if overlap_size + sizes[previous] > overlap_tokens or overlap_size + sizes[previous] + size > max_tokens:
+                    break
+                overlap.insert(0, previous)
+                overlap_size += sizes[previous]
+            current, current_tokens = overlap, overlap_size
+        current.append(index)
+        current_tokens += size
+    if current:
+        chunks.append(current)
+
+    return ["\n\n".join(units[index] for index in chunk) for chunk in chunks]
+
+def plan_chunks(article: Dict, chunk_tokens: int, model: str = "gpt-4o-mini") -> List[str]:
+    """
+    Return [text] when the article fits in chunk_tokens, else its paragraph
+    chunks. The article token count is memoised by the shared counter.
+    """
+    counter = get_token_counter(model)
+    if counter.count_article(article) <= chunk_tokens:
+        return [article["text"]]
+    return split_into_chunks(article["text"], chunk_tokens, count_tokens=counter.count)
+
+def _normalize_person_name(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+def merge_chunk_extractions(extractions: List[Dict]) -> Dict:
+    """
+    Reduce per-chunk ArticleExtraction dicts into one: people are
+    deduplicated by normalised name with roles unioned (first spelling
+    wins), topic and subtopic are resolved by majority vote with ties going
+    to the earliest chunk, and the date comes from the first chunk that has
+    one (the byline is in the first chunk).
+    """
+    people: Dict[str, Dict] = {}
+    for extraction in extractions:
+        for person in extraction["people"]:
+            entry = people.setdefault(_normalize_person_name(person["name"]), {"name": " ".join(person["name"].split()), "roles": []})
+            known_roles = {role.casefold() for role in entry["roles"]}
+            for role in person["roles"]:
+                if role.strip() and role.strip().casefold() not in known_roles:
+                    entry["roles"].append(role.strip())
+                    known_roles.add(role.strip().casefold())
+
+    def vote(values: List[str]) -> str:
+        counts = Counter(values)
+        best = max(counts.values())
+        return next(value for value in values if counts[value] == best)
+
+    merged = {"people": list(people.values())}
+    # Entities-only extractions (topic classified locally) carry no topic
+    if all("topic" in extraction for extraction in extractions):
+        merged["topic"] = vote([extraction["topic"] for extraction in extractions])
+        merged["subtopic"] = vote([
+            extraction["subtopic"] for extraction in extractions if extraction["topic"] == merged["topic"]
+        ])
+    merged["date"] = next((extraction["date"] for extraction in extractions if extraction.get("date")), "")
+    return merged
+
+def combine_chunk_results(results: List[Dict]) -> Dict:
+    """
+    Combine per-chunk extraction results. Any failed chunk fails the
+    article (so checkpoint resume retries it); token counts are summed and
+    latency is the slowest chunk, since chunks run concurrently.
+    """
+    failed = next((result for result in results if not result["success"]), None)
+    metadata_list = [result["metadata"] for result in results]
+    metadata = {
+        "model": next((metadata.get("model") for metadata in metadata_list if metadata.get("model")), None),
+        "chunks": len(results)
+    }
+    for key in ("tokens_used", "prompt_tokens", "completion_tokens", "cached_tokens"):
+        metadata[key] = sum(item.get(key, 0) for item in metadata_list)
+    latencies = [item["latency_seconds"] for item in metadata_list if "latency_seconds" in item]
+    if latencies:
+        metadata["latency_seconds"] = max(latencies)
+    if all(item.get("cache_hit") for item in metadata_list):
+        metadata["cache_hit"] = True
+
+    if failed is not None:
+        return {"success": False, "error": f"Chunk extraction failed: {failed.get('error')}", "data": None, "metadata": metadata}
+    return {
+        "success": True,
+        "data": merge_chunk_extractions([result["data"] for result in results]),
+        "metadata": metadata
+    }
+
+def extract_chunked(
+    chunks: List[str],
+    extract: Callable[[str], Dict],
+    max_workers: int = 4
+) -> Dict:
+    """
+    Map extract over chunks in a thread pool and reduce the results.
+    Each worker runs in a copy of the caller's context (telemetry article ID).
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, extract, chunk) for chunk in chunks]
+        return combine_chunk_results([future.result() for future in futures])
@@ -0,0 +1,196 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+class ClientConfig:
+    """
+    Connection settings for the OpenAI clients: httpx pool limits, keep-alive,
+    HTTP/2, timeouts, and an optional transport (e.g. httpx.MockTransport) for tests.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        connect_timeout: float = 10.0,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+        transport=None,
+        async_transport=None,
+        load_env: bool = True
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.transport = transport
+        self.async_transport = async_transport
+        self.load_env = load_env
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def timeouts(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+    def resolve_api_key(self) -> Optional[str]:
+        """
+        Return the configured key, falling back to OPENAI_API_KEY (loading .env on first use).
+        """
+        if self.api_key is not None:
+            return self.api_key
+        if self.load_env:
+            from dotenv import load_dotenv
+            load_dotenv()
+        return os.getenv("OPENAI_API_KEY")
+
+def _use_http2(config: ClientConfig) -> bool:
+    """HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it."""
+    if not config.http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print("Warning: http2=True requires the 'h2' package, using HTTP/1.1")
+        return False
+    return True
+
+def build_client(config: Optional[ClientConfig] = None) -> OpenAI:
+    """
+    Build an OpenAI client on a pooled httpx.Client.
+    """
+    config = config or ClientConfig()
+    http_client = httpx.Client(
+        limits=config.limits(),
+        timeout=config.timeouts(),
+        http2=_use_http2(config),
+        transport=config.transport
+    )
+    return OpenAI(
+        api_key=config.resolve_api_key(),
+        base_url=config.base_url,
+        timeout=config.timeouts(),
+        max_retries=config.max_retries,
+        http_client=http_client
+    )
+
+def build_async_client(config: Optional[ClientConfig] = None) -> AsyncOpenAI:
+    """
+    Build an AsyncOpenAI client on a pooled httpx.AsyncClient.
+    """
+    config = config or ClientConfig()
+    http_client = httpx.AsyncClient(
+        limits=config.limits(),
+        timeout=config.timeouts(),
+        http2=_use_http2(config),
+        transport=config.async_transport
+    )
+    return AsyncOpenAI(
+        api_key=config.resolve_api_key(),
+        base_url=config.base_url,
+        timeout=config.timeouts(),
+        max_retries=config.max_retries,
+        http_client=http_client
+    )
+
+class ClientPool:
+    """
+    Lazily builds one sync client per process and one async client per event loop.
+    Clients are rebuilt after a fork, so worker processes never share sockets.
+    """
+
+    def __init__(self, config: Optional[ClientConfig] = None):
+        self.config = config or ClientConfig()
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._client: Optional[OpenAI] = None
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._telemetry = None
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._client = None
+            self._async_clients = weakref.WeakKeyDictionary()
+
+    def get_client(self) -> OpenAI:
+        """Return the process's OpenAI client, creating it on first use."""
+        with self._lock:
+            self._check_pid()
+            if self._client is None:
+                self._client = build_client(self.config)
+                if self._telemetry is not None:
+                    self._telemetry.instrument_client(self._client)
+            return self._client
+
+    def get_async_client(self) -> AsyncOpenAI:
+        """
+        Return the AsyncOpenAI client bound to the running event loop, creating it on first use.
+        Outside a running loop a fresh, unshared client is returned.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            client = build_async_client(self.config)
+            if self._telemetry is not None:
+                self._telemetry.instrument_client(client)
+            return client
+
+        with self._lock:
+            self._check_pid()
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = build_async_client(self.config)
+                if self._telemetry is not None:
+                    self._telemetry.instrument_client(client)
+                self._async_clients[loop] = client
+            return client
+
+    def instrument(self, telemetry) -> None:
+        """
+        Install the telemetry TTFB hook on the pooled clients, including those built later.
+        """
+        with self._lock:
+            self._telemetry = telemetry
+            for client in [self._client, *self._async_clients.values()]:
+                if client is not None:
+                    telemetry.instrument_client(client)
+
+    def configure(self, config: ClientConfig) -> None:
+        """Replace the connection settings; clients are rebuilt on next use."""
+        with self._lock:
+            self.config = config
+            self._pid = None
+            self._check_pid()
+
+_default_pool = ClientPool()
+
+def get_client_pool() -> ClientPool:
+    """
+    Return the process-wide ClientPool used when no client is passed explicitly.
+    """
+    return _default_pool
+
+def configure_clients(config: ClientConfig) -> None:
+    """
+    Set the connection settings used by get_default_client and get_async_client.
+    """
+    _default_pool.configure(config)
@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Optional
+
+import httpx
+import openai
+
+from .schema import ArticleExtraction
+
+DEFAULT_FAKE_EXTRACTION = {
+    "people": [
+        {"name": "Mario Rossi", "roles": ["Journalist"]}
+    ],
+    "topic": "Science",
+    "subtopic": "Research Discovery",
+    "date": "2025-01-01"
+}
+
+TITLE_PATTERN = re.compile(r'\*\*([^*\n]+)\*\*')
+
+class PrefixCacheSimulator:
+    """
+    Mimics provider-side prompt caching: prompts sharing a previously seen prefix of at
+    least min_prefix_tokens report that prefix (in block_tokens increments) as cached.
+    Tokens are approximated as 4 characters.
+    """
+
+    def __init__(self, min_prefix_tokens: int = 1024, block_tokens: int = 128):
+        self.min_prefix_chars = min_prefix_tokens * 4
+        self.block_chars = block_tokens * 4
+        self.seen_prefixes = set()
+
+    def usage(self, messages: List[Dict[str, str]], content: str) -> dict:
+        prompt = "".join(m["content"] for m in messages)
+        cached_chars = 0
+        for end in range(self.min_prefix_chars, len(prompt) + 1, self.block_chars):
+            key = hash(prompt[:end])
+            if key in self.seen_prefixes:
+                cached_chars = end
+            self.seen_prefixes.add(key)
+
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_chars // 4}
+        }
+
+class LatencyModel:
+    """
+    Seeded latency distribution for fake calls: "constant", "uniform"
+    (median +- spread) or "lognormal" (median, sigma), plus
+    seconds_per_token for every completion token, as real decoding time
+    grows with the output.
+    """
+
+    def __init__(
+        self,
+        distribution: str = "lognormal",
+        median: float = 0.05,
+        sigma: float = 0.5,
+        spread: float = 0.0,
+        seconds_per_token: float = 0.0,
+        seed: int = 0
+    ):
+        if distribution not in ("constant", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.median = median
+        self.sigma = sigma
+        self.spread = spread
+        self.seconds_per_token = seconds_per_token
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, completion_tokens: int = 0) -> float:
+        with self._lock:
+            if self.distribution == "lognormal":
+                base = self.median * math.exp(self.random.gauss(0.0, self.sigma))
+            elif self.distribution == "uniform":
+                base = self.random.uniform(self.median - self.spread, self.median + self.spread)
+            else:
+                base = self.median
+        return max(base, 0.0) + completion_tokens * self.seconds_per_token
+
+class ReplayResponses:
+    """
+    Response factory replaying recorded extractions: a request gets the
+    extraction recorded for the article whose **Title** line appears in
+    the prompt, or, for articles without a recording, one picked
+    deterministically from a hash of the prompt.
+    """
+
+    def __init__(self, results: Iterable[Dict], articles: Iterable[Dict]):
+        extractions = {result["article_id"]: result["extraction"] for result in results if result["success"] and result["extraction"]}
+        if not extractions:
+            raise ValueError("No successful extractions to replay")
+        self.by_title: Dict[str, dict] = {}
+        for article in articles:
+            title = TITLE_PATTERN.search(article["text"])
+            if title and article["id"] in extractions:
+                self.by_title.setdefault(title.group(1).strip(), extractions[article["id"]])
+        self.fallback = [extractions[article_id] for article_id in sorted(extractions)]
+        self.replayed = 0
+        self.fallbacks = 0
+
+    @classmethod
+    def from_files(cls, results_filepath: str, articles_filepath: str) -> "ReplayResponses":
+        from src.io.load_data import iter_json_records
+
+        return cls(iter_json_records(results_filepath), iter_json_records(articles_filepath))
+
+    def __call__(self, messages: List[Dict[str, str]]) -> dict:
+        prompt = messages[-1]["content"]
+        for match in TITLE_PATTERN.finditer(prompt):
+            extraction = self.by_title.get(match.group(1).strip())
+            if extraction is not None:
+                self.replayed += 1
+                return extraction
+        self.fallbacks += 1
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=8).digest()
+        return self.fallback[int.from_bytes(digest, "little") % len(self.fallback)]
+
+class FaultInjector:
+    """
+    Randomly injects 429s (with Retry-After), 5xx errors and timeouts into fake calls.
+    """
+
+    def __init__(
+        self,
+        rate_limit_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        retry_after: Optional[float] = None,
+        timeout_seconds: float = 5.0,
+        seed: int = 0
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.rate_limit_rate = rate_limit_rate
+        self.server_error_rate = server_error_rate
+        self.timeout_rate = timeout_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.injected = {"rate_limit": 0, "server_error": 0, "timeout": 0}
+
+    def pick(self) -> Optional[str]:
+        """Return the fault to inject for the next call, if any."""
+        roll = self.random.random()
+        for fault, rate in (
+            ("rate_limit", self.rate_limit_rate),
+            ("server_error", self.server_error_rate),
+            ("timeout", self.timeout_rate)
+        ):
+            if roll < rate:
+                self.injected[fault] += 1
+                return fault
+            roll -= rate
+        return None
+
+    def headers(self) -> Dict[str, str]:
+        return {"retry-after": str(self.retry_after)} if self.retry_after is not None else {}
+
+    def raise_fault(self, fault: str) -> None:
+        """Raise the openai exception a real client would raise for the fault."""
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        if fault == "timeout":
+            raise openai.APITimeoutError(request=request)
+        if fault == "rate_limit":
+            response = httpx.Response(429, headers=self.headers(), request=request)
+            raise openai.RateLimitError("Rate limit reached (injected)", response=response, body=None)
+        response = httpx.Response(500, request=request)
+        raise openai.InternalServerError("Internal server error (injected)", response=response, body=None)
+
+class FakeAsyncOpenAI:
+    """
+    Offline stand-in for AsyncOpenAI that answers chat completions with canned
+    extractions after an artificial delay.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        response_factory: Optional[Callable[[List[Dict[str, str]]], dict]] = None,
+        seed: int = 0,
+        faults: Optional[FaultInjector] = None
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.response_factory = response_factory or (lambda messages: DEFAULT_FAKE_EXTRACTION)
+        self.random = random.Random(seed)
+        self.prefix_cache = PrefixCacheSimulator()
+        self.faults = faults
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(parse=self._parse, create=self._create))
+
+    async def _respond(self, messages: List[Dict[str, str]]) -> dict:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            await asyncio.sleep(delay)
+            fault = self.faults.pick() if self.faults is not None else None
+            if fault is not None:
+                self.faults.raise_fault(fault)
+            return self.response_factory(messages)
+        finally:
+            self.in_flight -= 1
+
+    def _usage(self, messages: List[Dict[str, str]], content: str) -> SimpleNamespace:
+        usage = self.prefix_cache.usage(messages, content)
+        usage["prompt_tokens_details"] = SimpleNamespace(**usage["prompt_tokens_details"])
+        return SimpleNamespace(**usage)
+
+    async def _parse(self, model: str, messages: List[Dict[str, str]], response_format=ArticleExtraction, **kwargs):
+        data = await self._respond(messages)
+        content = json.dumps(data, ensure_ascii=False)
+        message = SimpleNamespace(content=content, parsed=response_format.model_validate(data))
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(message=message)],
+            usage=self._usage(messages, content)
+        )
+
+    async def _create(self, model: str, messages: List[Dict[str, str]], **kwargs):
+        data = await self._respond(messages)
+        content = json.dumps(data, ensure_ascii=False)
+        message = SimpleNamespace(content=content, parsed=None)
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(message=message)],
+            usage=self._usage(messages, content)
+        )
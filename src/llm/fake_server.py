@@ -0,0 +1,253 @@
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+from .fake_client import DEFAULT_FAKE_EXTRACTION, FaultInjector, LatencyModel, PrefixCacheSimulator
+
+def _parse_multipart(body: bytes, content_type: str) -> Dict[str, dict]:
+    """
+    Minimal multipart/form-data parser returning {field: {"filename", "content"}}.
+    """
+    boundary = content_type.split("boundary=")[1].strip('"').encode()
+    fields = {}
+    for part in body.split(b"--" + boundary):
+        if b"\r\n\r\n" not in part:
+            continue
+        raw_headers, content = part.split(b"\r\n\r\n", 1)
+        headers = raw_headers.decode("utf-8", errors="replace")
+        if 'name="' not in headers:
+            continue
+        name = headers.split('name="')[1].split('"')[0]
+        filename = headers.split('filename="')[1].split('"')[0] if 'filename="' in headers else None
+        fields[name] = {"filename": filename, "content": content[:-2] if content.endswith(b"\r\n") else content}
+    return fields
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connections under concurrent benchmark load
+    request_queue_size = 128
+    daemon_threads = True
+
+class FakeOpenAIServer:
+    """
+    Local HTTP stand-in for the OpenAI API covering chat completions, files and batches.
+    Use base_url with OpenAI(base_url=server.base_url, api_key="fake").
+    Chat completions wait latency seconds plus a latency_model sample (which
+    can scale with completion tokens); response_factory=ReplayResponses(...)
+    replays recorded extractions.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        response_factory: Optional[Callable[[List[Dict[str, str]]], dict]] = None,
+        batch_processing_delay: float = 0.0,
+        latency: float = 0.0,
+        faults: Optional[FaultInjector] = None,
+        latency_model: Optional[LatencyModel] = None
+    ):
+        self.response_factory = response_factory or (lambda messages: DEFAULT_FAKE_EXTRACTION)
+        self.batch_processing_delay = batch_processing_delay
+        self.latency = latency
+        self.latency_model = latency_model
+        self.prefix_cache = PrefixCacheSimulator()
+        self.faults = faults
+        self.files: Dict[str, dict] = {}
+        self.batches: Dict[str, dict] = {}
+        self._batch_started: Dict[str, float] = {}
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._httpd = _FakeHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def response_delay(self, completion_tokens: int = 0) -> float:
+        """Seconds to wait before answering a chat completion."""
+        if self.latency_model is None:
+            return self.latency
+        return self.latency + self.latency_model.sample(completion_tokens)
+
+    def chat_completion(self, body: dict) -> dict:
+        """Build a chat completion payload for a request body."""
+        messages = body["messages"]
+        content = json.dumps(self.response_factory(messages), ensure_ascii=False)
+        with self._lock:
+            usage = self.prefix_cache.usage(messages, content)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content, "refusal": None},
+                "finish_reason": "stop"
+            }],
+            "usage": usage
+        }
+
+    def add_file(self, content: bytes, filename: str, purpose: str) -> dict:
+        file_id = f"file-{uuid.uuid4().hex[:16]}"
+        file_object = {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed"
+        }
+        with self._lock:
+            self.files[file_id] = {"object": file_object, "content": content}
+        return file_object
+
+    def create_batch(self, body: dict) -> dict:
+        batch_id = f"batch_{uuid.uuid4().hex[:16]}"
+        batch = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": body["endpoint"],
+            "errors": None,
+            "input_file_id": body["input_file_id"],
+            "completion_window": body.get("completion_window", "24h"),
+            "status": "in_progress",
+            "output_file_id": None,
+            "error_file_id": None,
+            "created_at": int(time.time()),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+            "metadata": body.get("metadata")
+        }
+        with self._lock:
+            self.batches[batch_id] = batch
+            self._batch_started[batch_id] = time.monotonic()
+        return batch
+
+    def retrieve_batch(self, batch_id: str) -> dict:
+        batch = self.batches[batch_id]
+        elapsed = time.monotonic() - self._batch_started[batch_id]
+        if batch["status"] == "in_progress" and elapsed >= self.batch_processing_delay:
+            self._complete_batch(batch)
+        return batch
+
+    def _complete_batch(self, batch: dict) -> None:
+        input_lines = self.files[batch["input_file_id"]]["content"].decode("utf-8").splitlines()
+        output_lines = []
+        for line in input_lines:
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            output_lines.append(json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "request_id": uuid.uuid4().hex,
+                    "body": self.chat_completion(request["body"])
+                },
+                "error": None
+            }, ensure_ascii=False))
+
+        output_file = self.add_file("\n".join(output_lines).encode("utf-8") + b"\n", "batch_output.jsonl", "batch_output")
+        batch.update({
+            "status": "completed",
+            "output_file_id": output_file["id"],
+            "completed_at": int(time.time()),
+            "request_counts": {"total": len(output_lines), "completed": len(output_lines), "failed": 0}
+        })
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, payload: dict, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_POST(self):
+                with server._lock:
+                    server.request_count += 1
+                body = self._read_body()
+
+                if self.path == "/v1/chat/completions":
+                    fault = None
+                    if server.faults is not None:
+                        with server._lock:
+                            fault = server.faults.pick()
+                    if fault is None:
+                        payload = server.chat_completion(json.loads(body))
+                        time.sleep(server.response_delay(payload["usage"]["completion_tokens"]))
+                        self._send_json(payload)
+                    elif fault == "rate_limit":
+                        time.sleep(server.response_delay())
+                        self._send_json(
+                            {"error": {"message": "Rate limit reached (injected)", "type": "rate_limit_error"}},
+                            429, server.faults.headers()
+                        )
+                    elif fault == "server_error":
+                        time.sleep(server.response_delay())
+                        self._send_json({"error": {"message": "Internal server error (injected)"}}, 500)
+                    elif fault == "timeout":
+                        # Hold the connection long enough for the client timeout to fire
+                        time.sleep(server.response_delay() + server.faults.timeout_seconds)
+                        self._send_json(server.chat_completion(json.loads(body)))
+                elif self.path == "/v1/files":
+                    fields = _parse_multipart(body, self.headers["Content-Type"])
+                    purpose = fields["purpose"]["content"].decode()
+                    self._send_json(server.add_file(fields["file"]["content"], fields["file"]["filename"], purpose))
+                elif self.path == "/v1/batches":
+                    self._send_json(server.create_batch(json.loads(body)))
+                else:
+                    self._send_json({"error": {"message": f"Unknown path {self.path}"}}, 404)
+
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                parts = self.path.strip("/").split("/")
+
+                if parts[:2] == ["v1", "batches"] and len(parts) == 3 and parts[2] in server.batches:
+                    self._send_json(server.retrieve_batch(parts[2]))
+                elif parts[:2] == ["v1", "files"] and len(parts) == 4 and parts[3] == "content" and parts[2] in server.files:
+                    data = server.files[parts[2]]["content"]
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                else:
+                    self._send_json({"error": {"message": f"Unknown path {self.path}"}}, 404)
+
+        return Handler
@@ -1,87 +1,244 @@
 from openai import OpenAI
-import os
-from dotenv import load_dotenv
-from typing import Optional
+from typing import Optional, List, Dict
 import json
+import time
+from contextlib import nullcontext
 
 from .prompts import PromptTemplates
+from .telemetry import article_context, record_call_result
+from .resilience import ResilienceLayer, get_default_resilience
+from .client_factory import get_client_pool
 
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+def get_default_client() -> OpenAI:
+    """
+    Return the process-wide pooled OpenAI client, built on first use.
+    """
+    return get_client_pool().get_client()
+
+def build_messages(article_text: str, prompt_layout: str = "default") -> List[Dict[str, str]]:
+    """
+    Build the chat messages sent for a single article.
+    prompt_layout "cache_friendly" puts the static instructions before the article text.
+    """
+    template = PromptTemplates.USER_PROMPT_TEMPLATES[prompt_layout]
+    return [
+        {"role": "system", "content": PromptTemplates.SYSTEM_PROMPT},
+        {"role": "user", "content": template.format(text=article_text)}
+    ]
+
+def get_usage_metadata(usage) -> dict:
+    """
+    Extract token counts, including cached prompt tokens, from a response usage object.
+    """
+    if not usage:
+        return {"tokens_used": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "tokens_used": usage.total_tokens,
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "cached_tokens": (getattr(details, "cached_tokens", None) or 0) if details else 0
+    }
+
+def format_extraction_response(response, model: str, use_structured_output: bool = True) -> dict:
+    """
+    Convert a chat completion response into the extraction result dict.
+    """
+    if use_structured_output:
+        # Parsed object as dict
+        data = response.choices[0].message.parsed.model_dump()
+    else:
+        data = json.loads(response.choices[0].message.content)
+    
+    return {
+        "success": True,
+        "data": data,
+        "metadata": {
+            "model": model,
+            **get_usage_metadata(response.usage)
+        }
+    }
+
+def format_extraction_error(error: Exception) -> dict:
+    """
+    Build the extraction result dict for a failed call.
+    """
+    return {
+        "success": False,
+        "error": str(error),
+        "data": None,
+        "metadata": {}
+    }
+
+def get_cached_result(cache, cache_key: str) -> Optional[dict]:
+    """
+    Look up a cached extraction result and flag it as a cache hit.
+    """
+    cached = cache.get(cache_key)
+    if cached is not None:
+        cached["metadata"]["cache_hit"] = True
+    return cached
 
 def extract_article_information(
     article_text: str,
     model: str = "gpt-4o-mini",
-    use_structured_output: bool = True
+    use_structured_output: bool = True,
+    cache=None,
+    refresh_cache: bool = False,
+    client: Optional[OpenAI] = None,
+    prompt_layout: str = "default",
+    telemetry=None,
+    resilience: Optional[ResilienceLayer] = None
 ) -> dict:
     """
     Extract people, roles, topic, subtopic, and date from article text using LLM.
+    When a ResponseCache is given, cached results are reused unless refresh_cache is set.
+    A Telemetry instance records wall time, TTFB, tokens and parse time of the call.
+    Transient errors are retried with backoff behind a shared circuit breaker.
     """
+    if client is None:
+        client = get_default_client()
+    if resilience is None:
+        resilience = get_default_resilience()
+
+    call_context = telemetry.track(model) if telemetry is not None else nullcontext({})
+    with call_context as call:
+        result = _extract_article_information(
+            article_text, model, use_structured_output, cache, refresh_cache,
+            resilience.prepare_client(client), prompt_layout, call, resilience
+        )
+        record_call_result(call, result)
+        return result
 
+def _extract_article_information(
+    article_text: str,
+    model: str,
+    use_structured_output: bool,
+    cache,
+    refresh_cache: bool,
+    client: OpenAI,
+    prompt_layout: str,
+    call: dict,
+    resilience: ResilienceLayer
+) -> dict:
     try:
-        messages = [
-            {"role": "system", "content": PromptTemplates.SYSTEM_PROMPT},
-            {"role": "user", "content": PromptTemplates.USER_PROMPT_TEMPLATE.format(text=article_text)}
-        ]
+        messages = build_messages(article_text, prompt_layout)
         
+        if cache is not None:
+            from .cache import make_cache_key
+            
+            cache_key = make_cache_key(model, messages, use_structured_output)
+            if not refresh_cache:
+                cached = get_cached_result(cache, cache_key)
+                if cached is not None:
+                    return cached
+        
+        start = time.perf_counter()
         if use_structured_output:
             # Structured output using Pydantic validation
-            from .schema import ArticleExtraction
+            from .schema import get_response_schema
             
-            response = client.chat.completions.parse(
+            response = resilience.call(lambda: client.chat.completions.parse(
                 model=model,
                 messages=messages,
-                response_format=ArticleExtraction
-            )
-            
-            # Parsed object as dict
-            parsed_result = response.choices[0].message.parsed
-            return {
-                "success": True,
-                "data": parsed_result.model_dump(),
-                "metadata": {
-                    "model": model,
-                    "tokens_used": response.usage.total_tokens if response.usage else 0
-                }
-            }
+                response_format=get_response_schema(prompt_layout),
+                timeout=resilience.policy.timeout
+            ), call)
             
         else:
             # JSON mode fallback
-            response = client.chat.completions.create(
+            response = resilience.call(lambda: client.chat.completions.create(
                 model=model,
                 messages=messages,
                 response_format={"type": "json_object"},
-                temperature=0.0
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            return {
-                "success": True,
-                "data": result,
-                "metadata": {
-                    "model": model,
-                    "tokens_used": response.usage.total_tokens if response.usage else 0
-                }
-            }
+                temperature=0.0,
+                timeout=resilience.policy.timeout
+            ), call)
+        
+        parse_start = time.perf_counter()
+        result = format_extraction_response(response, model, use_structured_output)
+        call["parse_seconds"] = time.perf_counter() - parse_start
+        result["metadata"]["latency_seconds"] = round(time.perf_counter() - start, 4)
+        
+        if cache is not None:
+            cache.put(cache_key, result)
+        
+        return result
             
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "data": None,
-            "metadata": {}
-        }
+        return format_extraction_error(e)
+
+def enrich_extraction(extraction: dict, pre_extraction: dict) -> dict:
+    """
+    Merge rule-based title, byline author and date into an extraction dict.
+    """
+    from src.preprocessing.metadata_extraction import merge_pre_extraction
+    from .schema import EnrichedArticleExtraction
     
-def process_single_article(article: dict, model: str = "gpt-4o-mini") -> dict:
+    return EnrichedArticleExtraction(**merge_pre_extraction(extraction, pre_extraction)).model_dump()
+
+def article_prompt_layout(article: dict, prompt_layout: str = "default") -> str:
     """
-    Process a single article and return extraction results with metadata.
+    Articles routed to the local topic classifier only ask the model for people and date.
+    """
+    prediction = article.get("topic_prediction")
+    return "entities_only" if prediction and prediction["route"] == "local" else prompt_layout
+
+def build_article_result(article: dict, extraction_result: dict) -> dict:
+    """
+    Combine an article and its extraction result into the per-article record.
+    A local article["topic_prediction"] fills topic/subtopic of entities-only
+    extractions, and rule-based fields in article["pre_extraction"] are merged in.
     """
-    extraction_result = extract_article_information(article["text"], model)
+    extraction = extraction_result["data"] if extraction_result["success"] else None
+    metadata = extraction_result["metadata"]
+    if extraction is not None and article.get("topic_prediction"):
+        from src.classification.topic_classifier import apply_topic_prediction
+        
+        extraction, route = apply_topic_prediction(extraction, article["topic_prediction"])
+        metadata = dict(metadata, topic_route=route, topic_confidence=article["topic_prediction"]["confidence"])
+    if extraction is not None and article.get("pre_extraction"):
+        extraction = enrich_extraction(extraction, article["pre_extraction"])
     
     return {
         "article_id": article["id"],
-        "extraction": extraction_result["data"] if extraction_result["success"] else None,
+        "extraction": extraction,
         "success": extraction_result["success"],
         "error": extraction_result.get("error"),
-        "metadata": extraction_result["metadata"]
-    }
\ No newline at end of file
+        "metadata": metadata
+    }
+    
+def process_single_article(
+    article: dict,
+    model: str = "gpt-4o-mini",
+    cache=None,
+    refresh_cache: bool = False,
+    client: Optional[OpenAI] = None,
+    prompt_layout: str = "default",
+    telemetry=None,
+    resilience: Optional[ResilienceLayer] = None,
+    chunk_tokens: Optional[int] = None
+) -> dict:
+    """
+    Process a single article and return extraction results with metadata.
+    Articles longer than chunk_tokens are split at paragraph boundaries, the
+    chunks are extracted concurrently and the results merged (see chunking).
+    """
+    def extract(text: str) -> dict:
+        return extract_article_information(
+            text, model, cache=cache, refresh_cache=refresh_cache,
+            client=client, prompt_layout=article_prompt_layout(article, prompt_layout), telemetry=telemetry,
+            resilience=resilience
+        )
+    
+    with article_context(article["id"]):
+        if chunk_tokens:
+            from .chunking import plan_chunks, extract_chunked
+            
+            chunks = plan_chunks(article, chunk_tokens, model)
+            extraction_result = extract_chunked(chunks, extract) if len(chunks) > 1 else extract(article["text"])
+        else:
+            extraction_result = extract(article["text"])
+    
+    return build_article_result(article, extraction_result)
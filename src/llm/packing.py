@@ -0,0 +1,284 @@
+import time
+from contextlib import nullcontext
+from typing import List, Dict, Optional
+
+from .prompts import PromptTemplates
+from .tokenizer import get_token_counter
+from .telemetry import record_call_result
+from .resilience import ResilienceLayer, get_default_resilience
+from .openai_client import (
+    build_messages,
+    build_article_result,
+    format_extraction_error,
+    get_cached_result,
+    get_default_client,
+    get_usage_metadata,
+    process_single_article
+)
+
+def count_message_tokens(messages: List[Dict[str, str]], model: str = "gpt-4o-mini") -> int:
+    """
+    Count prompt tokens of a list of chat messages (content only).
+    """
+    counter = get_token_counter(model)
+    return sum(counter.count(message["content"]) for message in messages)
+
+def build_packed_messages(articles: List[Dict]) -> List[Dict[str, str]]:
+    """
+    Build the chat messages for a request carrying several articles.
+    """
+    rendered_articles = "\n".join(
+        PromptTemplates.PACKED_ARTICLE_TEMPLATE.format(article_id=article["id"], text=article["text"])
+        for article in articles
+    )
+    return [
+        {"role": "system", "content": PromptTemplates.SYSTEM_PROMPT},
+        {"role": "user", "content": PromptTemplates.PACKED_USER_PROMPT_TEMPLATE.format(articles=rendered_articles)}
+    ]
+
+def pack_articles(
+    articles: List[Dict],
+    token_budget: int = 6000,
+    max_articles_per_request: int = 10,
+    model: str = "gpt-4o-mini"
+) -> List[List[Dict]]:
+    """
+    Greedily group consecutive articles so each packed prompt stays under token_budget.
+    Articles that exceed the budget on their own get a group of their own.
+    """
+    counter = get_token_counter(model)
+    overhead = count_message_tokens(build_packed_messages([]), model)
+    header_tokens = counter.count(PromptTemplates.PACKED_ARTICLE_TEMPLATE.format(article_id="", text=""))
+    text_tokens = counter.count_articles(articles)
+
+    groups = []
+    current: List[Dict] = []
+    current_tokens = overhead
+
+    for article, tokens in zip(articles, text_tokens):
+        article_tokens = header_tokens + counter.count(article["id"]) + tokens
+        if current and (
+            current_tokens + article_tokens > token_budget or len(current) >= max_articles_per_request
+        ):
+            groups.append(current)
+            current = []
+            current_tokens = overhead
+        current.append(article)
+        current_tokens += article_tokens
+
+    if current:
+        groups.append(current)
+
+    return groups
+
+def estimate_prompt_savings(articles: List[Dict], groups: List[List[Dict]], model: str = "gpt-4o-mini") -> Dict:
+    """
+    Compare prompt tokens of single-article requests with the packed requests.
+    """
+    single_tokens = sum(count_message_tokens(build_messages(article["text"]), model) for article in articles)
+    packed_tokens = sum(count_message_tokens(build_packed_messages(group), model) for group in groups)
+
+    return {
+        "articles": len(articles),
+        "single_requests": len(articles),
+        "packed_requests": len(groups),
+        "single_prompt_tokens": single_tokens,
+        "packed_prompt_tokens": packed_tokens,
+        "prompt_tokens_saved": single_tokens - packed_tokens,
+        "prompt_token_savings_ratio": (single_tokens - packed_tokens) / single_tokens if single_tokens else 0.0
+    }
+
+def split_packed_response(parsed, group: List[Dict]) -> Optional[Dict[str, dict]]:
+    """
+    Map a packed response back to article IDs, or return None if it does not
+    contain exactly one extraction per article.
+    """
+    expected_ids = [article["id"] for article in group]
+    extractions = {}
+    for item in parsed.articles:
+        if item.article_id in extractions:
+            return None
+        extractions[item.article_id] = item.model_dump(exclude={"article_id"})
+
+    if sorted(extractions) != sorted(expected_ids):
+        return None
+
+    return extractions
+
+def split_proportionally(total: int, weights: List[int]) -> List[int]:
+    """
+    Split an integer total into shares proportional to weights that sum exactly to total.
+    """
+    weight_sum = sum(weights)
+    if not weight_sum:
+        weights, weight_sum = [1] * len(weights), len(weights)
+    shares = []
+    cumulative = assigned = 0
+    for weight in weights:
+        cumulative += weight
+        share = round(total * cumulative / weight_sum) - assigned
+        shares.append(share)
+        assigned += share
+    return shares
+
+def extract_packed_group(
+    group: List[Dict],
+    model: str = "gpt-4o-mini",
+    client=None,
+    cache=None,
+    refresh_cache: bool = False,
+    prompt_layout: str = "default",
+    telemetry=None,
+    resilience: Optional[ResilienceLayer] = None
+) -> List[Dict]:
+    """
+    Extract a group of articles with one request, falling back to single-article
+    calls if the packed request fails or its response does not validate.
+    The packed call goes through the resilience layer and telemetry like single
+    calls, and a ResponseCache stores it keyed by the packed messages.
+    """
+    if client is None:
+        client = get_default_client()
+    if resilience is None:
+        resilience = get_default_resilience()
+
+    if len(group) > 1:
+        call_context = telemetry.track(model) if telemetry is not None else nullcontext({})
+        with call_context as call:
+            packed = _extract_packed_group(
+                group, model, cache, refresh_cache, resilience.prepare_client(client), call, resilience
+            )
+            record_call_result(call, packed)
+
+        if packed["success"]:
+            metadata = packed["metadata"]
+            # Each article gets a share of the packed request's tokens, proportional to its length
+            weights = [len(article["text"]) for article in group]
+            shares = {
+                key: split_proportionally(metadata.get(key, 0), weights)
+                for key in ("prompt_tokens", "completion_tokens", "cached_tokens")
+            }
+            results = []
+            for i, article in enumerate(group):
+                extraction_result = {
+                    "success": True,
+                    "data": packed["data"][article["id"]],
+                    "metadata": {
+                        "model": model,
+                        "tokens_used": shares["prompt_tokens"][i] + shares["completion_tokens"][i],
+                        "prompt_tokens": shares["prompt_tokens"][i],
+                        "completion_tokens": shares["completion_tokens"][i],
+                        "cached_tokens": shares["cached_tokens"][i],
+                        "packed_request_size": len(group),
+                        "cache_hit": bool(metadata.get("cache_hit"))
+                    }
+                }
+                results.append(build_article_result(article, extraction_result))
+            return results
+
+        print(f"Packed request for {len(group)} articles failed ({packed['error']}), falling back to single calls")
+
+    return [
+        process_single_article(
+            article, model, cache=cache, refresh_cache=refresh_cache, client=client,
+            prompt_layout=prompt_layout, telemetry=telemetry, resilience=resilience
+        )
+        for article in group
+    ]
+
+def _extract_packed_group(
+    group: List[Dict],
+    model: str,
+    cache,
+    refresh_cache: bool,
+    client,
+    call: dict,
+    resilience: ResilienceLayer
+) -> dict:
+    """
+    One packed request; on success "data" maps article IDs to their extractions.
+    """
+    from .schema import PackedExtraction
+
+    try:
+        messages = build_packed_messages(group)
+
+        if cache is not None:
+            from .cache import make_cache_key
+
+            cache_key = make_cache_key(model, messages)
+            if not refresh_cache:
+                cached = get_cached_result(cache, cache_key)
+                if cached is not None:
+                    return cached
+
+        start = time.perf_counter()
+        response = resilience.call(lambda: client.chat.completions.parse(
+            model=model,
+            messages=messages,
+            response_format=PackedExtraction,
+            timeout=resilience.policy.timeout
+        ), call)
+
+        parse_start = time.perf_counter()
+        extractions = split_packed_response(response.choices[0].message.parsed, group)
+        call["parse_seconds"] = time.perf_counter() - parse_start
+        if extractions is None:
+            raise ValueError(f"response did not match the {len(group)} requested articles")
+
+        result = {
+            "success": True,
+            "data": extractions,
+            "metadata": {
+                "model": model,
+                **get_usage_metadata(response.usage),
+                "latency_seconds": round(time.perf_counter() - start, 4)
+            }
+        }
+        if cache is not None:
+            cache.put(cache_key, result)
+
+        return result
+
+    except Exception as e:
+        return format_extraction_error(e)
+
+def process_articles_packed(
+    articles: List[Dict],
+    model: str = "gpt-4o-mini",
+    token_budget: int = 6000,
+    max_articles_per_request: int = 10,
+    client=None,
+    on_result=None,
+    cache=None,
+    refresh_cache: bool = False,
+    prompt_layout: str = "default",
+    telemetry=None,
+    resilience: Optional[ResilienceLayer] = None
+) -> List[Dict]:
+    """
+    Process articles in packed multi-article requests and return per-article results in input order.
+    cache, prompt_layout (for single-article fallbacks), telemetry and resilience
+    are passed through to extract_packed_group.
+    """
+    groups = pack_articles(articles, token_budget, max_articles_per_request, model)
+    savings = estimate_prompt_savings(articles, groups, model)
+    print(f"Packed {savings['articles']} articles into {savings['packed_requests']} requests "
+          f"(prompt tokens {savings['single_prompt_tokens']} -> {savings['packed_prompt_tokens']}, "
+          f"{savings['prompt_token_savings_ratio']:.1%} saved)")
+
+    results = []
+    start = time.perf_counter()
+    for i, group in enumerate(groups):
+        print(f"Processing packed request {i+1}/{len(groups)} ({len(group)} articles)...")
+        for result in extract_packed_group(
+            group, model, client, cache=cache, refresh_cache=refresh_cache,
+            prompt_layout=prompt_layout, telemetry=telemetry, resilience=resilience
+        ):
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    elapsed = time.perf_counter() - start
+    print(f"Packed extraction finished in {elapsed:.1f}s")
+    return results
@@ -1,3 +1,20 @@
+TOPIC_TAXONOMY = {
+    "Politics": ["Election", "Policy", "Corruption", "Diplomacy"],
+    "Sports": ["Football", "Olympics", "Doping", "Injury"],
+    "Crime": ["Robbery", "Murder", "Fraud", "Drug Trafficking"],
+    "Economy": ["Inflation", "Stock Market", "Unemployment", "GDP"],
+    "Environment": ["Climate Change", "Pollution", "Wildlife", "Natural Disaster"],
+    "Culture": ["Festival", "Cinema", "Literature", "Art Exhibition"],
+    "Science": ["Astronomy", "Physics", "Biology", "Research Discovery"],
+    "Technology": ["AI", "Cybersecurity", "Gadgets", "Software"],
+    "Health": ["Epidemic", "Vaccination", "Nutrition", "Mental Health"]
+}
+
+# Written once and interpolated into every template that asks the model for the topic
+TOPIC_TAXONOMY_PROMPT = "VALID TOPICS AND SUBTOPICS:\n" + "\n".join(
+    f"- {topic}: {', '.join(subtopics)}" for topic, subtopics in TOPIC_TAXONOMY.items()
+)
+
 class PromptTemplates:
     SYSTEM_PROMPT = """
 You are an expert AI for extracting structured information from news articles.
@@ -18,16 +35,33 @@ EXTRACT:
 3. Specific subtopic
 4. Article date
 
-VALID TOPICS AND SUBTOPICS:
-- Politics: Election, Policy, Corruption, Diplomacy
-- Sports: Football, Olympics, Doping, Injury  
-- Crime: Robbery, Murder, Fraud, Drug Trafficking
-- Economy: Inflation, Stock Market, Unemployment, GDP
-- Environment: Climate Change, Pollution, Wildlife, Natural Disaster
-- Culture: Festival, Cinema, Literature, Art Exhibition
-- Science: Astronomy, Physics, Biology, Research Discovery
-- Technology: AI, Cybersecurity, Gadgets, Software
-- Health: Epidemic, Vaccination, Nutrition, Mental Health
+""" + TOPIC_TAXONOMY_PROMPT + """
+
+REQUIRED JSON FORMAT:
+{{
+  "people": [
+    {{
+      "name": "Full Name",
+      "roles": ["Role1", "Role2"]
+    }}
+  ],
+  "topic": "TopicName",
+  "subtopic": "SubtopicName", 
+  "date": "YYYY-MM-DD"
+}}
+"""
+    # Static instructions first and article text last, so consecutive requests
+    # share the longest possible prefix for provider-side prompt caching
+    CACHE_FRIENDLY_USER_PROMPT_TEMPLATE = """
+Analyze the news article at the end of this message and extract the required information.
+
+EXTRACT:
+1. People mentioned with their roles/professions
+2. Main topic category 
+3. Specific subtopic
+4. Article date
+
+""" + TOPIC_TAXONOMY_PROMPT + """
 
 REQUIRED JSON FORMAT:
 {{
@@ -41,4 +75,78 @@ REQUIRED JSON FORMAT:
   "subtopic": "SubtopicName", 
   "date": "YYYY-MM-DD"
 }}
-"""
\ No newline at end of file
+
+ARTICLE TEXT:
+{text}
+"""
+
+    # Used when the local topic classifier is confident: topic and subtopic
+    # are not requested from the model
+    ENTITIES_ONLY_USER_PROMPT_TEMPLATE = """
+Analyze the news article at the end of this message and extract the required information.
+
+EXTRACT:
+1. People mentioned with their roles/professions
+2. Article date
+
+REQUIRED JSON FORMAT:
+{{
+  "people": [
+    {{
+      "name": "Full Name",
+      "roles": ["Role1", "Role2"]
+    }}
+  ],
+  "date": "YYYY-MM-DD"
+}}
+
+ARTICLE TEXT:
+{text}
+"""
+
+    TOPIC_TAXONOMY = TOPIC_TAXONOMY
+
+    USER_PROMPT_TEMPLATES = {
+        "default": USER_PROMPT_TEMPLATE,
+        "cache_friendly": CACHE_FRIENDLY_USER_PROMPT_TEMPLATE,
+        "entities_only": ENTITIES_ONLY_USER_PROMPT_TEMPLATE
+    }
+
+    PACKED_USER_PROMPT_TEMPLATE = """
+Analyze each of the following news articles independently and extract the required information for each one.
+
+{articles}
+
+EXTRACT FOR EACH ARTICLE:
+1. People mentioned with their roles/professions
+2. Main topic category 
+3. Specific subtopic
+4. Article date
+
+""" + TOPIC_TAXONOMY_PROMPT + """
+
+Return exactly one entry per article, using its ARTICLE ID as article_id.
+
+REQUIRED JSON FORMAT:
+{{
+  "articles": [
+    {{
+      "article_id": "ARTICLE ID",
+      "people": [
+        {{
+          "name": "Full Name",
+          "roles": ["Role1", "Role2"]
+        }}
+      ],
+      "topic": "TopicName",
+      "subtopic": "SubtopicName", 
+      "date": "YYYY-MM-DD"
+    }}
+  ]
+}}
+"""
+
+    PACKED_ARTICLE_TEMPLATE = """ARTICLE ID: {article_id}
+ARTICLE TEXT:
+{text}
+"""
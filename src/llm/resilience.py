@@ -0,0 +1,247 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is open and calls are being shed."""
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Classify an error as transient (worth retrying) or fatal.
+    """
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, asyncio.TimeoutError, TimeoutError)):
+        return True
+    if isinstance(error, (openai.LengthFinishReasonError, openai.ContentFilterFinishReasonError)):
+        return False
+
+    status_code = getattr(error, "status_code", None)
+    return status_code in RETRYABLE_STATUS_CODES
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the server-requested delay (retry-after-ms or retry-after headers) from an API error.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        return None
+    return None
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, honouring Retry-After headers,
+    plus a per-call timeout.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        timeout: Optional[float] = 60.0,
+        seed: Optional[int] = None
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._random = random.Random(seed)
+
+    def compute_delay(self, attempt: int, error: Exception) -> float:
+        """Delay before retry number attempt + 1."""
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+class CircuitBreaker:
+    """
+    Shared breaker that opens when the transient failure rate over the last
+    window_size calls exceeds failure_rate_threshold, sheds calls for
+    cooldown seconds, then lets a single probe call through (half-open).
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 10,
+        cooldown: float = 30.0,
+        enabled: bool = True
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.enabled = enabled
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected_calls = 0
+        self._outcomes = deque(maxlen=window_size)
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed."""
+        if not self.enabled:
+            return True
+
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    self.rejected_calls += 1
+                    return False
+                self.state = "half_open"
+
+            if self.state == "half_open":
+                if self._probe_in_flight:
+                    self.rejected_calls += 1
+                    return False
+                self._probe_in_flight = True
+
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._outcomes.append(False)
+            if self.state == "half_open":
+                self.state = "closed"
+                self._probe_in_flight = False
+                self._outcomes.clear()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._outcomes.append(True)
+            if self.state == "half_open":
+                self._open()
+                return
+
+            failures = sum(self._outcomes)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._probe_in_flight = False
+        self._outcomes.clear()
+
+class ResilienceLayer:
+    """
+    Combines a RetryPolicy and a shared CircuitBreaker around LLM calls.
+    """
+
+    def __init__(self, policy: Optional[RetryPolicy] = None, breaker: Optional[CircuitBreaker] = None):
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._prepared_clients = weakref.WeakKeyDictionary()
+
+    def prepare_client(self, client):
+        """
+        Return a copy of an OpenAI client with SDK-level retries disabled,
+        so retries are handled only by this layer.
+        """
+        if not hasattr(client, "with_options"):
+            return client
+        try:
+            return self._prepared_clients[client]
+        except KeyError:
+            prepared = client.with_options(max_retries=0)
+            self._prepared_clients[client] = prepared
+            return prepared
+
+    def _on_error(self, error: Exception, attempt: int, call: Optional[dict]) -> Optional[float]:
+        """Record the failure and return the retry delay, or None if the error is final."""
+        if not is_retryable_error(error):
+            # The service answered, so a fatal error does not count against its health
+            self.breaker.record_success()
+            return None
+
+        self.breaker.record_failure()
+        if attempt >= self.policy.max_retries:
+            return None
+
+        if call is not None:
+            call["retries"] = attempt + 1
+        return self.policy.compute_delay(attempt, error)
+
+    def call(self, fn: Callable[[], T], call: Optional[dict] = None) -> T:
+        """Run fn with retries and circuit breaking."""
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError("Circuit breaker open: shedding LLM call")
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._on_error(e, attempt, call)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        call: Optional[dict] = None,
+        on_retry: Optional[Callable[[Exception], Awaitable[None]]] = None,
+        before_attempt: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> T:
+        """
+        Async counterpart of call; the per-call timeout is enforced with asyncio.wait_for.
+        before_attempt (e.g. rate limiter acquisition) runs outside the timeout.
+        """
+        attempt = 0
+        while True:
+            if before_attempt is not None:
+                await before_attempt()
+            if not self.breaker.allow():
+                raise CircuitOpenError("Circuit breaker open: shedding LLM call")
+            try:
+                result = await asyncio.wait_for(fn(), timeout=self.policy.timeout)
+            except Exception as e:
+                delay = self._on_error(e, attempt, call)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    await on_retry(e)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            self.breaker.record_success()
+            return result
+
+_default_resilience: Optional[ResilienceLayer] = None
+
+def get_default_resilience() -> ResilienceLayer:
+    """
+    Return the process-wide ResilienceLayer, so all calls share one circuit breaker.
+    """
+    global _default_resilience
+    if _default_resilience is None:
+        _default_resilience = ResilienceLayer()
+    return _default_resilience
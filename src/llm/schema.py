@@ -14,6 +14,22 @@ class ArticleExtraction(BaseModel):
     subtopic: str = Field(..., description="Specific subtopic within the topic")
     date: str = Field(..., description="Article date in YYYY-MM-DD format")
 
+class EntityExtraction(BaseModel):
+    """People and date only, for articles whose topic is classified locally."""
+    people: List[Person] = Field(..., description="List of people mentioned in the article")
+    date: str = Field(..., description="Article date in YYYY-MM-DD format")
+
+def get_response_schema(prompt_layout: str = "default") -> type:
+    """
+    Return the structured output model matching a prompt layout.
+    """
+    return EntityExtraction if prompt_layout == "entities_only" else ArticleExtraction
+
+class EnrichedArticleExtraction(ArticleExtraction):
+    """LLM extraction merged with rule-based title, byline author and date."""
+    title: Optional[str] = Field(None, description="Article title from the leading bold line")
+    author: Optional[str] = Field(None, description="Byline author (not counted among people)")
+
 class ExtractionResult(BaseModel):
     """Complete extraction result with metadata."""
     article_id: str = Field(..., description="Unique identifier for the article")
@@ -47,3 +63,10 @@ class ExtractionResult(BaseModel):
             }
         }
 
+class PackedArticleExtraction(ArticleExtraction):
+    """Extraction results for one article inside a packed multi-article request."""
+    article_id: str = Field(..., description="ID of the article these results belong to")
+
+class PackedExtraction(BaseModel):
+    """Extraction results for several articles sent in a single request."""
+    articles: List[PackedArticleExtraction] = Field(..., description="One extraction per article in the request")
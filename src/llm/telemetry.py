@@ -0,0 +1,259 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+# USD per 1M tokens: (input, cached input, output)
+MODEL_PRICING = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+}
+
+DEFAULT_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+_current_call: ContextVar[Optional[dict]] = ContextVar("current_llm_call", default=None)
+_current_article_id: ContextVar[Optional[str]] = ContextVar("current_article_id", default=None)
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> Optional[float]:
+    """
+    Estimate the USD cost of a call, or None if the model has no known pricing.
+    """
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        return None
+    input_price, cached_price, output_price = pricing
+    uncached = prompt_tokens - cached_tokens
+    return (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a list of values (q in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+@contextmanager
+def article_context(article_id: str) -> Iterator[None]:
+    """Attribute LLM calls made inside this block to an article ID."""
+    token = _current_article_id.set(article_id)
+    try:
+        yield
+    finally:
+        _current_article_id.reset(token)
+
+def record_call_result(call: dict, result: dict) -> None:
+    """Copy token counts and status from an extraction result into a call record."""
+    metadata = result.get("metadata") or {}
+    call["success"] = result.get("success", False)
+    call["error"] = result.get("error")
+    call["cache_hit"] = bool(metadata.get("cache_hit"))
+    for key in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+        call[key] = metadata.get(key, 0)
+
+def _on_response_headers(response) -> None:
+    call = _current_call.get()
+    if call is not None and call.get("ttfb_seconds") is None:
+        call["ttfb_seconds"] = time.perf_counter() - call["_start"]
+
+async def _on_response_headers_async(response) -> None:
+    _on_response_headers(response)
+
+class Telemetry:
+    """
+    Collects per-call latency and token telemetry for LLM extraction calls,
+    exports it as JSONL and Prometheus text, and summarises a run.
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None, latency_buckets=DEFAULT_LATENCY_BUCKETS):
+        if jsonl_path and os.path.dirname(jsonl_path):
+            os.makedirs(os.path.dirname(jsonl_path), exist_ok=True)
+
+        self.jsonl_path = jsonl_path
+        self.latency_buckets = latency_buckets
+        self.records: List[dict] = []
+        self._lock = threading.Lock()
+        self._file = open(jsonl_path, 'a', encoding='utf-8') if jsonl_path else None
+
+    def instrument_client(self, client) -> None:
+        """
+        Register an httpx response hook on an OpenAI/AsyncOpenAI client to
+        measure time-to-first-byte (response headers received). Clients
+        without an httpx client (offline fakes) are left alone, and the hook
+        is installed at most once per client.
+        """
+        http_client = getattr(client, "_client", None)
+        if http_client is None or not hasattr(http_client, "event_hooks"):
+            return
+        hook = _on_response_headers_async if hasattr(http_client, "aclose") else _on_response_headers
+        hooks = list(http_client.event_hooks.get("response", []))
+        if hook not in hooks:
+            http_client.event_hooks["response"] = hooks + [hook]
+
+    def instrument(self, client=None) -> None:
+        """
+        Measure TTFB on an explicit client, or on every pooled sync and async
+        client (see client_factory.ClientPool) when client is None.
+        """
+        if client is not None:
+            self.instrument_client(client)
+        else:
+            from .client_factory import get_client_pool
+
+            get_client_pool().instrument(self)
+
+    @contextmanager
+    def track(self, model: str) -> Iterator[dict]:
+        """
+        Time one extraction call; the yielded dict collects retries, parse time and tokens.
+        """
+        call = {
+            "timestamp": time.time(),
+            "article_id": _current_article_id.get(),
+            "model": model,
+            "wall_seconds": None,
+            "ttfb_seconds": None,
+            "parse_seconds": 0.0,
+            "retries": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "cache_hit": False,
+            "success": False,
+            "error": None,
+            "_start": time.perf_counter()
+        }
+        token = _current_call.set(call)
+        try:
+            yield call
+        finally:
+            _current_call.reset(token)
+            call["wall_seconds"] = time.perf_counter() - call.pop("_start")
+            self._add(call)
+
+    def _add(self, call: dict) -> None:
+        with self._lock:
+            self.records.append(call)
+            if self._file is not None:
+                self._file.write(json.dumps(call, ensure_ascii=False) + "\n")
+                self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Per-model latency percentiles, throughput and estimated cost.
+        Local cache hits are counted but excluded from latency and cost.
+        """
+        by_model: Dict[str, List[dict]] = {}
+        for call in self.records:
+            by_model.setdefault(call["model"], []).append(call)
+
+        summary = {}
+        for model, calls in by_model.items():
+            api_calls = [c for c in calls if not c["cache_hit"]]
+            latencies = [c["wall_seconds"] for c in api_calls]
+            ttfbs = [c["ttfb_seconds"] for c in api_calls if c["ttfb_seconds"] is not None]
+            prompt_tokens = sum(c["prompt_tokens"] for c in api_calls)
+            completion_tokens = sum(c["completion_tokens"] for c in api_calls)
+            cached_tokens = sum(c["cached_tokens"] for c in api_calls)
+
+            # Throughput over the run's wall-clock span, so concurrency is accounted for
+            span = 0.0
+            if api_calls:
+                span = max(c["timestamp"] + c["wall_seconds"] for c in api_calls) - min(c["timestamp"] for c in api_calls)
+
+            summary[model] = {
+                "calls": len(calls),
+                "api_calls": len(api_calls),
+                "cache_hits": len(calls) - len(api_calls),
+                "errors": sum(1 for c in calls if not c["success"]),
+                "retries": sum(c["retries"] for c in calls),
+                "latency_p50": percentile(latencies, 50),
+                "latency_p95": percentile(latencies, 95),
+                "latency_p99": percentile(latencies, 99),
+                "ttfb_p50": percentile(ttfbs, 50),
+                "ttfb_p95": percentile(ttfbs, 95),
+                "avg_parse_seconds": sum(c["parse_seconds"] for c in api_calls) / len(api_calls) if api_calls else 0.0,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cached_tokens": cached_tokens,
+                "tokens_per_second": (prompt_tokens + completion_tokens) / span if span else 0.0,
+                "completion_tokens_per_second": completion_tokens / span if span else 0.0,
+                "estimated_cost_usd": estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+            }
+
+        return summary
+
+    def print_summary(self) -> None:
+        for model, stats in self.summary().items():
+            cost = stats["estimated_cost_usd"]
+            print(f"\nTelemetry ({model}):")
+            print(f"   - Calls: {stats['api_calls']} API, {stats['cache_hits']} cached, "
+                  f"{stats['errors']} errors, {stats['retries']} retries")
+            print(f"   - Latency p50/p95/p99: {stats['latency_p50']:.2f}s / "
+                  f"{stats['latency_p95']:.2f}s / {stats['latency_p99']:.2f}s")
+            print(f"   - Throughput: {stats['tokens_per_second']:.0f} tokens/s")
+            print(f"   - Estimated cost: " + (f"${cost:.4f}" if cost is not None else "unknown pricing"))
+
+    def to_prometheus(self) -> str:
+        """
+        Render counters and a latency histogram in Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP llm_requests_total LLM extraction calls by model and status.",
+            "# TYPE llm_requests_total counter"
+        ]
+        requests: Dict[tuple, int] = {}
+        tokens: Dict[tuple, int] = {}
+        retries: Dict[str, int] = {}
+        for call in self.records:
+            status = "cache_hit" if call["cache_hit"] else ("success" if call["success"] else "error")
+            requests[(call["model"], status)] = requests.get((call["model"], status), 0) + 1
+            for kind in ("prompt", "completion", "cached"):
+                key = (call["model"], kind)
+                tokens[key] = tokens.get(key, 0) + call[f"{kind}_tokens"]
+            retries[call["model"]] = retries.get(call["model"], 0) + call["retries"]
+
+        for (model, status), value in sorted(requests.items()):
+            lines.append(f'llm_requests_total{{model="{model}",status="{status}"}} {value}')
+
+        lines += ["# HELP llm_tokens_total Tokens used by model and kind.", "# TYPE llm_tokens_total counter"]
+        for (model, kind), value in sorted(tokens.items()):
+            lines.append(f'llm_tokens_total{{model="{model}",kind="{kind}"}} {value}')
+
+        lines += ["# HELP llm_retries_total Retried LLM calls by model.", "# TYPE llm_retries_total counter"]
+        for model, value in sorted(retries.items()):
+            lines.append(f'llm_retries_total{{model="{model}"}} {value}')
+
+        lines += [
+            "# HELP llm_request_duration_seconds Wall time of LLM extraction calls.",
+            "# TYPE llm_request_duration_seconds histogram"
+        ]
+        for model in sorted({call["model"] for call in self.records}):
+            latencies = [c["wall_seconds"] for c in self.records if c["model"] == model and not c["cache_hit"]]
+            for bucket in self.latency_buckets:
+                count = sum(1 for value in latencies if value <= bucket)
+                lines.append(f'llm_request_duration_seconds_bucket{{model="{model}",le="{bucket}"}} {count}')
+            lines.append(f'llm_request_duration_seconds_bucket{{model="{model}",le="+Inf"}} {len(latencies)}')
+            lines.append(f'llm_request_duration_seconds_sum{{model="{model}"}} {sum(latencies)}')
+            lines.append(f'llm_request_duration_seconds_count{{model="{model}"}} {len(latencies)}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, filepath: str) -> None:
+        """Write the Prometheus text exposition to a file (e.g. for node_exporter's textfile collector)."""
+        if os.path.dirname(filepath):
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
@@ -0,0 +1,116 @@
+import hashlib
+import threading
+import warnings
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import tiktoken
+
+DEFAULT_ENCODING = "o200k_base"
+CHARS_PER_TOKEN = 4
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> "tiktoken.Encoding":
+    """
+    Return the tiktoken encoding of a model, loaded once per process.
+    Unknown model names fall back to DEFAULT_ENCODING. tiktoken is imported
+    here so that modules using the counter stay cheap to import.
+    """
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+def text_hash(text: str) -> str:
+    """Short content hash used to key memoised token counts."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+class TokenCounter:
+    """
+    Token counts for one model, with per-article counts memoised by
+    (article ID, text hash) so EDA, chunking, packing and cost estimates
+    encode each article once. The memo is an LRU of max_entries articles, so
+    streaming a large corpus through the counter keeps memory bounded. Batches are encoded with tiktoken's
+    multi-threaded encode_ordinary_batch.
+    When the encoding cannot be loaded (no network and no tiktoken cache),
+    counts fall back to an estimate of CHARS_PER_TOKEN characters per token.
+    """
+
+    def __init__(self, model: str = "gpt-4o-mini", num_threads: int = 8, max_entries: int = 4096):
+        self.model = model
+        self.num_threads = num_threads
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        try:
+            self.encoding: Optional["tiktoken.Encoding"] = get_encoding(model)
+        except Exception as e:
+            warnings.warn(f"tiktoken encoding for {model} unavailable ({type(e).__name__}); estimating {CHARS_PER_TOKEN} chars per token")
+            self.encoding = None
+
+    @property
+    def approximate(self) -> bool:
+        return self.encoding is None
+
+    def count(self, text: str) -> int:
+        """Token count of a single text."""
+        if self.encoding is None:
+            return -(-len(text) // CHARS_PER_TOKEN)
+        return len(self.encoding.encode_ordinary(text))
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        """Token counts of several texts, encoded across threads."""
+        if self.encoding is None:
+            return [self.count(text) for text in texts]
+        return [len(tokens) for tokens in self.encoding.encode_ordinary_batch(texts, num_threads=self.num_threads)]
+
+    def count_article(self, article: Dict) -> int:
+        """Memoised token count of an article's text."""
+        return self.count_articles([article])[0]
+
+    def count_articles(self, articles: Iterable[Dict], batch_size: int = 1024) -> List[int]:
+        """
+        Memoised token counts of article texts; only articles not seen before
+        (or whose text changed) are encoded, in batches of batch_size.
+        """
+        articles = articles if isinstance(articles, list) else list(articles)
+        keys = [(article["id"], text_hash(article["text"])) for article in articles]
+        counts: List[Optional[int]] = [None] * len(keys)
+        with self._lock:
+            for index, key in enumerate(keys):
+                if key in self._counts:
+                    self._counts.move_to_end(key)
+                    counts[index] = self._counts[key]
+        missing = [index for index, count in enumerate(counts) if count is None]
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            batch_counts = self.count_batch([articles[index]["text"] for index in batch])
+            with self._lock:
+                for index, count in zip(batch, batch_counts):
+                    counts[index] = count
+                    self._counts[keys[index]] = count
+                    self._counts.move_to_end(keys[index])
+                while len(self._counts) > self.max_entries:
+                    self._counts.popitem(last=False)
+        return counts
+
+    def clear(self) -> None:
+        """Drop memoised article counts."""
+        with self._lock:
+            self._counts.clear()
+
+_counters: Dict[str, TokenCounter] = {}
+_counters_lock = threading.Lock()
+
+def get_token_counter(model: str = "gpt-4o-mini") -> TokenCounter:
+    """
+    Return the process-wide TokenCounter of a model.
+    """
+    with _counters_lock:
+        if model not in _counters:
+            _counters[model] = TokenCounter(model)
+        return _counters[model]
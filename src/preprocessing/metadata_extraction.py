@@ -0,0 +1,132 @@
+import re
+from datetime import date
+from typing import Dict, Optional
+
+MONTHS = {
+    name: number
+    for number, names in enumerate((
+        ("january", "jan", "gennaio"), ("february", "feb", "febbraio"), ("march", "mar", "marzo"),
+        ("april", "apr", "aprile"), ("may", "maggio"), ("june", "jun", "giugno"),
+        ("july", "jul", "luglio"), ("august", "aug", "agosto"), ("september", "sep", "sept", "settembre"),
+        ("october", "oct", "ottobre"), ("november", "nov", "novembre"), ("december", "dec", "dicembre")
+    ), start=1)
+    for name in names
+}
+_MONTH = "(?P<{}>" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?"
+
+TITLE_PATTERN = re.compile(r'^\s*\*\*(?P<title>[^*\n]+)\*\*[ \t]*\n')
+HEADER_PATTERN = re.compile(r'^[ \t]*\*(?!\*)(?P<inner>[^*\n]+)\*(?P<rest>[^\n]*)(?:\n|$)', re.MULTILINE)
+DATE_PATTERN = re.compile(
+    r'(?:' + _MONTH.format("month") + r'\s+(?P<day>\d{1,2}),?\s+(?P<year>\d{4})'
+    r'|(?P<day2>\d{1,2})\s+' + _MONTH.format("month2") + r',?\s+(?P<year2>\d{4}))',
+    re.IGNORECASE
+)
+PLAIN_DATELINE_PATTERN = re.compile(
+    r'^[ \t]*(?P<place>[^\n*,—–]{1,60}),\s*(?P<date>' + DATE_PATTERN.pattern + r')\s*[—–-]\s*',
+    re.MULTILINE | re.IGNORECASE
+)
+SEPARATORS = " \t,|-–—:"
+MAX_AUTHOR_WORDS = 6
+BY_PATTERN = re.compile(r'^by\s+', re.IGNORECASE)
+HONORIFIC_PATTERN = re.compile(r'^(?:(?:sig|sig\.ra|sig\.na|dott|dott\.ssa|dr|prof|prof\.ssa|avv|ing|on)\.?\s+)+', re.IGNORECASE)
+
+def parse_date(text: str) -> Optional[str]:
+    """
+    Parse "Month DD, YYYY" or "DD Month YYYY" (English or Italian month names) into ISO format.
+    """
+    match = DATE_PATTERN.search(text)
+    if not match:
+        return None
+    month = MONTHS[(match.group("month") or match.group("month2")).lower()]
+    day = int(match.group("day") or match.group("day2"))
+    year = int(match.group("year") or match.group("year2"))
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+def extract_header(text: str) -> Dict:
+    """
+    Rule-based extraction of the leading **Title** line and the italic
+    byline ("*By Name | Month DD, YYYY*") or dateline ("*Place, Date* — ...").
+    Returns title, author, place and ISO date (None when absent) plus the
+    character span of the header markup, used to trim it from the prompt.
+    """
+    header = {"title": None, "author": None, "place": None, "date": None, "header_span": None}
+
+    position = 0
+    title = TITLE_PATTERN.match(text)
+    if title:
+        header["title"] = title.group("title").strip()
+        position = title.end()
+
+    line = HEADER_PATTERN.search(text, position)
+    if not line or text[position:line.start()].strip():
+        dateline = PLAIN_DATELINE_PATTERN.search(text, position)
+        if dateline and not text[position:dateline.start()].strip():
+            header["place"] = dateline.group("place").strip()
+            header["date"] = parse_date(dateline.group("date"))
+            header["header_span"] = (dateline.start(), dateline.end())
+        return header
+
+    inner = line.group("inner").strip()
+    date_match = DATE_PATTERN.search(inner)
+    if date_match:
+        header["date"] = parse_date(date_match.group(0))
+
+    if BY_PATTERN.match(inner):
+        author = inner[BY_PATTERN.match(inner).end():date_match.start() if date_match else None]
+        header["author"] = author.strip(SEPARATORS) or None
+    elif date_match:
+        header["place"] = inner[:date_match.start()].strip(SEPARATORS) or None
+        author = BY_PATTERN.sub("", inner[date_match.end():].strip(SEPARATORS)).strip(SEPARATORS)
+        if len(author.split()) > MAX_AUTHOR_WORDS:
+            # Article text inside the italics: keep it in the prompt
+            return header
+        header["author"] = author or None
+    else:
+        return header
+
+    # Keep any article text that follows the dateline on the same line
+    rest = line.group("rest")
+    end = line.end() if not rest.strip() else line.start("rest") + len(rest) - len(rest.lstrip(SEPARATORS))
+    header["header_span"] = (line.start(), end)
+    return header
+
+def trim_header(text: str, header: Dict) -> str:
+    """Remove the byline/dateline markup found by extract_header from the text."""
+    if not header.get("header_span"):
+        return text
+    start, end = header["header_span"]
+    return text[:start] + text[end:]
+
+def prepare_article(article: Dict, trim: bool = False) -> Dict:
+    """
+    Attach the rule-based header fields as article["pre_extraction"]; with trim=True
+    the byline is removed from the text sent to the LLM when a date was found.
+    """
+    header = extract_header(article["text"])
+    prepared = dict(article, pre_extraction={key: header[key] for key in ("title", "author", "place", "date")})
+    if trim and header["date"]:
+        prepared["text"] = trim_header(article["text"], header)
+    return prepared
+
+def _normalize_name(name: str) -> str:
+    return HONORIFIC_PATTERN.sub("", name.strip()).lower()
+
+def merge_pre_extraction(extraction: Dict, pre_extraction: Dict) -> Dict:
+    """
+    Merge rule-based fields into an ArticleExtraction dict: the byline date
+    replaces the LLM date, title and author are added, and the byline author
+    is dropped from people (journalists are not article entities).
+    """
+    merged = dict(extraction)
+    if pre_extraction.get("date"):
+        merged["date"] = pre_extraction["date"]
+    merged["title"] = pre_extraction.get("title")
+    merged["author"] = pre_extraction.get("author")
+
+    if pre_extraction.get("author"):
+        author = _normalize_name(pre_extraction["author"])
+        merged["people"] = [person for person in extraction["people"] if _normalize_name(person["name"]) != author]
+    return merged
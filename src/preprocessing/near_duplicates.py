@@ -0,0 +1,322 @@
+"""MinHash/LSH detection of near-duplicate articles."""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+import numpy as np
+
+from src.preprocessing.metadata_extraction import extract_header, merge_pre_extraction
+
+WORD_PATTERN = re.compile(r'\w+')
+GRAM_MULTIPLIERS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93], dtype=np.uint64)
+SHIFT = np.uint64(32)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    doc_rowid INTEGER PRIMARY KEY,
+    article_id TEXT NOT NULL UNIQUE,
+    signature BLOB NOT NULL,
+    result TEXT
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    doc_rowid INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket, doc_rowid)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS duplicates (
+    article_id TEXT PRIMARY KEY,
+    original_id TEXT NOT NULL,
+    similarity REAL NOT NULL
+);
+"""
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Bands and rows per band whose S-curve midpoint (1/b)^(1/r) is the
+    closest to threshold from below, so borderline pairs still collide.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        midpoint = (1 / bands) ** (1 / rows)
+        if midpoint <= threshold and (best is None or midpoint > best[0]):
+            best = (midpoint, bands, rows)
+    return (best[1], best[2]) if best else (num_perm, 1)
+
+def shingles(text: str, size: int = 3) -> np.ndarray:
+    """
+    Distinct 64-bit hashes of the lowercase word size-grams of text, combined
+    from per-word CRC32 hashes with NumPy (size is at most 4).
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return np.zeros(1, dtype=np.uint64)
+    hashes = np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint64, count=len(words))
+    n_grams = max(len(words) - size + 1, 1)
+    grams = np.zeros(n_grams, dtype=np.uint64)
+    for offset in range(min(size, len(words))):
+        # uint64 arithmetic wraps around, which is what the hash wants
+        grams += hashes[offset:offset + n_grams] * GRAM_MULTIPLIERS[offset]
+    return np.unique(grams)
+
+class MinHasher:
+    """
+    MinHash signatures from multiply-shift hashes ((a * x + b) mod 2^64) >> 32;
+    the same seed and num_perm always give the same permutations.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        if not 1 <= shingle_size <= len(GRAM_MULTIPLIERS):
+            raise ValueError(f"shingle_size must be between 1 and {len(GRAM_MULTIPLIERS)}")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = generator.randint(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = shingles(text, self.shingle_size)
+        permuted = (np.multiply.outer(hashes, self._a) + self._b) >> SHIFT
+        return permuted.min(axis=0).astype(np.uint32)
+
+def _bucket(band: np.ndarray) -> int:
+    return int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little", signed=True)
+
+class NearDuplicateIndex:
+    """
+    Persistent SQLite MinHash/LSH index. num_perm, shingle_size, seed and
+    the band layout are fixed when the index is created; threshold is the
+    signature agreement needed to accept a candidate and can be changed
+    between runs.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/index/near_duplicates.sqlite",
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        shingle_size: int = 3,
+        seed: int = 1,
+        commit_every: int = 1000
+    ):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.threshold = threshold
+        self.commit_every = commit_every
+        self.calls_avoided = 0
+        self._pending_writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        bands, rows = lsh_bands(threshold, num_perm)
+        requested = {"num_perm": num_perm, "shingle_size": shingle_size, "seed": seed, "bands": bands, "rows": rows}
+        stored = {key: int(value) for key, value in self._conn.execute("SELECT key, value FROM settings")}
+        if not stored:
+            self._conn.executemany("INSERT INTO settings(key, value) VALUES (?, ?)", ((key, str(value)) for key, value in requested.items()))
+            stored = requested
+        elif {key: stored[key] for key in ("num_perm", "shingle_size", "seed")} != {key: requested[key] for key in ("num_perm", "shingle_size", "seed")}:
+            raise ValueError(f"{path} was built with num_perm/shingle_size/seed {stored}, not {requested}")
+        self._conn.commit()
+
+        self.bands, self.rows = stored["bands"], stored["rows"]
+        self.hasher = MinHasher(stored["num_perm"], stored["shingle_size"], stored["seed"])
+
+    def close(self) -> None:
+        self.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "NearDuplicateIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._pending_writes = 0
+
+    def _wrote(self) -> None:
+        self._pending_writes += 1
+        if self._pending_writes >= self.commit_every:
+            self._conn.commit()
+            self._pending_writes = 0
+
+    def _band_keys(self, signature: np.ndarray) -> list:
+        return [
+            (band, _bucket(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def _best_match(self, signature: np.ndarray, keys: list) -> Optional[Tuple[str, float]]:
+        # An OR of (band, bucket) terms is answered with one primary-key search per band;
+        # a row-value IN (VALUES ...) would scan the buckets table
+        conditions = " OR ".join("(b.band = ? AND b.bucket = ?)" for _ in keys)
+        candidates = self._conn.execute(
+            f"SELECT DISTINCT d.article_id, d.signature FROM buckets b JOIN documents d USING (doc_rowid) WHERE {conditions}",
+            [value for key in keys for value in key]
+        ).fetchall()
+        best = None
+        for article_id, blob in candidates:
+            similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint32) == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (article_id, similarity)
+        return best
+
+    def route(self, article: Dict) -> Optional[Tuple[str, float]]:
+        """
+        (original_id, similarity) when the article is a near-duplicate of an
+        indexed one, else None after indexing it as an original. Articles
+        seen in earlier runs keep their previous routing.
+        """
+        with self._lock:
+            known = self._conn.execute(
+                "SELECT original_id, similarity FROM duplicates WHERE article_id = ?", (article["id"],)
+            ).fetchone()
+            if known is not None:
+                return known[0], known[1]
+            if self._conn.execute("SELECT 1 FROM documents WHERE article_id = ?", (article["id"],)).fetchone():
+                return None
+
+            signature = self.hasher.signature(article["text"])
+            keys = self._band_keys(signature)
+            match = self._best_match(signature, keys)
+            if match is not None:
+                self._conn.execute(
+                    "INSERT INTO duplicates(article_id, original_id, similarity) VALUES (?, ?, ?)",
+                    (article["id"], match[0], match[1])
+                )
+            else:
+                doc_rowid = self._conn.execute(
+                    "INSERT INTO documents(article_id, signature) VALUES (?, ?)", (article["id"], signature.tobytes())
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO buckets(band, bucket, doc_rowid) VALUES (?, ?, ?)",
+                    ((band, bucket, doc_rowid) for band, bucket in keys)
+                )
+            self._wrote()
+            return match
+
+    def route_articles(self, articles: Iterable[Dict]) -> Iterator[Tuple[Dict, Optional[Tuple[str, float]]]]:
+        """Stream (article, match) pairs; see route."""
+        for article in articles:
+            yield article, self.route(article)
+        self.commit()
+
+    def store_result(self, result: Dict) -> None:
+        """Keep the successful extraction of an original for its duplicates."""
+        if not result["success"] or not result["extraction"]:
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE documents SET result = ? WHERE article_id = ?",
+                (json.dumps(result, ensure_ascii=False), result["article_id"])
+            )
+            self._wrote()
+
+    def get_result(self, article_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM documents WHERE article_id = ?", (article_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            documents, with_results = self._conn.execute("SELECT COUNT(*), COUNT(result) FROM documents").fetchone()
+            duplicates = self._conn.execute("SELECT COUNT(*) FROM duplicates").fetchone()[0]
+        return {
+            "originals": documents,
+            "originals_with_results": with_results,
+            "duplicates": duplicates,
+            "bands": self.bands,
+            "rows": self.rows,
+            "threshold": self.threshold,
+            "calls_avoided": self.calls_avoided
+        }
+
+def _mentioned(name: str, text_words: Set[str]) -> bool:
+    words = WORD_PATTERN.findall(name.lower())
+    return not words or words[-1] in text_words
+
+def reuse_extraction(article: Dict, original: Dict, similarity: float) -> Dict:
+    """
+    Result for a near-duplicate built from its original's result: people
+    whose surname does not occur in the duplicate are dropped, and the
+    date comes from the duplicate's own byline or dateline when it has one
+    (and its pre_extraction fields, when present, are merged as usual).
+    """
+    text_words = set(WORD_PATTERN.findall(article["text"].lower()))
+    extraction = dict(original["extraction"])
+    extraction["people"] = [person for person in extraction["people"] if _mentioned(person["name"], text_words)]
+    header_date = extract_header(article["text"])["date"]
+    if header_date:
+        extraction["date"] = header_date
+    if article.get("pre_extraction"):
+        extraction = merge_pre_extraction(extraction, article["pre_extraction"])
+    return {
+        "article_id": article["id"],
+        "extraction": extraction,
+        "success": True,
+        "error": None,
+        "metadata": {
+            "model": original.get("metadata", {}).get("model"),
+            "tokens_used": 0,
+            "duplicate_of": original["article_id"],
+            "duplicate_similarity": round(similarity, 4)
+        }
+    }
+
+def find_near_duplicates(
+    articles_filepath: str,
+    index_path: str = "data/index/near_duplicates.sqlite",
+    threshold: float = 0.85,
+    pairs_filepath: Optional[str] = None
+) -> Dict:
+    """
+    Fingerprint an articles file (JSON array or JSONL) in one streaming
+    pass, optionally writing each duplicate as a JSONL line
+    {article_id, original_id, similarity}, and report the counts.
+    """
+    from src.io.load_data import iter_articles
+
+    start = time.perf_counter()
+    articles = duplicates = 0
+    pairs_file = open(pairs_filepath, 'w', encoding='utf-8') if pairs_filepath else None
+    try:
+        with NearDuplicateIndex(index_path, threshold=threshold) as index:
+            for article, match in index.route_articles(iter_articles(articles_filepath)):
+                articles += 1
+                if match is None:
+                    continue
+                duplicates += 1
+                if pairs_file is not None:
+                    pairs_file.write(json.dumps({"article_id": article["id"], "original_id": match[0], "similarity": round(match[1], 4)}) + "\n")
+            stats = index.stats()
+    finally:
+        if pairs_file is not None:
+            pairs_file.close()
+    seconds = time.perf_counter() - start
+    return {
+        "articles": articles,
+        "duplicates": duplicates,
+        "llm_calls_avoidable": duplicates,
+        "duplicate_ratio": round(duplicates / articles, 4) if articles else 0.0,
+        "seconds": round(seconds, 3),
+        "articles_per_second": round(articles / seconds) if seconds else None,
+        "index": stats
+    }
@@ -1,50 +1,177 @@
-
 import json
 import re
 import os
-from typing import List, Dict, Any
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 from pathlib import Path
 
+from src.io.load_data import iter_articles
+from src.preprocessing.metadata_extraction import extract_header
+from src.utils.progress import ProgressReporter
+
+BOLD_PATTERN = re.compile(r'\*\*(.*?)\*\*')
+ITALIC_PATTERN = re.compile(r'\*(.*?)\*')
+INLINE_SPACE_PATTERN = re.compile(r'[ \t ]+')
+BLANK_LINES_PATTERN = re.compile(r'\n\s*\n+')
+
+Transform = Callable[[Dict], Dict]
+
+def strip_markdown(record: Dict) -> Dict:
+    """Remove bold/italic markdown markers from the text."""
+    text = BOLD_PATTERN.sub(r'\1', record["text"])
+    record["text"] = ITALIC_PATTERN.sub(r'\1', text).strip()
+    return record
+
+def normalize_whitespace(record: Dict) -> Dict:
+    """Collapse runs of spaces and blank lines."""
+    text = INLINE_SPACE_PATTERN.sub(' ', record["text"])
+    record["text"] = BLANK_LINES_PATTERN.sub('\n\n', text).strip()
+    return record
+
+def extract_byline(record: Dict) -> Dict:
+    """
+    Add title, author, place and ISO date from the article header
+    (see metadata_extraction). Must run before strip_markdown.
+    """
+    header = extract_header(record["text"])
+    record.update((key, header[key]) for key in ("title", "author", "place", "date") if header[key])
+    return record
+
+TRANSFORMS: Dict[str, Transform] = {
+    "extract_byline": extract_byline,
+    "strip_markdown": strip_markdown,
+    "normalize_whitespace": normalize_whitespace
+}
+
+DEFAULT_TRANSFORMS = ("strip_markdown",)
+
+# Transforms that read markup removed by others, and the transforms they must precede
+TRANSFORM_ORDER: Dict[Transform, Sequence[Transform]] = {
+    extract_byline: (strip_markdown,)
+}
+
+def resolve_transforms(transforms: Sequence[Union[str, Transform]]) -> List[Transform]:
+    """
+    Map transform names to functions; callables are passed through
+    (they must be module-level functions to run in worker processes).
+    Raises ValueError when a transform runs after one that removes the
+    markup it reads (see TRANSFORM_ORDER).
+    """
+    resolved = []
+    for transform in transforms:
+        if isinstance(transform, str):
+            if transform not in TRANSFORMS:
+                raise ValueError(f"Unknown transform '{transform}', expected one of {sorted(TRANSFORMS)}")
+            transform = TRANSFORMS[transform]
+        resolved.append(transform)
+    for index, transform in enumerate(resolved):
+        for later in TRANSFORM_ORDER.get(transform, ()):
+            if later in resolved[:index]:
+                raise ValueError(f"Transform '{transform.__name__}' must run before '{later.__name__}'")
+    return resolved
+
 def preprocess_article(text: str) -> str:
     """
     Apply minimal preprocessing to article text.
     """
-    # Remove markdown formatting
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    text = re.sub(r'\*(.*?)\*', r'\1', text)
-    
-    return text.strip()
+    return strip_markdown({"text": text})["text"]
+
+def preprocess_records(records: List[Dict], transforms: Sequence[Union[str, Transform]] = DEFAULT_TRANSFORMS) -> List[Dict]:
+    """
+    Run the transform chain over a chunk of {"id", "text"} records.
+    """
+    chain = resolve_transforms(transforms)
+    processed = []
+    for record in records:
+        record = {"id": record["id"], "text": record["text"]}
+        for transform in chain:
+            record = transform(record)
+        processed.append(record)
+    return processed
+
+def _chunks(records: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_preprocessed(
+    records: Iterable[Dict],
+    transforms: Sequence[Union[str, Transform]] = DEFAULT_TRANSFORMS,
+    workers: int = 1,
+    chunk_size: int = 256
+) -> Iterator[Dict]:
+    """
+    Preprocess a stream of records, fanning chunks out to a process pool.
+    Results are yielded in input order, with at most 2 * workers chunks in flight.
+    """
+    resolve_transforms(transforms)
+    chunks = _chunks(records, chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from preprocess_records(chunk, transforms)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(preprocess_records, chunk, transforms))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
 
 def preprocess_articles_dataset(
-    input_filepath: str, 
-    output_dir: str = "data/preprocessed"
+    input_filepath: str,
+    output_dir: str = "data/preprocessed",
+    transforms: Sequence[Union[str, Transform]] = DEFAULT_TRANSFORMS,
+    workers: int = 1,
+    chunk_size: int = 256,
+    output_filepath: Optional[str] = None,
+    progress_interval: Optional[float] = None
 ) -> str:
     """
-    Apply preprocessing to all articles and save to new JSON file.
-    """
-    os.makedirs(output_dir, exist_ok=True)
-    
-    with open(input_filepath, 'r', encoding='utf-8') as f:
-        articles = json.load(f)
-    
-    print(f"Loaded {len(articles)} articles from {input_filepath}")
-    
-    # Apply preprocessing
-    preprocessed_articles = []
-    for article in articles:
-        preprocessed_article = {
-            "id": article["id"],
-            "text": preprocess_article(article["text"])
-        }
-        preprocessed_articles.append(preprocessed_article)
-    
-    input_filename = Path(input_filepath).stem
-    output_filepath = os.path.join(output_dir, f"{input_filename}_preprocessed.json")
-    
-    # Save preprocessed articles
+    Apply preprocessing to all articles and stream them to the output file:
+    a JSON array when its suffix is .json, JSONL otherwise.
+    An output_dir ending in .json/.jsonl is treated as the output file path.
+    With progress_interval, throughput is printed every progress_interval seconds.
+    """
+    # Validate the chain before creating the output file
+    resolve_transforms(transforms)
+    if output_filepath is None and Path(output_dir).suffix in (".json", ".jsonl"):
+        output_filepath = output_dir
+    if output_filepath is None:
+        input_filename = Path(input_filepath).stem
+        output_filepath = os.path.join(output_dir, f"{input_filename}_preprocessed.jsonl")
+    if os.path.dirname(output_filepath):
+        os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
+    json_array = Path(output_filepath).suffix == ".json"
+
+    processed_count = 0
+    progress = ProgressReporter(interval=progress_interval) if progress_interval is not None else None
     with open(output_filepath, 'w', encoding='utf-8') as f:
-        json.dump(preprocessed_articles, f, indent=2, ensure_ascii=False)
-    
-    print(f"Total articles processed: {len(preprocessed_articles)}")
-    
-    return output_filepath
\ No newline at end of file
+        records = iter_preprocessed(iter_articles(input_filepath), transforms, workers, chunk_size)
+        if json_array:
+            f.write("[")
+        for record in records:
+            if json_array:
+                f.write(",\n" if processed_count else "\n")
+                f.write(json.dumps(record, indent=2, ensure_ascii=False))
+            else:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            processed_count += 1
+            if progress is not None:
+                progress.update()
+        if json_array:
+            f.write("\n]\n")
+    if progress is not None:
+        progress.close()
+
+    print(f"Total articles processed: {processed_count}")
+
+    return output_filepath
@@ -0,0 +1,65 @@
+import sys
+import time
+from typing import Optional, TextIO
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "n/a"
+    hours, remainder = divmod(int(round(seconds)), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+class ProgressReporter:
+    """
+    Prints completed/total, throughput and ETA of a long-running loop.
+    Lines are rate-limited to one every interval seconds, plus a final line
+    on close(); with an unknown total only the count and rate are shown.
+    """
+
+    def __init__(
+        self,
+        total: Optional[int] = None,
+        label: str = "articles",
+        interval: float = 2.0,
+        stream: Optional[TextIO] = None
+    ):
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.completed = 0
+        self.start = time.perf_counter()
+        self._last_report = self.start
+        self._reported_completed = -1
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.start
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.rate()
+        if self.total is None or rate <= 0:
+            return None
+        return max(self.total - self.completed, 0) / rate
+
+    def format_line(self) -> str:
+        elapsed = format_duration(time.perf_counter() - self.start)
+        if self.total is None:
+            return f"{self.completed} {self.label} ({self.rate():.1f}/s, elapsed {elapsed})"
+        percent = self.completed / self.total if self.total else 1.0
+        return (f"{self.completed}/{self.total} {self.label} ({percent:.0%}, {self.rate():.1f}/s, "
+                f"elapsed {elapsed}, ETA {format_duration(self.eta_seconds())})")
+
+    def report(self) -> None:
+        self._last_report = time.perf_counter()
+        self._reported_completed = self.completed
+        print(self.format_line(), file=self.stream, flush=True)
+
+    def update(self, n: int = 1) -> None:
+        self.completed += n
+        if time.perf_counter() - self._last_report >= self.interval:
+            self.report()
+
+    def close(self) -> None:
+        if self._reported_completed != self.completed:
+            self.report()
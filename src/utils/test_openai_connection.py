@@ -1,11 +1,10 @@
-from openai import OpenAI
-import os
-from dotenv import load_dotenv
+from src.llm.client_factory import build_client
 
-load_dotenv()
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+# Makes a live API call: keep pytest from collecting test_openai_connection
+__test__ = False
 
-def test_openai_connection():
+def test_openai_connection(client=None):
+    client = client or build_client()
     try:
         response = client.chat.completions.create(
             model="gpt-4o-mini",
@@ -21,4 +20,5 @@ def test_openai_connection():
         print("Errore:", e)
         return False
 
-test_openai_connection()
\ No newline at end of file
+if __name__ == "__main__":
+    test_openai_connection()
@@ -1,9 +1,13 @@
 import json
-from typing import List, Dict, Set
-from src.io.load_data import load_articles_json, load_ground_truth_json
-from src.llm.openai_client import extract_article_information
+import os
+from typing import List, Dict, Set, Optional, Iterable, Iterator
+from src.io.load_data import iter_articles, iter_ground_truth
+from src.llm.openai_client import process_single_article
+from src.validation.checkpoint import CheckpointJournal
+from src.analysis.run_report import prompt_cache_report
+from src.utils.progress import ProgressReporter
 
-def extract_ground_truth_uuids(ground_truth_data: List[Dict]) -> Set[str]:
+def extract_ground_truth_uuids(ground_truth_data: Iterable[Dict]) -> Set[str]:
     """
     Extract all UUIDs from ground truth data.
     """
@@ -12,7 +16,7 @@ def extract_ground_truth_uuids(ground_truth_data: List[Dict]) -> Set[str]:
     return uuids
 
 def match_articles_with_ground_truth(
-    articles: List[Dict], 
+    articles: Iterable[Dict], 
     ground_truth_uuids: Set[str]
 ) -> List[Dict]:
     """
@@ -33,51 +37,250 @@ def match_articles_with_ground_truth(
 
 def process_ground_truth_articles(
     articles_filepath: str,
-    ground_truth_filepath: str,
+    ground_truth_filepath: Optional[str],
     model: str = "gpt-4o-mini",
-    batch_size: int = 10
+    batch_size: int = 10,
+    max_concurrency: int = 1,
+    requests_per_minute: int = 500,
+    tokens_per_minute: int = 200_000,
+    client=None,
+    cache=None,
+    refresh_cache: bool = False,
+    use_batch_api: bool = False,
+    batch_poll_interval: float = 30.0,
+    checkpoint_path: Optional[str] = "data/output/extraction_checkpoint.jsonl",
+    resume: bool = True,
+    pack_token_budget: Optional[int] = None,
+    prompt_layout: str = "default",
+    telemetry=None,
+    resilience=None,
+    pre_extract: bool = False,
+    trim_byline: bool = False,
+    topic_classifier=None,
+    topic_confidence_threshold: float = 0.7,
+    chunk_tokens: Optional[int] = None,
+    progress_interval: Optional[float] = 2.0,
+    dedup_index=None
 ) -> List[Dict]:
     """
-    Process only articles that have ground truth annotations.
+    Process only articles that have ground truth annotations
+    (every article when ground_truth_filepath is None, streamed from disk
+    so article texts are held only while in flight; the returned results
+    for every article are still kept in memory, so for corpora too large
+    for that, read the checkpoint journal with compact_checkpoint instead).
+    With max_concurrency > 1 the async engine is used instead of the sequential loop,
+    and use_batch_api submits the articles as OpenAI Batch API jobs (split at the
+    per-file limits); submitted batch IDs are checkpointed so a restart resumes polling.
+    pack_token_budget packs several articles per request under that prompt token budget.
+    Pass a ResponseCache to reuse results of unchanged requests across runs.
+    prompt_layout "cache_friendly" places the article text last to benefit from prompt caching.
+    A Telemetry instance records per-call latency and tokens and prints a run summary.
+    resilience overrides the shared retry/circuit-breaker layer.
+    pre_extract takes title, byline author and date from the article header with rules
+    and merges them into each extraction; trim_byline also removes the byline from the prompt.
+    With a TopicClassifier, articles classified with confidence >= topic_confidence_threshold
+    keep the local topic/subtopic and only ask the model for people and date.
+    Articles longer than chunk_tokens are extracted in overlapping paragraph chunks
+    and merged (sequential and concurrent modes).
+    Results are appended to a checkpoint journal (fsynced every batch_size articles);
+    with resume=True, articles that already succeeded are skipped and failures retried.
+    Progress with throughput and ETA is printed every progress_interval seconds (None disables it).
+    With a NearDuplicateIndex, near-duplicates of articles already extracted (in this or
+    an earlier run) reuse the original's extraction instead of calling the model.
     """
     print("Starting Ground Truth Article Processing")    
     print("Loading datasets...")
-    articles = load_articles_json(articles_filepath)
-    ground_truth = load_ground_truth_json(ground_truth_filepath)
     
-    # Extract UUIDs from ground truth
-    gt_uuids = extract_ground_truth_uuids(ground_truth)
-    
-    # Match articles with ground truth
-    matched_articles = match_articles_with_ground_truth(articles, gt_uuids)
+    if ground_truth_filepath is None:
+        # The full corpus is streamed twice (IDs first, then texts) instead of held in memory
+        def load_articles() -> Iterator[Dict]:
+            return iter_articles(articles_filepath)
+        
+        article_ids = [article["id"] for article in load_articles()]
+        print(f"Loaded {len(article_ids)} articles")
+    else:
+        # Extract UUIDs from ground truth
+        gt_uuids = extract_ground_truth_uuids(iter_ground_truth(ground_truth_filepath))
+        
+        # Stream articles and keep only those with ground truth
+        matched_articles = match_articles_with_ground_truth(iter_articles(articles_filepath), gt_uuids)
+        
+        def load_articles() -> Iterator[Dict]:
+            return iter(matched_articles)
+        
+        article_ids = [article["id"] for article in matched_articles]
     
-    if not matched_articles:
+    if not article_ids:
         print("No articles matched with ground truth!")
         return []
     
-    # Process matched articles
-    print(f"\nProcessing {len(matched_articles)} articles...")
-    results = []
+    journal = CheckpointJournal(checkpoint_path, fsync_every=batch_size) if checkpoint_path else None
+    # Submitted Batch API job IDs live next to the journal so a restart polls them instead of resubmitting
+    batch_state_path = checkpoint_path + ".batches.json" if checkpoint_path and use_batch_api else None
+    previous_results = {}
     
-    for i, article in enumerate(matched_articles):
-        print(f"Processing {i+1}/{len(matched_articles)} - ID: {article['id'][:8]}...")
-        
-        extraction_result = extract_article_information(article["text"], model)
-        
-        result = {
-            "article_id": article["id"],
-            "extraction": extraction_result["data"] if extraction_result["success"] else None,
-            "success": extraction_result["success"],
-            "error": extraction_result.get("error"),
-            "metadata": extraction_result["metadata"]
-        }
+    if journal is not None:
+        if resume:
+            previous_results = {
+                article_id: result for article_id, result in journal.load().items() if result["success"]
+            }
+        else:
+            journal.reset()
+            if batch_state_path and os.path.exists(batch_state_path):
+                os.remove(batch_state_path)
+    
+    pending_count = sum(1 for article_id in article_ids if article_id not in previous_results)
+    if previous_results:
+        print(f"Resuming from checkpoint: {len(article_ids) - pending_count} articles already processed")
+    
+    if pre_extract:
+        from src.preprocessing.metadata_extraction import prepare_article
+    if topic_classifier is not None:
+        from src.classification.topic_classifier import route_article
+    
+    local_topics = 0
+    
+    def iter_pending() -> Iterator[Dict]:
+        nonlocal local_topics
+        for article in load_articles():
+            if article["id"] in previous_results:
+                continue
+            if pre_extract:
+                article = prepare_article(article, trim=trim_byline)
+            if topic_classifier is not None:
+                article = route_article(article, topic_classifier, topic_confidence_threshold)
+                local_topics += article["topic_prediction"]["route"] == "local"
+            yield article
+    
+    if telemetry is not None:
+        # Time-to-first-byte is measured with an httpx hook on the client(s) in use
+        telemetry.instrument(client)
+    
+    progress = ProgressReporter(pending_count, interval=progress_interval) if progress_interval is not None else None
+    
+    def record_result(result: Dict) -> None:
+        if journal is not None:
+            journal.append(result)
+        if dedup_index is not None:
+            dedup_index.store_result(result)
+        if progress is not None:
+            progress.update()
+    
+    duplicates = []
+    
+    def iter_originals(articles: Iterable[Dict]) -> Iterator[Dict]:
+        # Near-duplicates are set aside while the stream is routed through the index
+        for article, match in dedup_index.route_articles(articles):
+            if match is None:
+                yield article
+            else:
+                duplicates.append((article, *match))
+    
+    pending_articles = iter_pending()
+    if dedup_index is not None:
+        pending_articles = iter_originals(pending_articles)
+    
+    def extract(articles: Iterable[Dict], total: Optional[int]) -> List[Dict]:
+        if use_batch_api or pack_token_budget:
+            # Both modes need the whole input up front
+            articles = list(articles)
+            if not articles:
+                return []
+        if use_batch_api:
+            from src.llm.batch_api import run_batch_extraction
+            
+            return run_batch_extraction(
+                articles,
+                model=model,
+                client=client,
+                poll_interval=batch_poll_interval,
+                prompt_layout=prompt_layout,
+                state_path=batch_state_path,
+                on_result=record_result
+            )
+        if pack_token_budget:
+            from src.llm.packing import process_articles_packed
+            
+            return process_articles_packed(
+                articles,
+                model=model,
+                token_budget=pack_token_budget,
+                client=client,
+                on_result=record_result,
+                cache=cache,
+                refresh_cache=refresh_cache,
+                prompt_layout=prompt_layout,
+                telemetry=telemetry,
+                resilience=resilience
+            )
+        if max_concurrency > 1:
+            from src.llm.async_client import run_concurrent_extraction
+            
+            return run_concurrent_extraction(
+                articles,
+                model=model,
+                max_concurrency=max_concurrency,
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+                client=client,
+                cache=cache,
+                refresh_cache=refresh_cache,
+                on_result=record_result,
+                prompt_layout=prompt_layout,
+                telemetry=telemetry,
+                resilience=resilience,
+                chunk_tokens=chunk_tokens,
+                progress_every=0 if progress is not None else 10
+            )
+        results = []
         
-        results.append(result)
+        for i, article in enumerate(articles):
+            if progress is None:
+                print(f"Processing {i+1}/{total if total is not None else '?'} - ID: {article['id'][:8]}...")
+            
+            result = process_single_article(
+                article, model, cache=cache, refresh_cache=refresh_cache,
+                client=client, prompt_layout=prompt_layout, telemetry=telemetry,
+                resilience=resilience, chunk_tokens=chunk_tokens
+            )
+            
+            results.append(result)
+            record_result(result)
+        return results
+    
+    # Process matched articles
+    print(f"\nProcessing {pending_count} articles...")
+    
+    try:
+        new_results = extract(pending_articles, None if dedup_index is not None else pending_count)
         
-        # Save intermediate results every batch_size articles
-        if (i + 1) % batch_size == 0:
-            save_intermediate_results(results, f"intermediate_results_batch_{i+1}.json")
-            print(f"Saved intermediate results (batch {i+1})")
+        if duplicates:
+            # Near-duplicates reuse their original's extraction; those whose original failed are extracted
+            from src.preprocessing.near_duplicates import reuse_extraction
+            
+            fallback = []
+            for article, original_id, similarity in duplicates:
+                original = dedup_index.get_result(original_id)
+                if original is None:
+                    fallback.append(article)
+                    continue
+                result = reuse_extraction(article, original, similarity)
+                dedup_index.calls_avoided += 1
+                new_results.append(result)
+                record_result(result)
+            new_results.extend(extract(fallback, len(fallback)))
+    finally:
+        if journal is not None:
+            journal.close()
+        if dedup_index is not None:
+            dedup_index.commit()
+        if progress is not None:
+            progress.close()
+    
+    # Merge checkpointed and new results in article order
+    results_by_id = dict(previous_results)
+    results_by_id.update((result["article_id"], result) for result in new_results)
+    results = [results_by_id[article_id] for article_id in article_ids]
     
     # Summary
     successful = sum(1 for r in results if r["success"])
@@ -87,23 +290,55 @@ def process_ground_truth_articles(
     print(f"   - Successful: {successful}/{len(results)}")
     print(f"   - Failed: {failed}/{len(results)}")
     
+    if topic_classifier is not None:
+        print(f"   - Topic routing: {local_topics}/{pending_count} articles classified locally "
+              f"(threshold {topic_confidence_threshold})")
+    
+    if dedup_index is not None:
+        print(f"   - Near-duplicates: {len(duplicates)} of {pending_count} pending articles")
+        print(f"   - Near-duplicates reused: {dedup_index.calls_avoided} (LLM calls avoided), "
+              f"{len(duplicates) - dedup_index.calls_avoided} re-extracted")
+    
+    if cache is not None:
+        cache_stats = cache.stats()
+        print(f"   - Cache hits: {cache_stats['hits']} (misses: {cache_stats['misses']})")
+    
+    cache_report = prompt_cache_report(new_results)
+    if cache_report["requests"]:
+        print(f"   - Prompt cache: {cache_report['cached_tokens']}/{cache_report['prompt_tokens']} prompt tokens cached "
+              f"({cache_report['cached_token_ratio']:.1%}), avg latency {cache_report['avg_latency_seconds']:.2f}s")
+    
+    if telemetry is not None:
+        telemetry.print_summary()
+    
     return results
 
-def save_intermediate_results(results: List[Dict], filename: str) -> None:
-    """
-    Save intermediate processing results.
-    """
-    with open(f"data/output/{filename}", 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
-
-def save_final_results(results: List[Dict], output_filepath: str = "data/output/extraction_results.json") -> None:
+def save_final_results(
+    results: List[Dict],
+    output_filepath: str = "data/output/extraction_results.json",
+    output_format: str = "json"
+) -> None:
     """
-    Save final extraction results to JSON file.
+    Save final extraction results to a JSON file, one result per line with output_format="jsonl",
+    or as a columnar results store (src.io.results_store) with output_format="columnar".
     """
-    import os
-    os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
+    if output_format == "columnar":
+        from src.io.results_store import write_results_store
+        
+        write_results_store(results, output_filepath)
+        print(f"Final results saved to: {output_filepath}")
+        return
+    
+    if os.path.dirname(output_filepath):
+        os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
     
     with open(output_filepath, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+        if output_format == "jsonl":
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        elif output_format == "json":
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        else:
+            raise ValueError(f"Unknown output format: {output_format}")
     
     print(f"Final results saved to: {output_filepath}")
\ No newline at end of file
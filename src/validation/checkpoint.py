@@ -0,0 +1,132 @@
+import json
+import os
+from typing import List, Dict, Set, Optional
+
+class CheckpointJournal:
+    """
+    Append-only JSONL journal of per-article results.
+    Later records for the same article_id supersede earlier ones.
+    """
+
+    def __init__(self, path: str = "data/output/extraction_checkpoint.jsonl", fsync_every: int = 10):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self._pending_sync = 0
+        self._file = None
+
+    def load(self) -> Dict[str, Dict]:
+        """Return the latest journaled result for each article_id."""
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line from a crash mid-write
+                    continue
+                records[record["article_id"]] = record
+
+        return records
+
+    def completed_ids(self) -> Set[str]:
+        """Return article IDs whose latest journaled result succeeded."""
+        return {article_id for article_id, record in self.load().items() if record["success"]}
+
+    def append(self, result: Dict) -> None:
+        """Append one result; the file is fsynced every fsync_every records."""
+        if self._file is None:
+            self._truncate_torn_tail()
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+        self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._pending_sync += 1
+        if self._pending_sync >= self.fsync_every:
+            self.flush()
+
+    def _truncate_torn_tail(self) -> None:
+        """Drop a partial last line left by a crash, so the next record starts on its own line."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            # Scan backwards for the end of the last complete line
+            position = size
+            while position > 0:
+                step = min(65536, position)
+                f.seek(position - step)
+                newline = f.read(step).rfind(b"\n")
+                if newline != -1:
+                    position = position - step + newline + 1
+                    break
+                position -= step
+            f.truncate(position)
+
+    def flush(self) -> None:
+        """Flush buffered records and fsync them to disk."""
+        if self._file is not None and self._pending_sync:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending_sync = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def reset(self) -> None:
+        """Discard all journaled results."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def compact(self, output_filepath: Optional[str] = None, article_order: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Rewrite the journal with only the latest record per article and
+        optionally save them as a final results JSON file.
+        """
+        self.close()
+        records = self.load()
+
+        if article_order is not None:
+            results = [records[article_id] for article_id in article_order if article_id in records]
+        else:
+            results = list(records.values())
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        if output_filepath is not None:
+            from src.validation.batch_processing import save_final_results
+
+            save_final_results(results, output_filepath)
+
+        return results
+
+def compact_checkpoint(
+    checkpoint_path: str = "data/output/extraction_checkpoint.jsonl",
+    output_filepath: str = "data/output/extraction_results.json"
+) -> List[Dict]:
+    """
+    Compact a checkpoint journal into the final extraction results file.
+    """
+    return CheckpointJournal(checkpoint_path).compact(output_filepath)
@@ -0,0 +1,338 @@
+import json
+import os
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.validation.fuzzy_matching import label_tokens, name_tokens, token_similarity
+
+SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6"
+}
+
+def soundex(token: str) -> str:
+    """
+    Four-character Soundex code of an accent-folded token ("federico" and
+    "federici" are both F362).
+    """
+    if not token:
+        return ""
+    code = token[0].upper()
+    previous = SOUNDEX_CODES.get(token[0], "")
+    for char in token[1:]:
+        digit = SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate equal codes, vowels do
+        if char not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+def block_keys(tokens: Tuple[str, ...]) -> Set[str]:
+    """
+    Blocking keys of a normalised name: the Soundex code of the last token
+    with the initial of the first, and vice versa, so a typo in either the
+    first or the last name still shares a block with the correct spelling.
+    """
+    if not tokens:
+        return set()
+    first, last = tokens[0], tokens[-1]
+    if len(tokens) == 1:
+        return {soundex(first)}
+    return {f"{soundex(last)}|{first[0]}", f"{first[0]}|{soundex(first)}|{last[0]}"}
+
+def fine_block_key(tokens: Tuple[str, ...]) -> str:
+    """
+    Narrower key used inside oversized blocks: the Soundex codes of both the
+    first and the last token.
+    """
+    return f"{soundex(tokens[0])}|{soundex(tokens[-1])}"
+
+def has_honorific(name: str) -> bool:
+    return name_tokens(name) != label_tokens(name)
+
+class PeopleRegistry:
+    """
+    Cross-article registry of people with canonical IDs. Names are
+    normalised with fuzzy_matching.name_tokens (case, accents and Italian
+    honorifics removed); a new name is compared only with names sharing a
+    Soundex blocking key and joins every person it matches with token
+    similarity >= threshold, merging them into the oldest person ID.
+    Per-article contributions are kept so re-ingesting a changed result
+    replaces its mentions instead of double counting.
+    """
+
+    def __init__(self, threshold: float = 0.8, max_block_size: int = 1000):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.next_id = 1
+        self.key_person: Dict[str, str] = {}
+        self.blocks: Dict[str, Set[str]] = {}
+        self.fine_blocks: Dict[str, Set[str]] = {}
+        self.people: Dict[str, Dict] = {}
+        self.merged_into: Dict[str, str] = {}
+        self.articles: Dict[str, Dict] = {}
+        self.comparisons = 0
+        self.skipped_comparisons = 0
+
+    def find(self, person_id: str) -> str:
+        """Current ID of a person, following merges (with path compression)."""
+        root = person_id
+        while root in self.merged_into:
+            root = self.merged_into[root]
+        while person_id != root:
+            self.merged_into[person_id], person_id = root, self.merged_into[person_id]
+        return root
+
+    def _new_person(self) -> str:
+        person_id = f"P{self.next_id:07d}"
+        self.next_id += 1
+        self.people[person_id] = {"variants": Counter(), "roles": Counter(), "articles": 0}
+        return person_id
+
+    def _merge(self, target: str, source: str) -> None:
+        person, merged = self.people[target], self.people.pop(source)
+        person["variants"].update(merged["variants"])
+        person["roles"].update(merged["roles"])
+        person["articles"] += merged["articles"]
+        self.merged_into[source] = target
+
+    def _matches(self, tokens: Tuple[str, ...]) -> Set[str]:
+        """
+        IDs of known people whose names match tokens, searching only shared
+        blocks. A block larger than max_block_size is narrowed to the names
+        that also share fine_block_key; names skipped because even that is
+        too large are counted in skipped_comparisons.
+        """
+        candidates: Set[str] = set()
+        oversized = False
+        for key in block_keys(tokens):
+            block = self.blocks.get(key, ())
+            if len(block) <= self.max_block_size:
+                candidates.update(block)
+            else:
+                oversized = True
+        if oversized:
+            fine_block = self.fine_blocks.get(fine_block_key(tokens), ())
+            if len(fine_block) <= self.max_block_size:
+                candidates.update(fine_block)
+            else:
+                self.skipped_comparisons += len(fine_block)
+        matches = set()
+        for candidate in candidates:
+            self.comparisons += 1
+            if token_similarity(tokens, tuple(candidate.split())) >= self.threshold:
+                matches.add(self.find(self.key_person[candidate]))
+        return matches
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Person ID of a name without registering it, or None."""
+        tokens = name_tokens(name)
+        if not tokens:
+            return None
+        key = " ".join(tokens)
+        if key in self.key_person:
+            return self.find(self.key_person[key])
+        matches = self._matches(tokens)
+        return min(matches) if matches else None
+
+    def resolve_name(self, name: str) -> str:
+        """
+        Canonical label of a name for evaluation: its person ID, or the
+        normalised name when the registry does not know it.
+        """
+        person_id = self.lookup(name)
+        return person_id if person_id is not None else "~" + " ".join(name_tokens(name))
+
+    def register(self, name: str) -> Optional[str]:
+        """Person ID of a name, creating or merging people as needed."""
+        tokens = name_tokens(name)
+        if not tokens:
+            return None
+        key = " ".join(tokens)
+        if key in self.key_person:
+            return self.find(self.key_person[key])
+
+        matches = sorted(self._matches(tokens))
+        person_id = matches[0] if matches else self._new_person()
+        for other in matches[1:]:
+            self._merge(person_id, other)
+        self.key_person[key] = person_id
+        self._index_key(key, tokens)
+        return person_id
+
+    def _index_key(self, key: str, tokens: Tuple[str, ...]) -> None:
+        for block in block_keys(tokens):
+            self.blocks.setdefault(block, set()).add(key)
+        self.fine_blocks.setdefault(fine_block_key(tokens), set()).add(key)
+
+    def _add_article(self, article_id: str, result_hash: str, people: List[Dict]) -> int:
+        mentions: Dict[str, Dict] = {}
+        for person in people:
+            person_id = self.register(person["name"])
+            if person_id is None:
+                continue
+            # The same person named twice in one article counts once
+            mention = mentions.setdefault(person_id, {"names": [], "roles": []})
+            mention["names"].append(" ".join(person["name"].split()))
+            mention["roles"].extend(role.strip() for role in person["roles"] if role.strip() and role.strip() not in mention["roles"])
+        for person_id, mention in mentions.items():
+            record = self.people[person_id]
+            record["variants"].update(mention["names"])
+            record["roles"].update(mention["roles"])
+            record["articles"] += 1
+        self.articles[article_id] = {
+            "hash": result_hash,
+            "mentions": [[person_id, mention["names"], mention["roles"]] for person_id, mention in mentions.items()]
+        }
+        return len(mentions)
+
+    def _remove_article(self, article_id: str) -> None:
+        for person_id, names, roles in self.articles.pop(article_id)["mentions"]:
+            record = self.people[self.find(person_id)]
+            record["variants"].subtract(names)
+            record["roles"].subtract(roles)
+            record["articles"] -= 1
+            record["variants"] = +record["variants"]
+            record["roles"] = +record["roles"]
+
+    def update(self, results: Iterable[Dict]) -> Dict:
+        """
+        Add new results and replace changed ones; unchanged results (same
+        success flag and extraction) are skipped, and articles whose result
+        failed or became empty lose their previous mentions.
+        """
+        from src.validation.incremental_evaluation import prediction_hash
+
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "mentions": 0}
+        people_before = len(self.people)
+        comparisons_before = self.comparisons
+        skipped_before = self.skipped_comparisons
+        for result in results:
+            article_id = result["article_id"]
+            if not result["success"] or not result["extraction"]:
+                if article_id in self.articles:
+                    self._remove_article(article_id)
+                    stats["removed"] += 1
+                continue
+            result_hash = prediction_hash(result)
+            previous = self.articles.get(article_id)
+            if previous is not None and previous["hash"] == result_hash:
+                stats["unchanged"] += 1
+                continue
+            if previous is not None:
+                self._remove_article(article_id)
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
+            stats["mentions"] += self._add_article(article_id, result_hash, result["extraction"]["people"])
+        stats["people"] = len(self.people)
+        stats["new_people"] = len(self.people) - people_before
+        stats["comparisons"] = self.comparisons - comparisons_before
+        stats["skipped_comparisons"] = self.skipped_comparisons - skipped_before
+        return stats
+
+    def annotate(self, result: Dict) -> Dict:
+        """Copy of a result with a person_id on each extracted person."""
+        if not result.get("extraction"):
+            return result
+        people = [dict(person, person_id=self.lookup(person["name"])) for person in result["extraction"]["people"]]
+        return dict(result, extraction=dict(result["extraction"], people=people))
+
+    def canonical_name(self, person_id: str) -> str:
+        """Most frequent spelling, preferring names without honorifics, then longer ones."""
+        variants = self.people[self.find(person_id)]["variants"]
+        if not variants:
+            return ""
+        return max(variants.items(), key=lambda item: (not has_honorific(item[0]), item[1], len(item[0])))[0]
+
+    def iter_people(self) -> Iterator[Dict]:
+        """People currently mentioned in at least one article, by article count."""
+        for person_id, record in sorted(self.people.items(), key=lambda item: (-item[1]["articles"], item[0])):
+            if record["articles"] <= 0:
+                continue
+            yield {
+                "person_id": person_id,
+                "name": self.canonical_name(person_id),
+                "articles": record["articles"],
+                "roles": dict(record["roles"].most_common()),
+                "variants": dict(record["variants"].most_common())
+            }
+
+    def save(self, path: str) -> None:
+        """Atomically write the registry state as JSON."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        state = {
+            "threshold": self.threshold,
+            "max_block_size": self.max_block_size,
+            "next_id": self.next_id,
+            "key_person": self.key_person,
+            "merged_into": self.merged_into,
+            "people": self.people,
+            "articles": self.articles
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PeopleRegistry":
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        registry = cls(state["threshold"], state["max_block_size"])
+        registry.next_id = state["next_id"]
+        registry.key_person = state["key_person"]
+        registry.merged_into = state["merged_into"]
+        registry.people = {
+            person_id: {"variants": Counter(record["variants"]), "roles": Counter(record["roles"]), "articles": record["articles"]}
+            for person_id, record in state["people"].items()
+        }
+        registry.articles = state["articles"]
+        for key in registry.key_person:
+            registry._index_key(key, tuple(key.split()))
+        return registry
+
+def run_entity_resolution(
+    results_filepath: str,
+    registry_path: str = "data/output/people_registry.json",
+    people_filepath: Optional[str] = "data/output/people.json",
+    annotated_filepath: Optional[str] = None,
+    threshold: float = 0.8
+) -> Dict:
+    """
+    Update the registry at registry_path (created on first run) with a
+    results file, then write the people list and optionally the results
+    with a person_id on every person (JSON or JSONL by suffix).
+    """
+    from src.io.load_data import iter_json_records
+
+    registry = PeopleRegistry.load(registry_path) if os.path.exists(registry_path) else PeopleRegistry(threshold)
+    stats = registry.update(iter_json_records(results_filepath))
+    registry.save(registry_path)
+    print(f"Resolved {stats['mentions']} mentions from {stats['added']} new and {stats['updated']} changed results "
+          f"({stats['unchanged']} unchanged, {stats['removed']} removed) into {stats['people']} people, "
+          f"{stats['comparisons']} name comparisons")
+    if stats["skipped_comparisons"]:
+        print(f"Warning: {stats['skipped_comparisons']} name comparisons skipped in blocks larger than "
+              f"{registry.max_block_size} names; raise max_block_size to compare them")
+
+    if people_filepath:
+        if os.path.dirname(people_filepath):
+            os.makedirs(os.path.dirname(people_filepath), exist_ok=True)
+        with open(people_filepath, 'w', encoding='utf-8') as f:
+            json.dump(list(registry.iter_people()), f, indent=2, ensure_ascii=False)
+        print(f"People registry saved to: {people_filepath}")
+    if annotated_filepath:
+        from src.io.results_store import export_results
+
+        export_results((registry.annotate(result) for result in iter_json_records(results_filepath)), annotated_filepath)
+        print(f"Annotated results saved to: {annotated_filepath}")
+    return stats
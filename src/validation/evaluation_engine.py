@@ -0,0 +1,354 @@
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.validation.fuzzy_matching import fuzzy_match_counts
+
+def normalize_label(value: str) -> str:
+    """Normalise a name, role or topic for comparison."""
+    return value.strip().lower()
+
+class Vocabulary:
+    """
+    Interns normalised labels into dense integer IDs. Raw strings are
+    memoised too, so repeated spellings skip normalisation.
+    """
+
+    def __init__(self, normalize: Callable[[str], str] = normalize_label):
+        self.normalize = normalize
+        self.ids: Dict[str, int] = {}
+        self.raw_ids: Dict[str, int] = {}
+
+    def intern(self, raw: str) -> int:
+        item_id = self.raw_ids.get(raw)
+        if item_id is None:
+            label = self.normalize(raw)
+            item_id = self.ids.setdefault(label, len(self.ids))
+            self.raw_ids[raw] = item_id
+        return item_id
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+def _sorted_unique(keys: np.ndarray) -> np.ndarray:
+    keys = np.sort(keys)
+    if len(keys) < 2:
+        return keys
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+def set_overlap_counts(
+    pred_keys: np.ndarray,
+    gt_keys: np.ndarray,
+    key_space: int,
+    n_rows: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-row sizes of the predicted set, the ground truth set and their intersection.
+    Keys are row * key_space + item ID, so duplicates and intersections
+    are resolved with sorted array operations.
+    """
+    pred_keys = _sorted_unique(pred_keys)
+    gt_keys = _sorted_unique(gt_keys)
+
+    merged = np.sort(np.concatenate((pred_keys, gt_keys)))
+    common = merged[1:][merged[1:] == merged[:-1]]
+
+    return (
+        np.bincount(pred_keys // key_space, minlength=n_rows),
+        np.bincount(gt_keys // key_space, minlength=n_rows),
+        np.bincount(common // key_space, minlength=n_rows)
+    )
+
+def precision_recall_f1(n_pred: np.ndarray, n_gt: np.ndarray, n_common: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-row precision, recall and F1; two empty sets score 1.0, one empty set 0.0.
+    """
+    precision = n_common / np.maximum(n_pred, 1)
+    recall = n_common / np.maximum(n_gt, 1)
+    total = precision + recall
+    f1 = np.where(total > 0, 2 * precision * recall / np.where(total > 0, total, 1), 0.0)
+
+    both_empty = (n_pred == 0) & (n_gt == 0)
+    precision[both_empty] = 1.0
+    recall[both_empty] = 1.0
+    f1[both_empty] = 1.0
+    return precision, recall, f1
+
+def micro_precision_recall_f1(n_pred: np.ndarray, n_gt: np.ndarray, n_common: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Corpus-level precision, recall and F1 over summed counts.
+    """
+    total_pred, total_gt, total_common = int(n_pred.sum()), int(n_gt.sum()), int(n_common.sum())
+    precision = total_common / total_pred if total_pred else 0.0
+    recall = total_common / total_gt if total_gt else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+def _mean(values: np.ndarray) -> float:
+    return float(values.mean()) if len(values) else 0.0
+
+def _as_array(values: array) -> np.ndarray:
+    return np.frombuffer(values, dtype=np.int64) if len(values) else np.zeros(0, dtype=np.int64)
+
+class _Ragged:
+    """
+    Flat int64 buffer of variable-length rows (CSR layout).
+    """
+
+    def __init__(self):
+        self.values = array("q")
+        self.sizes = array("q")
+
+    def append(self, values: List[int]) -> None:
+        self.sizes.append(len(values))
+        self.values.extend(values)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        return _as_array(self.sizes), _as_array(self.values)
+
+def _gather_rows(ragged: _Ragged, row_index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select rows of a ragged buffer (with repeats); returns the output row of
+    each value and the values themselves.
+    """
+    sizes, values = ragged.arrays()
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    lengths = sizes[row_index]
+    out_rows = np.repeat(np.arange(len(row_index), dtype=np.int64), lengths)
+    starts = np.repeat(offsets[row_index] - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return out_rows, values[starts + np.arange(len(out_rows), dtype=np.int64)]
+
+class EvaluationEngine:
+    """
+    Single-pass evaluation over predictions. Names, roles and topics are
+    normalised and interned once; per-article scores are computed with
+    NumPy over flat (article row, ID) arrays.
+    With fuzzy=True, entities and roles are also scored with honorific-aware
+    token similarity (see fuzzy_matching) and reported as *_fuzzy_* metrics.
+    With canonical_names (e.g. PeopleRegistry.resolve_name from
+    entity_resolution), names are also mapped to canonical person IDs and
+    scored as *_canonical_* metrics.
+    """
+
+    def __init__(
+        self,
+        ground_truth: Iterable[Dict],
+        fuzzy: bool = False,
+        fuzzy_threshold: float = 0.6,
+        canonical_names: Optional[Callable[[str], str]] = None
+    ):
+        self.fuzzy = fuzzy
+        self.fuzzy_threshold = fuzzy_threshold
+        self.names = Vocabulary()
+        self.canonical_names = Vocabulary(canonical_names) if canonical_names else None
+        self.roles = Vocabulary()
+        self.topics = Vocabulary()
+
+        self._gt_index: Dict[str, int] = {}
+        self._gt_labels: List[Tuple[str, str]] = []
+        self._gt_people: List[List[Dict]] = []
+        self._gt_entities = _Ragged()
+        self._gt_pair_names = _Ragged()
+        self._gt_pair_roles = _Ragged()
+        self._gt_canonical = (_Ragged(), _Ragged(), _Ragged())
+        self._gt_topic_ids = array("q")
+        self._gt_subtopic_ids = array("q")
+        for item in ground_truth:
+            self._gt_index[item['uuid']] = len(self._gt_labels)
+            self._gt_labels.append((item['topic'], item['subtopic']))
+            if fuzzy:
+                self._gt_people.append(item['people'])
+            self._add_people(item['people'], self._gt_entities, self._gt_pair_names, self._gt_pair_roles)
+            if self.canonical_names is not None:
+                self._add_people(item['people'], *self._gt_canonical, self.canonical_names)
+            self._gt_topic_ids.append(self.topics.intern(item['topic']))
+            self._gt_subtopic_ids.append(self.topics.intern(item['subtopic']))
+
+        self.n_rows = 0
+        self._article_ids: List[str] = []
+        self._row_gt = array("q")
+        self._entities = _Ragged()
+        self._pair_names = _Ragged()
+        self._pair_roles = _Ragged()
+        self._canonical = (_Ragged(), _Ragged(), _Ragged())
+        self._topic_ids = array("q")
+        self._subtopic_ids = array("q")
+        self._pred_labels: List[Tuple[str, str]] = []
+        self._fuzzy_counts = {kind: (array("q"), array("q"), array("q")) for kind in ("entity", "role")}
+
+    def _add_people(
+        self,
+        people: List[Dict],
+        entities: _Ragged,
+        pair_names: _Ragged,
+        pair_roles: _Ragged,
+        names: Optional[Vocabulary] = None
+    ) -> None:
+        intern_name, intern_role = (self.names if names is None else names).intern, self.roles.intern
+        entity_ids = []
+        name_ids = []
+        role_ids = []
+        for person in people:
+            name_id = intern_name(person['name'])
+            entity_ids.append(name_id)
+            for role in person['roles']:
+                name_ids.append(name_id)
+                role_ids.append(intern_role(role))
+        entities.append(entity_ids)
+        pair_names.append(name_ids)
+        pair_roles.append(role_ids)
+
+    def add_prediction(self, pred: Dict) -> bool:
+        """
+        Add one prediction record; returns False if it failed or has no ground truth.
+        """
+        if not pred['success'] or not pred['extraction']:
+            return False
+
+        gt_row = self._gt_index.get(pred['article_id'])
+        if gt_row is None:
+            return False
+
+        pred_data = pred['extraction']
+        self.n_rows += 1
+        self._article_ids.append(pred['article_id'])
+        self._row_gt.append(gt_row)
+        self._add_people(pred_data['people'], self._entities, self._pair_names, self._pair_roles)
+        if self.canonical_names is not None:
+            self._add_people(pred_data['people'], *self._canonical, self.canonical_names)
+        self._topic_ids.append(self.topics.intern(pred_data['topic']))
+        self._subtopic_ids.append(self.topics.intern(pred_data['subtopic']))
+        self._pred_labels.append((pred_data['topic'], pred_data['subtopic']))
+
+        if self.fuzzy:
+            counts = fuzzy_match_counts(pred_data['people'], self._gt_people[gt_row], self.fuzzy_threshold)
+            for kind, values in counts.items():
+                for buffer, value in zip(self._fuzzy_counts[kind], values):
+                    buffer.append(value)
+        return True
+
+    def add_predictions(self, predictions: Iterable[Dict]) -> int:
+        """Add prediction records (any iterable, e.g. a streaming loader); returns how many matched."""
+        return sum(self.add_prediction(pred) for pred in predictions)
+
+    def _overlap(self, pred_rows: np.ndarray, pred_ids: np.ndarray, gt_rows: np.ndarray, gt_ids: np.ndarray, key_space: int):
+        # NumPy wraps int64 silently, so check the largest key with Python ints first
+        if max(self.n_rows, 1) * key_space >= 2 ** 63:
+            raise OverflowError(f"{self.n_rows} rows x {key_space} keys exceed the int64 key space")
+        return set_overlap_counts(pred_rows * key_space + pred_ids, gt_rows * key_space + gt_ids, key_space, self.n_rows)
+
+    def _entity_role_counts(self, names: Vocabulary, pred: Tuple[_Ragged, ...], gt: Tuple[_Ragged, ...]):
+        """Entity and (name, role) overlap counts of one name vocabulary."""
+        row_gt = _as_array(self._row_gt)
+        all_rows = np.arange(self.n_rows, dtype=np.int64)
+        n_names = max(len(names), 1)
+        n_roles = max(len(self.roles), 1)
+        (entities, pair_names, pair_roles), (gt_entities, gt_pair_names, gt_pair_roles) = pred, gt
+
+        entity_counts = self._overlap(
+            *_gather_rows(entities, all_rows), *_gather_rows(gt_entities, row_gt), n_names
+        )
+
+        # (name, role) pairs get dense IDs of their own, so keys are row * n_pairs + pair_id
+        pred_rows, pred_names = _gather_rows(pair_names, all_rows)
+        _, pred_roles = _gather_rows(pair_roles, all_rows)
+        gt_rows, gt_names = _gather_rows(gt_pair_names, row_gt)
+        _, gt_roles = _gather_rows(gt_pair_roles, row_gt)
+        pair_codes = np.concatenate((pred_names * n_roles + pred_roles, gt_names * n_roles + gt_roles))
+        unique_pairs, pair_ids = np.unique(pair_codes, return_inverse=True)
+        role_counts = self._overlap(
+            pred_rows, pair_ids[:len(pred_rows)], gt_rows, pair_ids[len(pred_rows):], max(len(unique_pairs), 1)
+        )
+        return entity_counts, role_counts
+
+    def overlap_counts(self) -> List[Tuple[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]]:
+        """
+        Per-article (n_pred, n_gt, n_common) arrays for entities, roles and
+        their fuzzy and canonical variants when enabled.
+        """
+        scored = list(zip(("entity", "role"), self._entity_role_counts(
+            self.names, (self._entities, self._pair_names, self._pair_roles),
+            (self._gt_entities, self._gt_pair_names, self._gt_pair_roles)
+        )))
+        if self.canonical_names is not None:
+            scored.extend(zip(("entity_canonical", "role_canonical"), self._entity_role_counts(
+                self.canonical_names, self._canonical, self._gt_canonical
+            )))
+        if self.fuzzy:
+            for kind in ("entity", "role"):
+                scored.append((f"{kind}_fuzzy", tuple(_as_array(buffer) for buffer in self._fuzzy_counts[kind])))
+        return scored
+
+    def entity_metrics(self) -> Dict:
+        """
+        Macro-averaged (per article) and micro-averaged (pooled counts) entity and role metrics.
+        """
+        macro = {}
+        micro = {}
+        for prefix, counts in self.overlap_counts():
+            for metric, values, total in zip(
+                ("precision", "recall", "f1"), precision_recall_f1(*counts), micro_precision_recall_f1(*counts)
+            ):
+                macro[f'{prefix}_{metric}'] = _mean(values)
+                micro[f'{prefix}_micro_{metric}'] = total
+
+        return {**macro, **micro}
+
+    def article_metrics(self) -> List[Dict]:
+        """
+        Per-article scores: set counts, precision/recall/F1 and topic matches for each prediction row.
+        """
+        records = [{'article_id': article_id} for article_id in self._article_ids]
+        for prefix, counts in self.overlap_counts():
+            scores = precision_recall_f1(*counts)
+            columns = [values.tolist() for values in (*counts, *scores)]
+            for record, n_pred, n_gt, n_common, precision, recall, f1 in zip(records, *columns):
+                record[f'{prefix}_counts'] = [n_pred, n_gt, n_common]
+                record[f'{prefix}_precision'] = precision
+                record[f'{prefix}_recall'] = recall
+                record[f'{prefix}_f1'] = f1
+
+        details = self.topic_metrics()['topic_details']
+        for record, detail in zip(records, details):
+            record['topic_match'] = detail['topic_match']
+            record['subtopic_match'] = detail['subtopic_match']
+        return records
+
+    def topic_metrics(self, include_details: bool = True) -> Dict:
+        """
+        Topic and subtopic accuracy, optionally with per-article details.
+        """
+        row_gt = _as_array(self._row_gt)
+        topic_match = _as_array(self._topic_ids) == _as_array(self._gt_topic_ids)[row_gt]
+        subtopic_match = _as_array(self._subtopic_ids) == _as_array(self._gt_subtopic_ids)[row_gt]
+
+        results = {
+            'topic_accuracy': _mean(topic_match),
+            'subtopic_accuracy': _mean(subtopic_match),
+            'total_matched': self.n_rows
+        }
+        if include_details:
+            results['topic_details'] = [
+                {
+                    'article_id': article_id,
+                    'pred_topic': pred_topic,
+                    'gt_topic': self._gt_labels[gt_row][0],
+                    'pred_subtopic': pred_subtopic,
+                    'gt_subtopic': self._gt_labels[gt_row][1],
+                    'topic_match': bool(t),
+                    'subtopic_match': bool(s)
+                }
+                for article_id, gt_row, (pred_topic, pred_subtopic), t, s in zip(
+                    self._article_ids, row_gt.tolist(), self._pred_labels, topic_match, subtopic_match
+                )
+            ]
+        return results
+
+def evaluate(predictions: Iterable[Dict], ground_truth: Iterable[Dict], fuzzy: bool = False) -> EvaluationEngine:
+    """
+    Build an EvaluationEngine over ground truth and feed it all predictions.
+    """
+    engine = EvaluationEngine(ground_truth, fuzzy=fuzzy)
+    engine.add_predictions(predictions)
+    return engine
@@ -0,0 +1,208 @@
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
+
+HONORIFICS = {
+    "sig", "sigg", "sigra", "signa", "signor", "signore", "signora", "signorina",
+    "dott", "dottssa", "dottor", "dottore", "dottoressa", "dr",
+    "prof", "profssa", "professor", "professore", "professoressa",
+    "avv", "avvocato", "ing", "ingegner", "ingegnere", "arch", "architetto",
+    "geom", "rag", "on", "onorevole", "sen", "senatore", "mons", "monsignor", "gen", "cav", "comm"
+}
+
+TOKEN_SIMILARITY_THRESHOLD = 0.85
+
+@lru_cache(maxsize=100_000)
+def label_tokens(text: str) -> Tuple[str, ...]:
+    """
+    Lowercase, accent-folded word tokens; "sig.ra" becomes "sigra".
+    """
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    return tuple(re.findall(r"\w+", re.sub(r"(\w)\.(\w)", r"\1\2", folded)))
+
+@lru_cache(maxsize=100_000)
+def name_tokens(name: str) -> Tuple[str, ...]:
+    """
+    Name tokens with leading Italian honorifics (Sig., Sig.ra, Dott., Prof., ...) removed.
+    """
+    tokens = label_tokens(name)
+    start = 0
+    while start < len(tokens) - 1 and tokens[start] in HONORIFICS:
+        start += 1
+    return tokens[start:]
+
+@lru_cache(maxsize=100_000)
+def _tokens_match(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 2 or min(len(a), len(b)) < 4:
+        return False
+    return SequenceMatcher(None, a, b).ratio() >= TOKEN_SIMILARITY_THRESHOLD
+
+def token_similarity(a: Tuple[str, ...], b: Tuple[str, ...]) -> float:
+    """
+    Dice coefficient over tokens, where tokens also match with small typos.
+    "eva bazzi" vs "bazzi" scores 0.67, "mario rossi" vs "luca rossi" 0.5.
+    """
+    if not a or not b:
+        return 0.0
+    unmatched = list(b)
+    matched = 0
+    for token in a:
+        for i, other in enumerate(unmatched):
+            if _tokens_match(token, other):
+                matched += 1
+                del unmatched[i]
+                break
+    return 2 * matched / (len(a) + len(b))
+
+def _block_keys(tokens: Tuple[str, ...]) -> Set[str]:
+    return {token[:3] for token in tokens}
+
+def optimal_assignment(scores: List[List[float]]) -> List[Tuple[int, int]]:
+    """
+    Maximum-weight one-to-one assignment (Hungarian algorithm) on a
+    rows x columns score matrix; returns (row, column) pairs.
+    """
+    n_rows = len(scores)
+    n_cols = len(scores[0]) if scores else 0
+    if not n_rows or not n_cols:
+        return []
+
+    transposed = n_rows > n_cols
+    if transposed:
+        scores = [list(column) for column in zip(*scores)]
+        n_rows, n_cols = n_cols, n_rows
+
+    # Minimise negated scores; 1-indexed potentials as in the classic O(n^2 m) formulation
+    inf = float("inf")
+    u = [0.0] * (n_rows + 1)
+    v = [0.0] * (n_cols + 1)
+    assigned_row = [0] * (n_cols + 1)
+    way = [0] * (n_cols + 1)
+    for row in range(1, n_rows + 1):
+        assigned_row[0] = row
+        col0 = 0
+        min_values = [inf] * (n_cols + 1)
+        used = [False] * (n_cols + 1)
+        while True:
+            used[col0] = True
+            row0 = assigned_row[col0]
+            delta = inf
+            col1 = 0
+            for col in range(1, n_cols + 1):
+                if used[col]:
+                    continue
+                reduced = -scores[row0 - 1][col - 1] - u[row0] - v[col]
+                if reduced < min_values[col]:
+                    min_values[col] = reduced
+                    way[col] = col0
+                if min_values[col] < delta:
+                    delta = min_values[col]
+                    col1 = col
+            for col in range(n_cols + 1):
+                if used[col]:
+                    u[assigned_row[col]] += delta
+                    v[col] -= delta
+                else:
+                    min_values[col] -= delta
+            col0 = col1
+            if assigned_row[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            assigned_row[col0] = assigned_row[col1]
+            col0 = col1
+
+    pairs = [(assigned_row[col] - 1, col - 1) for col in range(1, n_cols + 1) if assigned_row[col]]
+    return [(col, row) for row, col in pairs] if transposed else pairs
+
+def match_labels(
+    predicted: List[Tuple[str, ...]],
+    ground_truth: List[Tuple[str, ...]],
+    threshold: float
+) -> List[Tuple[int, int]]:
+    """
+    One-to-one fuzzy matching of tokenised labels. Candidates come from a
+    token-prefix blocking index, and each connected group of candidates is
+    solved optimally, so cost stays close to linear in the number of labels.
+    """
+    index: Dict[str, List[int]] = defaultdict(list)
+    for j, tokens in enumerate(ground_truth):
+        for key in _block_keys(tokens):
+            index[key].append(j)
+
+    edges: Dict[int, Dict[int, float]] = defaultdict(dict)
+    for i, tokens in enumerate(predicted):
+        candidates = {j for key in _block_keys(tokens) for j in index.get(key, ())}
+        for j in candidates:
+            score = token_similarity(tokens, ground_truth[j])
+            if score >= threshold:
+                edges[i][j] = score
+
+    # Connected components of the candidate graph (pred i <-> gt j)
+    parent = {}
+
+    def find(node):
+        while parent.setdefault(node, node) != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for i, row in edges.items():
+        for j in row:
+            parent[find(("p", i))] = find(("g", j))
+
+    components: Dict[tuple, Tuple[List[int], List[int]]] = defaultdict(lambda: ([], []))
+    for node in parent:
+        side, position = node
+        components[find(node)][0 if side == "p" else 1].append(position)
+
+    matches = []
+    for rows, cols in components.values():
+        if len(rows) == 1 and len(cols) == 1:
+            matches.append((rows[0], cols[0]))
+            continue
+        scores = [[edges[i].get(j, 0.0) for j in cols] for i in rows]
+        for r, c in optimal_assignment(scores):
+            if scores[r][c] > 0:
+                matches.append((rows[r], cols[c]))
+    return matches
+
+def _group_people(people: List[Dict]) -> Tuple[List[Tuple[str, ...]], List[Set[Tuple[str, ...]]]]:
+    """Deduplicate people by normalised name, merging their roles."""
+    roles_by_name: Dict[Tuple[str, ...], Set[Tuple[str, ...]]] = {}
+    for person in people:
+        tokens = name_tokens(person['name'])
+        if not tokens:
+            continue
+        roles = roles_by_name.setdefault(tokens, set())
+        for role in person['roles']:
+            role_tokens = label_tokens(role)
+            if role_tokens:
+                roles.add(role_tokens)
+    return list(roles_by_name), list(roles_by_name.values())
+
+def fuzzy_match_counts(pred_people: List[Dict], gt_people: List[Dict], threshold: float = 0.6) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Fuzzy entity and (entity, role) counts for one article as
+    {"entity": (n_pred, n_gt, n_common), "role": (...)}. Roles count as
+    matched when their people are matched and the roles match fuzzily.
+    """
+    pred_names, pred_roles = _group_people(pred_people)
+    gt_names, gt_roles = _group_people(gt_people)
+
+    name_matches = match_labels(pred_names, gt_names, threshold)
+    common_roles = sum(
+        len(match_labels(list(pred_roles[i]), list(gt_roles[j]), threshold))
+        for i, j in name_matches
+    )
+
+    return {
+        "entity": (len(pred_names), len(gt_names), len(name_matches)),
+        "role": (sum(map(len, pred_roles)), sum(map(len, gt_roles)), common_roles)
+    }
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+from src.validation.checkpoint import CheckpointJournal
+from src.validation.evaluation_engine import EvaluationEngine
+
+def prediction_hash(pred: Dict) -> str:
+    """
+    Content hash of a prediction's success flag and extraction.
+    """
+    payload = json.dumps(
+        {"success": pred['success'], "extraction": pred['extraction']},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def ground_truth_hash(item: Optional[Dict]) -> Optional[str]:
+    """
+    Content hash of a ground-truth entry, or None when the article has none.
+    """
+    if item is None:
+        return None
+    payload = json.dumps(item, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class IncrementalEvaluator:
+    """
+    Keeps per-article metric records keyed by article_id, prediction hashes
+    and ground-truth hash in an append-only journal, and corpus aggregates
+    as running sums. update() rescores only predictions whose content or
+    ground truth changed, so the cost of each evaluation round is
+    proportional to the number of changes.
+    """
+
+    def __init__(
+        self,
+        ground_truth: List[Dict],
+        state_path: str = "data/output/evaluation_state.jsonl",
+        fuzzy: bool = False
+    ):
+        self.ground_truth = {item['uuid']: item for item in ground_truth}
+        self.ground_truth_hashes = {uuid: ground_truth_hash(item) for uuid, item in self.ground_truth.items()}
+        self.fuzzy = fuzzy
+        self.prefixes = ["entity", "role"] + (["entity_fuzzy", "role_fuzzy"] if fuzzy else [])
+        self.journal = CheckpointJournal(state_path, fsync_every=1000)
+        self._reset_sums()
+
+        # Journal records: {"article_id", "prediction_hashes", "ground_truth_hash", "metrics"}, with one
+        # prediction hash and one metrics entry (None when unscored) per prediction row of the article
+        self.records = self.journal.load()
+        for record in self.records.values():
+            if not self._is_compatible(record):
+                record.update(prediction_hashes=[], ground_truth_hash=None, metrics=[])
+            for metrics in record['metrics']:
+                if metrics is not None:
+                    self._apply(metrics, 1)
+
+    def _reset_sums(self) -> None:
+        self.sums = {"articles": 0, "topic_correct": 0, "subtopic_correct": 0}
+        for prefix in self.prefixes:
+            for key in ("precision", "recall", "f1", "n_pred", "n_gt", "n_common"):
+                self.sums[f"{prefix}_{key}"] = 0
+
+    def _is_compatible(self, record: Dict) -> bool:
+        """
+        Records from older state files, or scored without fuzzy metrics when
+        fuzzy is enabled, must be rescored.
+        """
+        if 'prediction_hashes' not in record:
+            return False
+        return all(
+            metrics is None or all(f"{prefix}_counts" in metrics for prefix in self.prefixes)
+            for metrics in record['metrics']
+        )
+
+    def _apply(self, metrics: Dict, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one article's contribution to the running sums."""
+        self.sums["articles"] += sign
+        self.sums["topic_correct"] += sign * metrics['topic_match']
+        self.sums["subtopic_correct"] += sign * metrics['subtopic_match']
+        for prefix in self.prefixes:
+            for key in ("precision", "recall", "f1"):
+                self.sums[f"{prefix}_{key}"] += sign * metrics[f"{prefix}_{key}"]
+            for key, value in zip(("n_pred", "n_gt", "n_common"), metrics[f"{prefix}_counts"]):
+                self.sums[f"{prefix}_{key}"] += sign * value
+
+    def update(self, predictions: Iterable[Dict]) -> Dict:
+        """
+        Rescore changed predictions and update the aggregates. Like
+        run_complete_evaluation, every prediction row counts, so an
+        article_id listed twice is scored twice; the rows of an article are
+        matched to its previous ones by position.
+        """
+        seen: Dict[str, List[str]] = {}
+        changed: Dict[str, Dict[int, Dict]] = {}
+        unchanged = 0
+        for pred in predictions:
+            article_id = pred['article_id']
+            digest = prediction_hash(pred)
+            hashes = seen.setdefault(article_id, [])
+            position = len(hashes)
+            hashes.append(digest)
+            record = self.records.get(article_id)
+            if (
+                record is not None
+                and record['ground_truth_hash'] == self.ground_truth_hashes.get(article_id)
+                and position < len(record['prediction_hashes'])
+                and record['prediction_hashes'][position] == digest
+            ):
+                unchanged += 1
+                continue
+            changed.setdefault(article_id, {})[position] = pred
+
+        # Articles that now have fewer rows drop their trailing ones
+        for article_id, hashes in seen.items():
+            record = self.records.get(article_id)
+            if record is not None and len(hashes) < len(record['prediction_hashes']):
+                changed.setdefault(article_id, {})
+
+        if changed:
+            ground_truth = [self.ground_truth[article_id] for article_id in changed if article_id in self.ground_truth]
+            engine = EvaluationEngine(ground_truth, fuzzy=self.fuzzy)
+            rows = [
+                (article_id, position)
+                for article_id, preds in changed.items()
+                for position, pred in preds.items()
+                if engine.add_prediction(pred)
+            ]
+            scored = {}
+            for row, metrics in zip(rows, engine.article_metrics()):
+                del metrics['article_id']
+                scored[row] = metrics
+
+            for article_id, preds in changed.items():
+                previous = self.records.get(article_id)
+                previous_metrics = previous['metrics'] if previous is not None else []
+                for metrics in previous_metrics:
+                    if metrics is not None:
+                        self._apply(metrics, -1)
+
+                metrics = [
+                    scored.get((article_id, position)) if position in preds else previous_metrics[position]
+                    for position in range(len(seen[article_id]))
+                ]
+                for row_metrics in metrics:
+                    if row_metrics is not None:
+                        self._apply(row_metrics, 1)
+                record = {
+                    "article_id": article_id,
+                    "prediction_hashes": seen[article_id],
+                    "ground_truth_hash": self.ground_truth_hashes.get(article_id),
+                    "metrics": metrics
+                }
+                self.records[article_id] = record
+                self.journal.append(record)
+            self.journal.flush()
+
+        return {"rescored": sum(len(preds) for preds in changed.values()), "unchanged": unchanged}
+
+    def entity_metrics(self) -> Dict:
+        """Macro and micro entity/role metrics from the running sums."""
+        articles = self.sums["articles"]
+        macro = {}
+        micro = {}
+        for prefix in self.prefixes:
+            for key in ("precision", "recall", "f1"):
+                macro[f"{prefix}_{key}"] = self.sums[f"{prefix}_{key}"] / articles if articles else 0.0
+
+            n_pred, n_gt, n_common = (self.sums[f"{prefix}_{key}"] for key in ("n_pred", "n_gt", "n_common"))
+            precision = n_common / n_pred if n_pred else 0.0
+            recall = n_common / n_gt if n_gt else 0.0
+            micro[f"{prefix}_micro_precision"] = precision
+            micro[f"{prefix}_micro_recall"] = recall
+            micro[f"{prefix}_micro_f1"] = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return {**macro, **micro}
+
+    def topic_metrics(self) -> Dict:
+        """Topic and subtopic accuracy from the running sums."""
+        articles = self.sums["articles"]
+        return {
+            'topic_accuracy': self.sums["topic_correct"] / articles if articles else 0.0,
+            'subtopic_accuracy': self.sums["subtopic_correct"] / articles if articles else 0.0,
+            'total_matched': articles
+        }
+
+    def compact(self) -> None:
+        """Rewrite the state journal with only the latest record per article."""
+        self.journal.compact()
+
+    def close(self) -> None:
+        self.journal.close()
+
+def write_report(report: Dict, report_path: str) -> None:
+    """
+    Atomically write a small JSON report.
+    """
+    if os.path.dirname(report_path):
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    tmp_path = report_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, report_path)
+
+def run_incremental_evaluation(
+    predictions_filepath: str,
+    ground_truth_filepath: str,
+    state_path: str = "data/output/evaluation_state.jsonl",
+    report_path: Optional[str] = "data/output/evaluation_summary.json",
+    fuzzy_matching: bool = False
+) -> Dict:
+    """
+    Rescore only the predictions that changed since the last run and write
+    the corpus-level metrics (without per-article details) to report_path.
+    """
+    from src.io.load_data import iter_json_records
+
+    with open(ground_truth_filepath, 'r', encoding='utf-8') as f:
+        ground_truth = json.load(f)
+
+    evaluator = IncrementalEvaluator(ground_truth, state_path, fuzzy=fuzzy_matching)
+    stats = evaluator.update(iter_json_records(predictions_filepath))
+    evaluator.close()
+    print(f"Rescored {stats['rescored']} changed predictions, {stats['unchanged']} unchanged")
+
+    entity_results = evaluator.entity_metrics()
+    topic_results = evaluator.topic_metrics()
+    summary = {
+        'entity_f1': entity_results['entity_f1'],
+        'role_f1': entity_results['role_f1'],
+        'entity_micro_f1': entity_results['entity_micro_f1'],
+        'role_micro_f1': entity_results['role_micro_f1'],
+        'topic_accuracy': topic_results['topic_accuracy'],
+        'subtopic_accuracy': topic_results['subtopic_accuracy']
+    }
+    if fuzzy_matching:
+        summary['entity_fuzzy_f1'] = entity_results['entity_fuzzy_f1']
+        summary['role_fuzzy_f1'] = entity_results['role_fuzzy_f1']
+
+    report = {
+        'entity_metrics': entity_results,
+        'topic_metrics': topic_results,
+        'summary': summary,
+        'update': stats
+    }
+    if report_path is not None:
+        write_report(report, report_path)
+    return report
@@ -1,193 +1,100 @@
 import json
-from typing import List, Dict, Tuple, Set
+import os
+from typing import List, Dict, Optional
+
+from src.io.load_data import iter_json_records
+from src.validation.evaluation_engine import EvaluationEngine, evaluate
 
 
 class EntityEvaluator:
     """Evaluator for named entity and role extraction metrics."""
 
-    def extract_entities_set(self, people_data: List[Dict]) -> Set[str]:
-        """Extract entity names as a set for comparison."""
-        return {person['name'].strip().lower() for person in people_data}
-    
-    def extract_entity_role_pairs(self, people_data: List[Dict]) -> Set[Tuple[str, str]]:
-        """Extract (entity, role) pairs for role evaluation."""
-        pairs = set()
-        for person in people_data:
-            name = person['name'].strip().lower()
-            for role in person['roles']:
-                pairs.add((name, role.strip().lower()))
-        return pairs
-    
-    def calculate_precision_recall_f1(self, predicted: Set, ground_truth: Set) -> Tuple[float, float, float]:
-        """Calculate precision, recall, and F1-score for sets."""
-        if not predicted and not ground_truth:
-            return 1.0, 1.0, 1.0
-        
-        if not predicted:
-            return 0.0, 0.0, 0.0
-        
-        if not ground_truth:
-            return 0.0, 0.0, 0.0
-        
-        intersection = predicted.intersection(ground_truth)
-        
-        precision = len(intersection) / len(predicted) if predicted else 0.0
-        recall = len(intersection) / len(ground_truth) if ground_truth else 0.0
-        
-        if precision + recall == 0:
-            f1 = 0.0
-        else:
-            f1 = 2 * (precision * recall) / (precision + recall)
-        
-        return precision, recall, f1
-    
     def evaluate_entities(self, predictions: List[Dict], ground_truth: List[Dict]) -> Dict:
         """
         Evaluate entity extraction performance.
+        Macro averages are per-article means; micro averages pool counts over the corpus.
         """
+        return evaluate(predictions, ground_truth).entity_metrics()
+    
+def prediction_route(pred: Dict) -> Optional[str]:
+    """Route ("local" classifier or "llm") that labelled a prediction's topic, if it was routed."""
+    return (pred.get('metadata') or {}).get('topic_route')
 
-        # Mapping by article ID
-        gt_dict = {item['uuid']: item for item in ground_truth}
-        
-        entity_precisions = []
-        entity_recalls = []
-        entity_f1s = []
-        
-        role_precisions = []
-        role_recalls = []
-        role_f1s = []
-                
-        for pred in predictions:
-            if not pred['success'] or not pred['extraction']:
-                continue
-                
-            article_id = pred['article_id']
-            pred_data = pred['extraction']
-            
-            if article_id not in gt_dict:
-                continue
-                
-            gt_data = gt_dict[article_id]
-            
-            # Entity evaluation: names
-            pred_entities = self.extract_entities_set(pred_data['people'])
-            gt_entities = self.extract_entities_set(gt_data['people'])
-            
-            ent_prec, ent_rec, ent_f1 = self.calculate_precision_recall_f1(pred_entities, gt_entities)
-            entity_precisions.append(ent_prec)
-            entity_recalls.append(ent_rec)
-            entity_f1s.append(ent_f1)
-            
-            # Role evaluation: entity-role pairs
-            pred_roles = self.extract_entity_role_pairs(pred_data['people'])
-            gt_roles = self.extract_entity_role_pairs(gt_data['people'])
-            
-            role_prec, role_rec, role_f1 = self.calculate_precision_recall_f1(pred_roles, gt_roles)
-            role_precisions.append(role_prec)
-            role_recalls.append(role_rec)
-            role_f1s.append(role_f1)
-        
-        # Aggregate results
-        results = {
-            'entity_precision': sum(entity_precisions) / len(entity_precisions) if entity_precisions else 0.0,
-            'entity_recall': sum(entity_recalls) / len(entity_recalls) if entity_recalls else 0.0,
-            'entity_f1': sum(entity_f1s) / len(entity_f1s) if entity_f1s else 0.0,
-            'role_precision': sum(role_precisions) / len(role_precisions) if role_precisions else 0.0,
-            'role_recall': sum(role_recalls) / len(role_recalls) if role_recalls else 0.0,
-            'role_f1': sum(role_f1s) / len(role_f1s) if role_f1s else 0.0
+def route_topic_metrics(topic_details: List[Dict], routes: Dict[str, str]) -> Dict:
+    """
+    Topic and subtopic accuracy per route; unrouted articles count as "llm".
+    """
+    grouped: Dict[str, List[Dict]] = {}
+    for detail in topic_details:
+        grouped.setdefault(routes.get(detail['article_id'], 'llm'), []).append(detail)
+    return {
+        route: {
+            'topic_accuracy': sum(detail['topic_match'] for detail in details) / len(details),
+            'subtopic_accuracy': sum(detail['subtopic_match'] for detail in details) / len(details),
+            'total_matched': len(details)
         }
-        
-        return results
-    
+        for route, details in sorted(grouped.items())
+    }
+
 class TopicEvaluator:
     """Evaluator for topic and subtopic classification."""
     
     def evaluate_topics(self, predictions: List[Dict], ground_truth: List[Dict]) -> Dict:
         """
         Evaluate topic and subtopic classification performance.
+        Routed predictions also get accuracy per route under 'route_metrics'.
         """
-        gt_dict = {item['uuid']: item for item in ground_truth}
-        
-        topic_correct = 0
-        subtopic_correct = 0
-        total_matched = 0
-        
-        topic_details = []
-        
-        for pred in predictions:
-            if not pred['success'] or not pred['extraction']:
-                continue
-                
-            article_id = pred['article_id']
-            pred_data = pred['extraction']
-            
-            if article_id not in gt_dict:
-                continue
-                
-            gt_data = gt_dict[article_id]
-            total_matched += 1
-            
-            # Topic accuracy
-            pred_topic = pred_data['topic'].strip().lower()
-            gt_topic = gt_data['topic'].strip().lower()
-            topic_match = pred_topic == gt_topic
-            
-            if topic_match:
-                topic_correct += 1
-            
-            # Subtopic accuracy
-            pred_subtopic = pred_data['subtopic'].strip().lower()
-            gt_subtopic = gt_data['subtopic'].strip().lower()
-            subtopic_match = pred_subtopic == gt_subtopic
-            
-            if subtopic_match:
-                subtopic_correct += 1
-            
-            topic_details.append({
-                'article_id': article_id,
-                'pred_topic': pred_data['topic'],
-                'gt_topic': gt_data['topic'],
-                'pred_subtopic': pred_data['subtopic'],
-                'gt_subtopic': gt_data['subtopic'],
-                'topic_match': topic_match,
-                'subtopic_match': subtopic_match
-            })
-        
-        results = {
-            'topic_accuracy': topic_correct / total_matched if total_matched > 0 else 0.0,
-            'subtopic_accuracy': subtopic_correct / total_matched if total_matched > 0 else 0.0,
-            'total_matched': total_matched,
-            'topic_details': topic_details
-        }
-        
+        results = evaluate(predictions, ground_truth).topic_metrics()
+        routes = {pred['article_id']: prediction_route(pred) for pred in predictions if prediction_route(pred)}
+        if routes:
+            results['route_metrics'] = route_topic_metrics(results['topic_details'], routes)
         return results
     
 def run_complete_evaluation(
     predictions_filepath: str,
     ground_truth_filepath: str,
-    save_detailed_report: bool = True
+    save_detailed_report: bool = True,
+    fuzzy_matching: bool = False,
+    report_path: str = "data/output/evaluation_report.json",
+    people_registry_path: Optional[str] = None
 ) -> Dict:
     """
     Run complete evaluation and generate report.
+    Predictions are streamed through a single EvaluationEngine pass, so the
+    predictions file (JSON array or JSONL) is never held in memory at once.
+    fuzzy_matching adds entity_fuzzy_* and role_fuzzy_* metrics that ignore
+    honorifics (Sig.ra, Dott., ...) and tolerate small spelling differences.
+    people_registry_path (built by entity_resolution) adds entity_canonical_*
+    and role_canonical_* metrics that compare canonical person IDs.
     """
     print("Starting Final Evaluation")
     print("Loading data...")
-    with open(predictions_filepath, 'r', encoding='utf-8') as f:
-        predictions = json.load(f)
-    
     with open(ground_truth_filepath, 'r', encoding='utf-8') as f:
         ground_truth = json.load(f)
-    
-    print(f"Loaded {len(predictions)} predictions")
     print(f"Loaded {len(ground_truth)} ground truth entries")
     
+    canonical_names = None
+    if people_registry_path:
+        from src.validation.entity_resolution import PeopleRegistry
+
+        canonical_names = PeopleRegistry.load(people_registry_path).resolve_name
+    engine = EvaluationEngine(ground_truth, fuzzy=fuzzy_matching, canonical_names=canonical_names)
+    total_predictions = 0
+    routes = {}
+    for pred in iter_json_records(predictions_filepath):
+        engine.add_prediction(pred)
+        total_predictions += 1
+        if prediction_route(pred):
+            routes[pred['article_id']] = prediction_route(pred)
+    print(f"Loaded {total_predictions} predictions")
+    
     print("\nEvaluating entity and role extraction...")
-    entity_evaluator = EntityEvaluator()
-    entity_results = entity_evaluator.evaluate_entities(predictions, ground_truth)
+    entity_results = engine.entity_metrics()
     
     print("Evaluating topic/subtopic classification...")
-    topic_evaluator = TopicEvaluator()
-    topic_results = topic_evaluator.evaluate_topics(predictions, ground_truth)
+    topic_results = engine.topic_metrics()
+    if routes:
+        topic_results['route_metrics'] = route_topic_metrics(topic_results['topic_details'], routes)
     
     # Combine results
     final_results = {
@@ -196,20 +103,40 @@ def run_complete_evaluation(
         'summary': {
             'entity_f1': entity_results['entity_f1'],
             'role_f1': entity_results['role_f1'],
+            'entity_micro_f1': entity_results['entity_micro_f1'],
+            'role_micro_f1': entity_results['role_micro_f1'],
             'topic_accuracy': topic_results['topic_accuracy'],
             'subtopic_accuracy': topic_results['subtopic_accuracy']
         }
     }
+    if fuzzy_matching:
+        final_results['summary']['entity_fuzzy_f1'] = entity_results['entity_fuzzy_f1']
+        final_results['summary']['role_fuzzy_f1'] = entity_results['role_fuzzy_f1']
+    if canonical_names:
+        final_results['summary']['entity_canonical_f1'] = entity_results['entity_canonical_f1']
+        final_results['summary']['role_canonical_f1'] = entity_results['role_canonical_f1']
     
     print(f"\nEVALUATION RESULTS:")
     print(f"   Entity F1: {entity_results['entity_f1']:.3f}")
     print(f"   Role F1: {entity_results['role_f1']:.3f}")
+    print(f"   Entity F1 (micro): {entity_results['entity_micro_f1']:.3f}")
+    print(f"   Role F1 (micro): {entity_results['role_micro_f1']:.3f}")
+    if fuzzy_matching:
+        print(f"   Entity F1 (fuzzy): {entity_results['entity_fuzzy_f1']:.3f}")
+        print(f"   Role F1 (fuzzy): {entity_results['role_fuzzy_f1']:.3f}")
+    if canonical_names:
+        print(f"   Entity F1 (canonical): {entity_results['entity_canonical_f1']:.3f}")
+        print(f"   Role F1 (canonical): {entity_results['role_canonical_f1']:.3f}")
     print(f"   Topic Accuracy: {topic_results['topic_accuracy']:.3f}")
     print(f"   Subtopic Accuracy: {topic_results['subtopic_accuracy']:.3f}")
+    for route, metrics in topic_results.get('route_metrics', {}).items():
+        print(f"   Topic/Subtopic Accuracy ({route}, {metrics['total_matched']} articles): "
+              f"{metrics['topic_accuracy']:.3f} / {metrics['subtopic_accuracy']:.3f}")
     
     # Save report
     if save_detailed_report:
-        report_path = "data/output/evaluation_report.json"
+        if os.path.dirname(report_path):
+            os.makedirs(os.path.dirname(report_path), exist_ok=True)
         with open(report_path, 'w', encoding='utf-8') as f:
             json.dump(final_results, f, indent=2, ensure_ascii=False)
         print(f"Detailed report saved to: {report_path}")
@@ -0,0 +1,19 @@
+import pytest
+
+@pytest.fixture
+def make_result():
+    """Build an extraction result record; people is a list of (name, [roles])."""
+    def make(article_id, people=(), topic="Health", subtopic="Epidemic", date="2025-05-11", success=True):
+        return {
+            "article_id": article_id,
+            "extraction": {
+                "people": [{"name": name, "roles": list(roles)} for name, roles in people],
+                "topic": topic,
+                "subtopic": subtopic,
+                "date": date
+            } if success else None,
+            "success": success,
+            "error": None if success else "boom",
+            "metadata": {"model": "gpt-4o-mini", "tokens_used": 100}
+        }
+    return make
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from src.llm.async_client import AdaptiveRateLimiter, AsyncExtractionEngine, run_concurrent_extraction
+from src.llm.fake_client import FakeAsyncOpenAI, FaultInjector
+from src.llm.resilience import CircuitBreaker, ResilienceLayer, RetryPolicy
+
+ARTICLES = [{"id": f"article-{i}", "text": f"Text {i}"} for i in range(40)]
+
+def test_streamed_articles_keep_input_order():
+    articles = ({"id": f"article-{i}", "text": f"Text {i}"} for i in range(50))
+    seen = []
+
+    results = run_concurrent_extraction(
+        articles, max_concurrency=8, requests_per_minute=1_000_000, tokens_per_minute=1_000_000_000,
+        client=FakeAsyncOpenAI(latency=0.001, jitter=0.005), on_result=seen.append, progress_every=0
+    )
+
+    assert [result["article_id"] for result in results] == [f"article-{i}" for i in range(50)]
+    assert all(result["success"] for result in results)
+    assert len(seen) == 50
+
+def test_small_request_is_not_queued_behind_large_one():
+    async def scenario():
+        limiter = AdaptiveRateLimiter(requests_per_minute=6000, tokens_per_minute=6000)
+        limiter.available_tokens = 0.0
+        start = time.monotonic()
+
+        async def acquire(tokens):
+            await limiter.acquire(tokens)
+            return time.monotonic() - start
+
+        large = asyncio.ensure_future(acquire(1000))
+        small = await acquire(10)
+        large.cancel()
+        return small
+
+    assert asyncio.run(scenario()) < 1.0
+
+def test_in_flight_requests_are_capped():
+    client = FakeAsyncOpenAI(latency=0.005, jitter=0.005)
+
+    run_concurrent_extraction(
+        ARTICLES, max_concurrency=4, requests_per_minute=1_000_000, tokens_per_minute=1_000_000_000,
+        client=client, progress_every=0
+    )
+
+    assert client.max_in_flight == 4
+
+def test_rate_limits_slow_the_limiter_and_are_retried():
+    faults = FaultInjector(rate_limit_rate=0.3, retry_after=0.001, seed=1)
+    engine = AsyncExtractionEngine(
+        max_concurrency=4, requests_per_minute=1_000_000, tokens_per_minute=1_000_000_000,
+        client=FakeAsyncOpenAI(latency=0.001, faults=faults),
+        resilience=ResilienceLayer(
+            RetryPolicy(max_retries=10, base_delay=0.001, max_delay=0.01), CircuitBreaker(enabled=False)
+        )
+    )
+
+    results = asyncio.run(engine.process_articles(ARTICLES, progress_every=0))
+
+    assert all(result["success"] for result in results)
+    assert engine.limiter.rate_limited_count == faults.injected["rate_limit"] > 0
+
+def test_rate_fraction_halves_and_recovers():
+    limiter = AdaptiveRateLimiter(min_rate_fraction=0.1, recovery_step=0.25)
+    limiter.on_rate_limited()
+    limiter.on_rate_limited()
+    assert limiter.rate_fraction == 0.25
+    assert limiter.available_requests == 0.0
+
+    for _ in range(5):
+        limiter.on_success()
+    assert limiter.rate_fraction == 1.0
@@ -0,0 +1,102 @@
+import json
+import os
+
+import pytest
+from openai import OpenAI
+
+from src.llm.batch_api import (
+    build_batch_requests,
+    build_response_format,
+    parse_batch_output_line,
+    run_batch_extraction,
+    save_batch_state,
+    submit_batch,
+    write_batch_files
+)
+from src.llm.fake_client import DEFAULT_FAKE_EXTRACTION
+from src.llm.fake_server import FakeOpenAIServer
+
+ARTICLES = [{"id": f"article-{i}", "text": f"**Title {i}**\n*By Anna Rossi | May 11, 2025*\nText {i}."} for i in range(7)]
+
+@pytest.fixture
+def server():
+    with FakeOpenAIServer() as server:
+        yield server
+
+def test_response_format_is_strict():
+    response_format = build_response_format()
+    schema = response_format["json_schema"]["schema"]
+
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["strict"] is True
+    for node in [schema, *schema["$defs"].values()]:
+        assert node["additionalProperties"] is False
+        assert sorted(node["required"]) == sorted(node["properties"])
+
+def test_input_files_split_at_limits(tmp_path):
+    by_count = write_batch_files(ARTICLES, str(tmp_path / "count"), max_requests=3)
+    assert [len(ids) for _, ids in by_count] == [3, 3, 1]
+
+    line_bytes = os.path.getsize(by_count[0][0]) // 3
+    by_size = write_batch_files(ARTICLES, str(tmp_path / "size"), max_bytes=2 * line_bytes + line_bytes // 2)
+    assert [len(ids) for _, ids in by_size] == [2, 2, 2, 1]
+    assert [article_id for _, ids in by_size for article_id in ids] == [article["id"] for article in ARTICLES]
+    for path, ids in by_size:
+        assert [json.loads(line)["custom_id"] for line in open(path, encoding="utf-8")] == ids
+
+def test_resume_polls_recorded_jobs(tmp_path, server):
+    client = OpenAI(base_url=server.base_url, api_key="fake")
+    state_path = str(tmp_path / "state.json")
+
+    # A crash after the first job was submitted
+    (input_path, article_ids), _ = write_batch_files(ARTICLES, str(tmp_path / "crashed"), max_requests=4)
+    batch = submit_batch(client, input_path)
+    save_batch_state(state_path, [{"batch_id": batch.id, "article_ids": article_ids}])
+
+    seen = []
+    results = run_batch_extraction(
+        ARTICLES, client=client, work_dir=str(tmp_path / "batches"), poll_interval=0.01,
+        state_path=state_path, on_result=seen.append
+    )
+
+    assert [result["article_id"] for result in results] == [article["id"] for article in ARTICLES]
+    assert all(result["success"] for result in results)
+    assert len(seen) == len(ARTICLES)
+    # Only the articles not covered by the recorded job were submitted again
+    assert len(server.batches) == 2
+    assert not os.path.exists(state_path)
+
+def output_line(custom_id, status_code=200, content=DEFAULT_FAKE_EXTRACTION, error=None):
+    body = {
+        "model": "gpt-4o-mini",
+        "choices": [{"message": {"content": json.dumps(content)}}],
+        "usage": {"total_tokens": 150, "prompt_tokens": 120, "completion_tokens": 30, "prompt_tokens_details": {"cached_tokens": 64}}
+    }
+    response = None if error else {"status_code": status_code, "body": body if status_code == 200 else {"error": "bad"}}
+    return json.dumps({"custom_id": custom_id, "response": response, "error": error})
+
+def test_requests_are_keyed_by_article_id():
+    requests = list(build_batch_requests(ARTICLES[:2]))
+
+    assert [request["custom_id"] for request in requests] == ["article-0", "article-1"]
+    assert all(request["url"] == "/v1/chat/completions" for request in requests)
+    assert "Text 0." in requests[0]["body"]["messages"][-1]["content"]
+
+def test_output_line_becomes_result_record():
+    result = parse_batch_output_line(output_line("article-0"))
+
+    assert result["success"] and result["article_id"] == "article-0"
+    assert result["extraction"]["people"] == DEFAULT_FAKE_EXTRACTION["people"]
+    assert result["metadata"]["batch_api"] is True
+    assert (result["metadata"]["prompt_tokens"], result["metadata"]["cached_tokens"]) == (120, 64)
+
+@pytest.mark.parametrize("line", [
+    output_line("article-0", status_code=500),
+    output_line("article-0", error={"code": "expired", "message": "Batch expired"}),
+    output_line("article-0", content={"people": "not a list"})
+])
+def test_failed_output_lines_become_failures(line):
+    result = parse_batch_output_line(line)
+
+    assert not result["success"] and result["extraction"] is None
+    assert result["article_id"] == "article-0" and result["error"]
@@ -0,0 +1,51 @@
+import time
+
+from src.llm.cache import ResponseCache
+
+def result(article_id, padding=0):
+    return {"article_id": article_id, "success": True, "extraction": {"people": [], "note": "x" * padding}}
+
+def test_round_trip_and_replace(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"))
+    assert cache.get("k") is None
+    cache.put("k", result("a1"))
+    cache.put("k", result("a1", padding=10))
+    cache.put("failed", {"article_id": "a2", "success": False})
+
+    assert cache.get("k") == result("a1", padding=10)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+def test_evicts_least_recently_used_down_to_target(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"), max_entries=10)
+    for i in range(10):
+        cache.put(f"k{i}", result(f"a{i}"))
+    cache.get("k0")
+    cache.put("k10", result("a10"))
+
+    # 11 entries exceed the limit; eviction frees down to 9 in one batch
+    assert cache.stats()["entries"] == 9
+    assert cache.get("k0") is not None
+    assert cache.get("k1") is None and cache.get("k2") is None
+
+def test_byte_limit_and_counts_survive_reopen(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    cache = ResponseCache(path, max_bytes=1000)
+    for i in range(20):
+        cache.put(f"k{i}", result(f"a{i}", padding=100))
+    stats = cache.stats()
+    assert stats["bytes"] <= 1000
+    cache.close()
+
+    reopened = ResponseCache(path, max_bytes=1000)
+    assert reopened.stats()["entries"] == stats["entries"]
+    assert reopened.stats()["bytes"] == stats["bytes"]
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"), max_age_seconds=60)
+    cache.put("old", result("a1"))
+    cache._conn.execute("UPDATE responses SET created_at = ?", (time.time() - 120,))
+    cache.put("new", result("a2"))
+
+    assert cache.get("old") is None
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,56 @@
+import json
+
+from src.validation.checkpoint import CheckpointJournal
+
+def write_lines(path, text):
+    path.write_text(text, encoding="utf-8")
+
+def test_append_after_torn_line_keeps_new_record(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    write_lines(path, '{"article_id": "1", "success": true}\n{"article_id": "2", "succ')
+
+    journal = CheckpointJournal(str(path))
+    journal.append({"article_id": "3", "success": True})
+    journal.close()
+
+    assert sorted(journal.load()) == ["1", "3"]
+    assert path.read_text(encoding="utf-8").endswith("\n")
+
+def test_append_after_torn_only_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    write_lines(path, '{"article_id": "2", "succ')
+
+    journal = CheckpointJournal(str(path))
+    journal.append({"article_id": "3", "success": True})
+    journal.close()
+
+    assert sorted(journal.load()) == ["3"]
+
+def test_later_records_supersede_and_completed_ids(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "journal.jsonl"), fsync_every=1)
+    journal.append({"article_id": "1", "success": False})
+    journal.append({"article_id": "2", "success": True})
+    journal.append({"article_id": "1", "success": True})
+    journal.close()
+
+    assert journal.completed_ids() == {"1", "2"}
+
+def test_compact_keeps_latest_record_in_order(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal(str(path))
+    for article_id, success in (("b", False), ("a", True), ("b", True)):
+        journal.append({"article_id": article_id, "success": success})
+
+    results = journal.compact(article_order=["a", "b"])
+
+    assert [(r["article_id"], r["success"]) for r in results] == [("a", True), ("b", True)]
+    assert [json.loads(line)["article_id"] for line in path.read_text(encoding="utf-8").splitlines()] == ["a", "b"]
+
+def test_reset_discards_journal(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal(str(path))
+    journal.append({"article_id": "1", "success": True})
+    journal.reset()
+
+    assert journal.load() == {}
+    assert not path.exists()
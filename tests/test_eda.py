@@ -0,0 +1,15 @@
+from src.analysis.eda import EDA
+
+def test_length_scaling_report_p95_is_nearest_rank(make_result):
+    articles = [{"id": f"a{i}", "text": "word " * 100} for i in range(20)]
+    results = []
+    for i in range(20):
+        result = make_result(f"a{i}")
+        result["metadata"].update(latency_seconds=float(i + 1), prompt_tokens=200, completion_tokens=50)
+        results.append(result)
+
+    report = EDA(articles).length_scaling_report(results, n_buckets=1)
+
+    # Nearest rank of 95% over 20 latencies is the 19th, not the maximum
+    assert report["buckets"][0]["p95_latency_seconds"] == 19.0
+    assert report["buckets"][0]["avg_latency_seconds"] == 10.5
@@ -0,0 +1,53 @@
+from src.validation.entity_resolution import PeopleRegistry
+
+# Both blocks of "Anna Smithe" (S530|a and a|A500|s) hold four names each
+CROWDED = [(name, []) for name in (
+    "Anna Smith", "Alice Smith", "Adam Smith", "Amir Smith", "Anna Stone", "Anna Sanchez", "Anna Silva"
+)]
+
+def test_variants_resolve_to_one_person(make_result):
+    registry = PeopleRegistry()
+    registry.update([
+        make_result("a1", [("Angela Merkel", ["Chancellor"])]),
+        make_result("a2", [("Angela Merkell", ["Chancellor"])]),
+    ])
+    assert registry.lookup("Angela Merkel") == registry.lookup("Angela Merkell")
+
+def test_failed_result_removes_previous_mentions(make_result):
+    registry = PeopleRegistry()
+    registry.update([make_result("a1", [("Angela Merkel", ["Chancellor"])])])
+    person_id = registry.lookup("Angela Merkel")
+
+    stats = registry.update([make_result("a1", success=False)])
+
+    assert stats["removed"] == 1
+    assert "a1" not in registry.articles
+    assert registry.people[person_id]["articles"] == 0
+    assert not registry.people[person_id]["variants"]
+
+def test_oversized_block_is_narrowed_not_skipped(make_result):
+    registry = PeopleRegistry(max_block_size=3)
+    registry.update([make_result("a1", CROWDED)])
+
+    stats = registry.update([make_result("a2", [("Anna Smithe", [])])])
+
+    assert registry.lookup("Anna Smithe") == registry.lookup("Anna Smith")
+    assert stats["skipped_comparisons"] == 0
+
+def test_oversized_fine_block_reports_skipped_comparisons(make_result):
+    registry = PeopleRegistry(max_block_size=1)
+    registry.update([make_result("a1", [("Anna Smith", []), ("Anne Smith", [])])])
+
+    stats = registry.update([make_result("a2", [("Anna Smithe", [])])])
+
+    assert stats["skipped_comparisons"] == 2
+
+def test_load_restores_blocks(make_result, tmp_path):
+    registry = PeopleRegistry(max_block_size=3)
+    registry.update([make_result("a1", CROWDED)])
+    path = str(tmp_path / "people.json")
+    registry.save(path)
+
+    loaded = PeopleRegistry.load(path)
+
+    assert loaded.lookup("Anna Smithe") == registry.lookup("Anna Smith")
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from src.validation.incremental_evaluation import IncrementalEvaluator
+from src.validation.metrics_evaluation import run_complete_evaluation
+
+def gt_entry(uuid, people, topic="Health", subtopic="Epidemic"):
+    return {"uuid": uuid, "people": [{"name": name, "roles": list(roles)} for name, roles in people],
+            "topic": topic, "subtopic": subtopic}
+
+@pytest.fixture
+def ground_truth():
+    return [
+        gt_entry("a1", [("Mario Rossi", ["Mayor"])]),
+        gt_entry("a2", [("Anna Bianchi", ["Doctor"]), ("Luca Verdi", ["Nurse"])]),
+    ]
+
+def full_metrics(tmp_path, predictions, ground_truth):
+    predictions_path, gt_path = tmp_path / "predictions.json", tmp_path / "gt.json"
+    predictions_path.write_text(json.dumps(predictions))
+    gt_path.write_text(json.dumps(ground_truth))
+    report = run_complete_evaluation(str(predictions_path), str(gt_path), save_detailed_report=False)
+    return report["entity_metrics"], report["topic_metrics"]
+
+def incremental_metrics(evaluator):
+    return evaluator.entity_metrics(), evaluator.topic_metrics()
+
+def assert_same(incremental, full):
+    (entity, topic), (full_entity, full_topic) = incremental, full
+    for key, value in entity.items():
+        assert value == pytest.approx(full_entity[key]), key
+    assert topic["total_matched"] == full_topic["total_matched"]
+    assert topic["topic_accuracy"] == pytest.approx(full_topic["topic_accuracy"])
+
+def test_duplicate_article_ids_are_scored_like_full_evaluation(tmp_path, ground_truth, make_result):
+    predictions = [
+        make_result("a1", [("Mario Rossi", ["Mayor"])]),
+        make_result("a2", [("Anna Bianchi", ["Doctor"])]),
+        make_result("a1", [("Mario Rossi", ["Senator"])]),
+    ]
+    evaluator = IncrementalEvaluator(ground_truth, str(tmp_path / "state.jsonl"))
+    assert evaluator.update(predictions) == {"rescored": 3, "unchanged": 0}
+
+    assert_same(incremental_metrics(evaluator), full_metrics(tmp_path, predictions, ground_truth))
+
+    # Dropping the duplicate row removes only its contribution
+    assert evaluator.update(predictions[:2]) == {"rescored": 0, "unchanged": 2}
+    assert_same(incremental_metrics(evaluator), full_metrics(tmp_path, predictions[:2], ground_truth))
+    evaluator.close()
+
+def test_ground_truth_change_rescores_article(tmp_path, ground_truth, make_result):
+    predictions = [make_result("a1", [("Mario Rossi", ["Mayor"])]), make_result("a2", [("Anna Bianchi", ["Doctor"])])]
+    state_path = str(tmp_path / "state.jsonl")
+    evaluator = IncrementalEvaluator(ground_truth, state_path)
+    evaluator.update(predictions)
+    evaluator.close()
+
+    ground_truth[0] = gt_entry("a1", [("Mario Rossi", ["Senator"])])
+    evaluator = IncrementalEvaluator(ground_truth, state_path)
+    assert evaluator.update(predictions) == {"rescored": 1, "unchanged": 1}
+
+    assert_same(incremental_metrics(evaluator), full_metrics(tmp_path, predictions, ground_truth))
+    evaluator.close()
+
+def test_reopened_state_restores_sums(tmp_path, ground_truth, make_result):
+    predictions = [make_result("a1", [("Mario Rossi", ["Mayor"])]), make_result("a2", success=False)]
+    state_path = str(tmp_path / "state.jsonl")
+    evaluator = IncrementalEvaluator(ground_truth, state_path)
+    evaluator.update(predictions)
+    evaluator.close()
+
+    reopened = IncrementalEvaluator(ground_truth, state_path)
+    assert reopened.update(predictions) == {"rescored": 0, "unchanged": 2}
+    assert_same(incremental_metrics(reopened), full_metrics(tmp_path, predictions, ground_truth))
+    reopened.close()
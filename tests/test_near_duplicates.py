@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from src.preprocessing.near_duplicates import NearDuplicateIndex, lsh_bands, reuse_extraction
+
+WORDS = (
+    "the council approved a new plan for the regional hospital after months of debate "
+    "while local doctors warned that staff shortages would delay the opening of wards "
+    "and patients complained about waiting lists in the northern districts of the city"
+).split()
+
+def article(article_id, seed, words=120):
+    rng = random.Random(seed)
+    return {"id": article_id, "text": " ".join(rng.choice(WORDS) + str(rng.randrange(50)) for _ in range(words))}
+
+def edited(source, article_id):
+    tokens = source["text"].split()
+    tokens[10] = "reportedly"
+    return {"id": article_id, "text": " ".join(tokens)}
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "near_duplicates.sqlite")
+
+def test_band_layout_covers_signature():
+    bands, rows = lsh_bands(0.85, 128)
+    assert bands * rows <= 128
+
+def test_routes_copies_to_original(index_path):
+    original = article("a", 1)
+    with NearDuplicateIndex(index_path) as index:
+        routed = dict(
+            (item["id"], match) for item, match in
+            index.route_articles([original, article("b", 2), edited(original, "c")])
+        )
+
+    assert routed["a"] is None
+    assert routed["b"] is None
+    assert routed["c"][0] == "a"
+    assert routed["c"][1] >= 0.85
+
+def test_routing_persists_across_runs(index_path):
+    original = article("a", 1)
+    with NearDuplicateIndex(index_path) as index:
+        index.route(original)
+        index.store_result({"article_id": "a", "success": True, "extraction": {"people": []}})
+
+    with NearDuplicateIndex(index_path) as index:
+        assert index.route(original) is None
+        assert index.route(edited(original, "c"))[0] == "a"
+        assert index.get_result("a")["article_id"] == "a"
+        assert index.stats()["duplicates"] == 1
+
+def test_mismatched_settings_are_rejected(index_path):
+    NearDuplicateIndex(index_path).close()
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(index_path, num_perm=64)
+
+def test_reuse_extraction_patches_people_and_date():
+    original = {
+        "article_id": "a",
+        "success": True,
+        "extraction": {
+            "people": [{"name": "Fabio Battelli", "roles": ["Doctor"]}, {"name": "Licia Antonello", "roles": ["Mayor"]}],
+            "topic": "Health",
+            "subtopic": "Epidemic",
+            "date": "2025-05-11"
+        },
+        "metadata": {"model": "gpt-4o-mini"}
+    }
+    copy = {"id": "c", "text": "Dr. Battelli said the ward will open soon."}
+
+    result = reuse_extraction(copy, original, 0.9)
+
+    assert [person["name"] for person in result["extraction"]["people"]] == ["Fabio Battelli"]
+    assert result["metadata"]["duplicate_of"] == "a"
+    assert result["metadata"]["tokens_used"] == 0
+
+@pytest.mark.parametrize("name, text, kept", [
+    ("Marco Rossi", "il dottor rossini ha detto", False),
+    ("Li Wu", "la famiglia wuhan e li", False),
+    ("Marco Rossi", "Il dottor Rossi, ieri.", True),
+    ("Anna Dell'Orto", "parla dell'orto botanico", True)
+])
+def test_reuse_extraction_matches_whole_surnames(name, text, kept):
+    original = {
+        "article_id": "a",
+        "success": True,
+        "extraction": {"people": [{"name": name, "roles": []}], "topic": "Health", "subtopic": "Epidemic", "date": "2025-05-11"},
+        "metadata": {}
+    }
+
+    result = reuse_extraction({"id": "c", "text": text}, original, 0.9)
+
+    assert bool(result["extraction"]["people"]) is kept
@@ -0,0 +1,75 @@
+import re
+
+import pytest
+from openai import OpenAI
+
+from src.llm.cache import ResponseCache
+from src.llm.fake_client import DEFAULT_FAKE_EXTRACTION, FaultInjector
+from src.llm.fake_server import FakeOpenAIServer
+from src.llm.packing import extract_packed_group, split_proportionally
+from src.llm.resilience import ResilienceLayer, RetryPolicy
+from src.llm.telemetry import Telemetry
+
+ARTICLES = [{"id": f"article-{i}", "text": f"Article number {i} about the hospital."} for i in range(4)]
+
+def packed_response(messages):
+    article_ids = re.findall(r"^ARTICLE ID: (.+)$", messages[-1]["content"], flags=re.MULTILINE)
+    if article_ids:
+        return {"articles": [dict(DEFAULT_FAKE_EXTRACTION, article_id=article_id) for article_id in article_ids]}
+    return DEFAULT_FAKE_EXTRACTION
+
+def resilience():
+    return ResilienceLayer(RetryPolicy(max_retries=8, base_delay=0.01, max_delay=0.05, timeout=10))
+
+@pytest.fixture
+def flaky_server():
+    faults = FaultInjector(rate_limit_rate=0.5, retry_after=0.01, seed=3)
+    with FakeOpenAIServer(response_factory=packed_response, faults=faults) as server:
+        yield server
+
+def test_packed_request_retries_rate_limits(flaky_server):
+    client = OpenAI(base_url=flaky_server.base_url, api_key="fake")
+    telemetry = Telemetry()
+
+    results = extract_packed_group(ARTICLES, client=client, telemetry=telemetry, resilience=resilience())
+
+    assert all(result["success"] for result in results)
+    assert all(result["metadata"]["packed_request_size"] == len(ARTICLES) for result in results)
+    assert flaky_server.faults.injected["rate_limit"] > 0
+    assert len(telemetry.records) == 1
+    assert telemetry.records[0]["success"]
+    assert telemetry.records[0]["retries"] == flaky_server.faults.injected["rate_limit"]
+
+def test_packed_request_is_cached(tmp_path, flaky_server):
+    client = OpenAI(base_url=flaky_server.base_url, api_key="fake")
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"))
+
+    extract_packed_group(ARTICLES, client=client, cache=cache, resilience=resilience())
+    results = extract_packed_group(ARTICLES, client=client, cache=cache, resilience=resilience())
+
+    assert all(result["metadata"]["cache_hit"] for result in results)
+    assert cache.stats()["hits"] == 1
+
+def test_mismatched_response_falls_back_to_single_calls():
+    with FakeOpenAIServer(response_factory=lambda messages: {"articles": []} if "ARTICLE ID" in messages[-1]["content"] else DEFAULT_FAKE_EXTRACTION) as server:
+        client = OpenAI(base_url=server.base_url, api_key="fake")
+        results = extract_packed_group(ARTICLES, client=client, prompt_layout="cache_friendly", resilience=resilience())
+
+    assert all(result["success"] for result in results)
+    assert all("packed_request_size" not in result["metadata"] for result in results)
+
+def test_split_proportionally_sums_to_total():
+    assert split_proportionally(10, [1, 1, 1]) == [3, 4, 3]
+    assert split_proportionally(7, [0, 0]) == [4, 3]
+    assert sum(split_proportionally(1001, [13, 400, 7, 91])) == 1001
+
+def test_packed_token_counts_are_split_per_article():
+    with FakeOpenAIServer(response_factory=packed_response) as server:
+        client = OpenAI(base_url=server.base_url, api_key="fake")
+        telemetry = Telemetry()
+        results = extract_packed_group(ARTICLES, client=client, telemetry=telemetry, resilience=resilience())
+
+    call = telemetry.records[0]
+    for key in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+        assert sum(result["metadata"][key] for result in results) == call[key]
+    assert all(result["metadata"]["prompt_tokens"] > 0 for result in results)
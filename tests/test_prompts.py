@@ -0,0 +1,17 @@
+import pytest
+
+from src.llm.prompts import TOPIC_TAXONOMY, PromptTemplates
+
+@pytest.mark.parametrize("template", [
+    PromptTemplates.USER_PROMPT_TEMPLATE,
+    PromptTemplates.CACHE_FRIENDLY_USER_PROMPT_TEMPLATE,
+    PromptTemplates.PACKED_USER_PROMPT_TEMPLATE
+])
+def test_topic_templates_list_the_taxonomy(template):
+    for topic, subtopics in TOPIC_TAXONOMY.items():
+        assert f"- {topic}: {', '.join(subtopics)}\n" in template
+
+def test_templates_still_format():
+    rendered = PromptTemplates.USER_PROMPT_TEMPLATE.format(text="Article body")
+    assert "Article body" in rendered and '"people": [' in rendered
+    assert "Article body" in PromptTemplates.PACKED_USER_PROMPT_TEMPLATE.format(articles="Article body")
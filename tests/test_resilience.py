@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import openai
+import pytest
+
+from src.llm.fake_client import FaultInjector
+from src.llm.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilienceLayer,
+    RetryPolicy,
+    is_retryable_error
+)
+
+def injected(fault, retry_after=None):
+    try:
+        FaultInjector(retry_after=retry_after).raise_fault(fault)
+    except openai.OpenAIError as e:
+        return e
+
+def flaky(failures, fault="server_error"):
+    """A call that raises the given fault failures times, then returns "ok"."""
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise injected(fault)
+        return "ok"
+    return call, calls
+
+def layer(max_retries=3, **breaker):
+    return ResilienceLayer(RetryPolicy(max_retries=max_retries, base_delay=0.001, max_delay=0.01), CircuitBreaker(**breaker))
+
+@pytest.mark.parametrize("fault", ["rate_limit", "server_error", "timeout"])
+def test_transient_faults_are_retryable(fault):
+    assert is_retryable_error(injected(fault))
+
+def test_retry_after_header_sets_delay():
+    policy = RetryPolicy(max_delay=5.0)
+    assert policy.compute_delay(0, injected("rate_limit", retry_after=2.5)) == 2.5
+    assert policy.compute_delay(0, injected("rate_limit", retry_after=30)) == 5.0
+
+def test_retries_until_success_and_counts_them():
+    fn, calls = flaky(2)
+    call = {}
+
+    assert layer().call(fn, call) == "ok"
+    assert len(calls) == 3 and call["retries"] == 2
+
+def test_gives_up_after_max_retries():
+    fn, calls = flaky(10)
+
+    with pytest.raises(openai.InternalServerError):
+        layer(max_retries=2).call(fn)
+    assert len(calls) == 3
+
+def test_fatal_errors_are_not_retried():
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        layer().call(fn)
+    assert len(calls) == 1
+
+def test_breaker_opens_sheds_and_recovers_after_probe():
+    resilience = layer(max_retries=0, min_calls=4, window_size=4, cooldown=0.05)
+    for _ in range(4):
+        with pytest.raises(openai.InternalServerError):
+            resilience.call(flaky(1)[0])
+    assert resilience.breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        resilience.call(lambda: "ok")
+    assert resilience.breaker.rejected_calls == 1
+
+    time.sleep(0.06)
+    assert resilience.call(lambda: "ok") == "ok"
+    assert resilience.breaker.state == "closed"
+
+def test_async_call_enforces_timeout():
+    async def slow():
+        await asyncio.sleep(1)
+
+    resilience = ResilienceLayer(RetryPolicy(max_retries=1, base_delay=0.001, timeout=0.01))
+    call = {}
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(resilience.acall(slow, call))
+    assert call["retries"] == 1
@@ -0,0 +1,60 @@
+import sqlite3
+
+import pytest
+
+from src.io.results_index import ResultsIndex
+
+@pytest.fixture
+def index(tmp_path):
+    with ResultsIndex(str(tmp_path / "results.sqlite")) as index:
+        yield index
+
+def ids(rows):
+    return [row["article_id"] for row in rows]
+
+def test_query_by_person_role_topic_and_date(index, make_result):
+    index.ingest_results([
+        make_result("a", [("Fabio Battelli", ["Doctor"])], date="2025-05-11"),
+        make_result("b", [("fabio  battelli", ["Patient"])], topic="Politics", subtopic="Elections", date="2025-06-01"),
+        make_result("c", [("Licia Antonello", ["Doctor"])], date="2024-01-01")
+    ])
+
+    assert ids(index.query(person="FABIO BATTELLI")) == ["a", "b"]
+    assert ids(index.query(person="Fabio Battelli", role="Doctor")) == ["a"]
+    assert ids(index.query(role="Doctor")) == ["c", "a"]
+    assert ids(index.query(topic="Health", date_from="2025-01-01")) == ["a"]
+    assert index.person_roles("Fabio Battelli") == {"Doctor": 1, "Patient": 1}
+
+def test_ingest_is_incremental(index, make_result):
+    results = [make_result("a", [("Fabio Battelli", ["Doctor"])]), make_result("b")]
+    assert index.ingest_results(results) == {"indexed": 2, "unchanged": 0}
+    assert index.ingest_results(results) == {"indexed": 0, "unchanged": 2}
+
+    changed = make_result("a", [("Fabio Battelli", ["Patient"])])
+    assert index.ingest_results([changed]) == {"indexed": 1, "unchanged": 0}
+    assert ids(index.query(role="Doctor")) == []
+    assert ids(index.query(role="Patient")) == ["a"]
+
+def test_repeated_ids_in_one_batch_keep_last(index, make_result):
+    index.ingest_results([make_result("a", [("X Y", ["Doctor"])]), make_result("a", [("X Y", ["Mayor"])])])
+    stats = index.ingest_articles([
+        {"id": "a", "text": "**First** old text"},
+        {"id": "a", "text": "**Second** new text about vaccines"}
+    ])
+
+    assert stats == {"indexed": 1, "unchanged": 0}
+    assert ids(index.query(role="Mayor")) == ["a"]
+    assert ids(index.query(text="vaccines")) == ["a"]
+    assert ids(index.query(text="old")) == []
+
+def test_full_text_search_and_bad_query(index, make_result):
+    index.ingest_results([make_result("a"), make_result("b")])
+    index.ingest_articles([
+        {"id": "a", "text": "**Ospedale** nuovo reparto"},
+        {"id": "b", "text": "**Elezioni** risultati"}
+    ])
+
+    assert ids(index.query(text="reparto")) == ["a"]
+    assert ids(index.query(text="reparto", topic="Politics")) == []
+    with pytest.raises(sqlite3.OperationalError):
+        index.query(text='"reparto')
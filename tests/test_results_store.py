@@ -0,0 +1,43 @@
+import json
+
+from src.io.load_data import iter_json_records
+from src.io.results_store import ResultsStore, convert_results, is_results_store, write_results_store
+
+def sample_results(make_result):
+    return [
+        make_result("a", [("Fabio Battelli", ["Doctor", "Patient"]), ("Licia Antonello", ["Epidemiologist"])]),
+        make_result("b", [], topic="Politics", subtopic="Elections", date="2024-01-02"),
+        make_result("c", success=False),
+        make_result("d", [("Àlvaro Núñez", ["Mayor"])], topic="Health", subtopic="Hospitals")
+    ]
+
+def test_round_trip(tmp_path, make_result):
+    results = sample_results(make_result)
+    path = write_results_store(results, str(tmp_path / "results.store"))
+
+    assert is_results_store(path)
+    assert ResultsStore.open(path).to_records() == results
+    assert ResultsStore.open(path, mmap=False).to_records() == results
+
+def test_aggregates(tmp_path, make_result):
+    store = ResultsStore.from_records(sample_results(make_result))
+
+    assert store.topic_counts() == {"Health": 2, "Politics": 1}
+    assert store.role_counts()["Doctor"] == 1
+    assert list(store.people_per_article()) == [2, 0, 0, 1]
+
+def test_streaming_loader_reads_store(tmp_path, make_result):
+    results = sample_results(make_result)
+    path = write_results_store(results, str(tmp_path / "results.store"))
+
+    assert list(iter_json_records(path)) == results
+
+def test_convert_between_formats(tmp_path, make_result):
+    results = sample_results(make_result)
+    source = tmp_path / "results.json"
+    source.write_text(json.dumps(results), encoding="utf-8")
+
+    store = convert_results(str(source), str(tmp_path / "results.store"))
+    jsonl = convert_results(store, str(tmp_path / "results.jsonl"))
+
+    assert list(iter_json_records(jsonl)) == results
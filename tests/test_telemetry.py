@@ -0,0 +1,52 @@
+import pytest
+
+from src.llm.telemetry import Telemetry, percentile
+
+@pytest.mark.parametrize("values, q, expected", [
+    (list(range(1, 101)), 95, 95),
+    (list(range(1, 101)), 99, 99),
+    (list(range(1, 101)), 100, 100),
+    (list(range(1, 11)), 50, 5),
+    (list(range(1, 11)), 95, 10),
+    (list(range(1, 5)), 25, 1),
+    ([7.0], 99, 7.0),
+])
+def test_nearest_rank_percentile(values, q, expected):
+    assert percentile(values, q) == expected
+
+def test_percentile_edges():
+    assert percentile([], 50) == 0.0
+    assert percentile([3, 1, 2], 0) == 1
+
+def test_track_records_call():
+    telemetry = Telemetry()
+    with telemetry.track("gpt-4o-mini") as call:
+        call["prompt_tokens"] = 10
+        call["success"] = True
+
+    assert len(telemetry.records) == 1
+    record = telemetry.records[0]
+    assert record["prompt_tokens"] == 10
+    assert record["wall_seconds"] >= 0
+    assert "_start" not in record
+
+def test_instrumented_client_records_ttfb(tmp_path):
+    from openai import OpenAI
+
+    from src.llm.fake_server import FakeOpenAIServer
+    from src.llm.openai_client import extract_article_information
+
+    telemetry = Telemetry()
+    with FakeOpenAIServer() as server:
+        client = OpenAI(base_url=server.base_url, api_key="fake")
+        telemetry.instrument(client)
+        telemetry.instrument(client)
+        extract_article_information("Some article text.", client=client, telemetry=telemetry)
+
+    assert client._client.event_hooks["response"].count(client._client.event_hooks["response"][-1]) == 1
+    assert telemetry.records[0]["ttfb_seconds"] is not None
+    assert telemetry.summary()["gpt-4o-mini"]["ttfb_p50"] > 0
+
+    path = tmp_path / "metrics" / "llm.prom"
+    telemetry.write_prometheus(str(path))
+    assert "llm_" in path.read_text(encoding="utf-8")
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from src.preprocessing.text_utils import preprocess_articles_dataset, preprocess_records, resolve_transforms
+
+ARTICLES = [
+    {"id": "a", "text": "**Nuovo reparto**\n*By Anna Rossi | May 11, 2025*\nIl **reparto** apre."},
+    {"id": "b", "text": "**Elezioni**\n*By Marco Bianchi | June 1, 2025*\nRisultati."}
+]
+
+def test_byline_must_run_before_strip_markdown():
+    with pytest.raises(ValueError, match="extract_byline"):
+        resolve_transforms(["strip_markdown", "extract_byline"])
+
+    record, = preprocess_records(ARTICLES[:1], ["extract_byline", "strip_markdown"])
+    assert record["title"] == "Nuovo reparto"
+    assert record["date"] == "2025-05-11"
+    assert "**" not in record["text"]
+
+@pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+def test_output_format_follows_suffix(tmp_path, suffix):
+    source = tmp_path / "articles.json"
+    source.write_text(json.dumps(ARTICLES), encoding="utf-8")
+
+    output = preprocess_articles_dataset(str(source), output_filepath=str(tmp_path / f"out{suffix}"))
+
+    with open(output, encoding="utf-8") as f:
+        records = json.load(f) if suffix == ".json" else [json.loads(line) for line in f]
+    assert [record["id"] for record in records] == ["a", "b"]